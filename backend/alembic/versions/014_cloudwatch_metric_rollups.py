@@ -0,0 +1,115 @@
+"""
+Migration 014: Add CloudWatch metric rollups
+- Create cloudwatch_metric_rollups table (1m/5m/1h pre-aggregates)
+- Backfill rollups from existing raw datapoints
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '014_cloudwatch_metric_rollups'
+down_revision = '013_cloudformation'
+branch_labels = None
+depends_on = None
+
+
+ROLLUP_RESOLUTIONS = (60, 300, 3600)
+EPOCH = datetime(1970, 1, 1)
+
+
+def _series_key(namespace, metric_name, dimensions_json):
+    """Must match app.services.metric_store.series_key."""
+    dimensions = json.loads(dimensions_json) if dimensions_json else {}
+    canonical = json.dumps(
+        {"namespace": namespace, "metric_name": metric_name, "dimensions": dimensions},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # ============================================
+    # Create cloudwatch_metric_rollups table
+    # ============================================
+
+    rollups = op.create_table(
+        'cloudwatch_metric_rollups',
+        sa.Column('account_id', sa.String(12), primary_key=True, nullable=False),
+        sa.Column('series_key', sa.String(64), primary_key=True, nullable=False),
+        sa.Column('resolution', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('period_start', sa.DateTime(), primary_key=True, nullable=False),
+        sa.Column('namespace', sa.String(255), nullable=False),
+        sa.Column('metric_name', sa.String(255), nullable=False),
+        sa.Column('dimensions', sa.Text(), nullable=True),
+        sa.Column('unit', sa.String(50), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('minimum', sa.Float(), nullable=False),
+        sa.Column('maximum', sa.Float(), nullable=False)
+    )
+
+    # Composite index for statistics lookups without a series filter
+    op.create_index(
+        'ix_cloudwatch_metric_rollups_lookup',
+        'cloudwatch_metric_rollups',
+        ['account_id', 'namespace', 'metric_name', 'resolution', 'period_start']
+    )
+
+    # ============================================
+    # Backfill rollups from raw datapoints
+    # ============================================
+
+    bind = op.get_bind()
+    result = bind.execute(sa.text(
+        "SELECT account_id, namespace, metric_name, dimensions, unit, timestamp, value "
+        "FROM cloudwatch_metrics"
+    ))
+
+    buckets = {}
+    for account_id, namespace, metric_name, dimensions, unit, timestamp, value in result:
+        key = _series_key(namespace, metric_name, dimensions)
+        canonical_dims = (
+            json.dumps(json.loads(dimensions), sort_keys=True) if dimensions else None
+        )
+        epoch = int((timestamp - EPOCH).total_seconds())
+        for resolution in ROLLUP_RESOLUTIONS:
+            period_start = EPOCH + timedelta(seconds=epoch - epoch % resolution)
+            bucket_id = (account_id, key, resolution, period_start)
+            agg = buckets.get(bucket_id)
+            if agg is None:
+                buckets[bucket_id] = {
+                    "account_id": account_id,
+                    "series_key": key,
+                    "resolution": resolution,
+                    "period_start": period_start,
+                    "namespace": namespace,
+                    "metric_name": metric_name,
+                    "dimensions": canonical_dims,
+                    "unit": unit,
+                    "sample_count": 1,
+                    "sum": value,
+                    "minimum": value,
+                    "maximum": value
+                }
+            else:
+                agg["sample_count"] += 1
+                agg["sum"] += value
+                agg["minimum"] = min(agg["minimum"], value)
+                agg["maximum"] = max(agg["maximum"], value)
+
+    if buckets:
+        op.bulk_insert(rollups, list(buckets.values()))
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_index('ix_cloudwatch_metric_rollups_lookup', 'cloudwatch_metric_rollups')
+    op.drop_table('cloudwatch_metric_rollups')
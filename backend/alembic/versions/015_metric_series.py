@@ -0,0 +1,209 @@
+"""
+Migration 015: Add CloudWatch metric series index
+- Create metric_series and metric_series_dimensions tables
+- Add series_id to cloudwatch_metrics
+- Backfill series from existing datapoints and re-key rollups by series id
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '015_metric_series'
+down_revision = '014_cloudwatch_metric_rollups'
+branch_labels = None
+depends_on = None
+
+
+def _series_id(account_id, namespace, metric_name, dimensions):
+    """Must match app.services.metric_store.series_key."""
+    canonical = json.dumps(
+        {
+            "account_id": account_id,
+            "namespace": namespace,
+            "metric_name": metric_name,
+            "dimensions": dimensions or {}
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _legacy_series_key(namespace, metric_name, dimensions):
+    """Rollup series key used by migration 014 (without the account)."""
+    canonical = json.dumps(
+        {"namespace": namespace, "metric_name": metric_name, "dimensions": dimensions or {}},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _rekey_rollups(bind, key_for):
+    """Recompute series_key on every rollup row with ``key_for(account, namespace, metric, dims)``."""
+    rollup_series = bind.execute(sa.text(
+        "SELECT DISTINCT account_id, series_key, namespace, metric_name, dimensions "
+        "FROM cloudwatch_metric_rollups"
+    )).fetchall()
+
+    for account_id, old_key, namespace, metric_name, dimensions_json in rollup_series:
+        dimensions = json.loads(dimensions_json) if dimensions_json else {}
+        bind.execute(
+            sa.text(
+                "UPDATE cloudwatch_metric_rollups SET series_key = :new_key "
+                "WHERE account_id = :account_id AND series_key = :old_key"
+            ),
+            {
+                "new_key": key_for(account_id, namespace, metric_name, dimensions),
+                "account_id": account_id,
+                "old_key": old_key
+            }
+        )
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # ============================================
+    # Create metric_series table
+    # ============================================
+
+    series_table = op.create_table(
+        'metric_series',
+        sa.Column('series_id', sa.String(64), primary_key=True, nullable=False),
+        sa.Column('account_id', sa.String(12), nullable=False),
+        sa.Column('namespace', sa.String(255), nullable=False),
+        sa.Column('metric_name', sa.String(255), nullable=False),
+        sa.Column('dimensions', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False)
+    )
+
+    op.create_index(
+        'ix_metric_series_account_namespace_name',
+        'metric_series',
+        ['account_id', 'namespace', 'metric_name']
+    )
+
+    # ============================================
+    # Create metric_series_dimensions table
+    # ============================================
+
+    dimensions_table = op.create_table(
+        'metric_series_dimensions',
+        sa.Column(
+            'series_id',
+            sa.String(64),
+            sa.ForeignKey('metric_series.series_id', ondelete='CASCADE'),
+            primary_key=True,
+            nullable=False
+        ),
+        sa.Column('name', sa.String(255), primary_key=True, nullable=False),
+        sa.Column('value', sa.String(1024), nullable=False),
+        sa.Column('account_id', sa.String(12), nullable=False)
+    )
+
+    op.create_index(
+        'ix_metric_series_dimensions_lookup',
+        'metric_series_dimensions',
+        ['account_id', 'name', 'value']
+    )
+
+    # ============================================
+    # Link raw datapoints to their series
+    # ============================================
+
+    op.add_column('cloudwatch_metrics', sa.Column('series_id', sa.String(64), nullable=True))
+    op.create_index(
+        'ix_cloudwatch_metrics_series_time',
+        'cloudwatch_metrics',
+        ['series_id', 'timestamp']
+    )
+
+    # ============================================
+    # Backfill series from raw datapoints
+    # ============================================
+
+    bind = op.get_bind()
+    distinct_series = bind.execute(sa.text(
+        "SELECT DISTINCT account_id, namespace, metric_name, dimensions "
+        "FROM cloudwatch_metrics"
+    )).fetchall()
+
+    now = datetime.utcnow()
+    series_rows = {}
+    dimension_rows = []
+    for account_id, namespace, metric_name, dimensions_json in distinct_series:
+        dimensions = json.loads(dimensions_json) if dimensions_json else {}
+        canonical_dims = json.dumps(dimensions, sort_keys=True) if dimensions else None
+        series_id = _series_id(account_id, namespace, metric_name, dimensions)
+
+        bind.execute(
+            sa.text(
+                "UPDATE cloudwatch_metrics SET series_id = :series_id, dimensions = :canonical "
+                "WHERE account_id = :account_id AND namespace = :namespace "
+                "AND metric_name = :metric_name "
+                "AND (dimensions = :dimensions OR (dimensions IS NULL AND :dimensions IS NULL))"
+            ),
+            {
+                "series_id": series_id,
+                "canonical": canonical_dims,
+                "account_id": account_id,
+                "namespace": namespace,
+                "metric_name": metric_name,
+                "dimensions": dimensions_json
+            }
+        )
+
+        # Differently-ordered JSON for the same dimensions maps to one series
+        if series_id in series_rows:
+            continue
+        series_rows[series_id] = {
+            "series_id": series_id,
+            "account_id": account_id,
+            "namespace": namespace,
+            "metric_name": metric_name,
+            "dimensions": canonical_dims,
+            "created_at": now
+        }
+        for name, value in dimensions.items():
+            dimension_rows.append({
+                "series_id": series_id,
+                "name": name,
+                "value": str(value),
+                "account_id": account_id
+            })
+
+    if series_rows:
+        op.bulk_insert(series_table, list(series_rows.values()))
+    if dimension_rows:
+        op.bulk_insert(dimensions_table, dimension_rows)
+
+    # ============================================
+    # Re-key rollups by account-scoped series id
+    # ============================================
+
+    _rekey_rollups(bind, _series_id)
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    _rekey_rollups(
+        op.get_bind(),
+        lambda account_id, namespace, metric_name, dimensions: _legacy_series_key(
+            namespace, metric_name, dimensions
+        )
+    )
+
+    op.drop_index('ix_cloudwatch_metrics_series_time', 'cloudwatch_metrics')
+    op.drop_column('cloudwatch_metrics', 'series_id')
+
+    op.drop_index('ix_metric_series_dimensions_lookup', 'metric_series_dimensions')
+    op.drop_table('metric_series_dimensions')
+
+    op.drop_index('ix_metric_series_account_namespace_name', 'metric_series')
+    op.drop_table('metric_series')
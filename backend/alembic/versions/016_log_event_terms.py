@@ -0,0 +1,84 @@
+"""
+Migration 016: Add CloudWatch Logs term index
+- Create log_event_terms inverted index for FilterLogEvents
+- Backfill terms from existing log events
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '016_log_event_terms'
+down_revision = '015_metric_series'
+branch_labels = None
+depends_on = None
+
+
+# Must match app.services.log_filter_pattern.tokenize
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+MAX_TERM_LENGTH = 255
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # ============================================
+    # Create log_event_terms table
+    # ============================================
+
+    terms = op.create_table(
+        'log_event_terms',
+        sa.Column('log_group_name', sa.String(512), primary_key=True, nullable=False),
+        sa.Column('term', sa.String(255), primary_key=True, nullable=False),
+        sa.Column('timestamp', sa.DateTime(), primary_key=True, nullable=False),
+        sa.Column(
+            'event_id',
+            sa.String(50),
+            sa.ForeignKey('log_events.event_id', ondelete='CASCADE'),
+            primary_key=True,
+            nullable=False
+        ),
+        sa.Column('stream_id', sa.String(50), nullable=False)
+    )
+
+    op.create_index('ix_log_event_terms_event_id', 'log_event_terms', ['event_id'])
+
+    # ============================================
+    # Backfill terms from existing events
+    # ============================================
+
+    bind = op.get_bind()
+    result = bind.execute(sa.text(
+        "SELECT s.log_group_name, e.event_id, e.stream_id, e.timestamp, e.message "
+        "FROM log_events e JOIN log_streams s ON s.stream_id = e.stream_id"
+    ))
+
+    rows = []
+    for log_group_name, event_id, stream_id, timestamp, message in result:
+        for term in set(TOKEN_PATTERN.findall(message)):
+            if len(term) > MAX_TERM_LENGTH:
+                continue
+            rows.append({
+                "log_group_name": log_group_name,
+                "term": term,
+                "timestamp": timestamp,
+                "event_id": event_id,
+                "stream_id": stream_id
+            })
+
+        if len(rows) >= BACKFILL_BATCH_SIZE:
+            op.bulk_insert(terms, rows)
+            rows = []
+
+    if rows:
+        op.bulk_insert(terms, rows)
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_index('ix_log_event_terms_event_id', 'log_event_terms')
+    op.drop_table('log_event_terms')
@@ -0,0 +1,68 @@
+"""
+Migration 017: Add S3 multipart uploads
+- Create s3_multipart_uploads table
+- Create s3_multipart_parts table
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '017_s3_multipart_uploads'
+down_revision = '016_log_event_terms'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # ============================================
+    # Create s3_multipart_uploads table
+    # ============================================
+
+    op.create_table(
+        's3_multipart_uploads',
+        sa.Column('upload_id', sa.String(64), primary_key=True, nullable=False),
+        sa.Column('bucket_name', sa.String(63), nullable=False),
+        sa.Column('account_id', sa.String(12), nullable=False),
+        sa.Column('object_key', sa.String(1024), nullable=False),
+        sa.Column('content_type', sa.String(255), nullable=True),
+        sa.Column('object_metadata', sa.Text(), nullable=True),
+        sa.Column('tags', sa.Text(), nullable=True),
+        sa.Column('initiated_at', sa.DateTime(), nullable=False)
+    )
+
+    op.create_index('ix_s3_multipart_uploads_bucket_name', 's3_multipart_uploads', ['bucket_name'])
+    op.create_index('ix_s3_multipart_uploads_account_id', 's3_multipart_uploads', ['account_id'])
+    op.create_index('ix_s3_multipart_uploads_initiated_at', 's3_multipart_uploads', ['initiated_at'])
+
+    # ============================================
+    # Create s3_multipart_parts table
+    # ============================================
+
+    op.create_table(
+        's3_multipart_parts',
+        sa.Column(
+            'upload_id',
+            sa.String(64),
+            sa.ForeignKey('s3_multipart_uploads.upload_id', ondelete='CASCADE'),
+            primary_key=True,
+            nullable=False
+        ),
+        sa.Column('part_number', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('etag', sa.String(64), nullable=False),
+        sa.Column('filesystem_path', sa.String(1500), nullable=False),
+        sa.Column('last_modified', sa.DateTime(), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_table('s3_multipart_parts')
+
+    op.drop_index('ix_s3_multipart_uploads_initiated_at', 's3_multipart_uploads')
+    op.drop_index('ix_s3_multipart_uploads_account_id', 's3_multipart_uploads')
+    op.drop_index('ix_s3_multipart_uploads_bucket_name', 's3_multipart_uploads')
+    op.drop_table('s3_multipart_uploads')
@@ -0,0 +1,28 @@
+"""
+Migration 018: Add S3 object listing index
+- Composite (account_id, bucket_name, is_latest, object_key) index for
+  keyset-paginated ListObjects
+"""
+from alembic import op
+
+# Revision identifiers
+revision = '018_s3_object_listing_index'
+down_revision = '017_s3_multipart_uploads'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    op.create_index(
+        'ix_s3_objects_listing',
+        's3_objects',
+        ['account_id', 'bucket_name', 'is_latest', 'object_key']
+    )
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_index('ix_s3_objects_listing', 's3_objects')
@@ -0,0 +1,46 @@
+"""
+Migration 019: Add S3 content-addressed blob store
+- Create s3_blobs table (one row per distinct SHA-256, reference counted)
+- Add s3_objects.blob_sha256 pointing objects at shared blobs
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '019_s3_blobs'
+down_revision = '018_s3_object_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # ============================================
+    # Create s3_blobs table
+    # ============================================
+
+    op.create_table(
+        's3_blobs',
+        sa.Column('sha256', sa.String(64), primary_key=True, nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('md5', sa.String(32), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('filesystem_path', sa.String(1500), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False)
+    )
+
+    # ============================================
+    # Point objects at blobs (existing objects keep their own files)
+    # ============================================
+
+    op.add_column('s3_objects', sa.Column('blob_sha256', sa.String(64), nullable=True))
+    op.create_index('ix_s3_objects_blob_sha256', 's3_objects', ['blob_sha256'])
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_index('ix_s3_objects_blob_sha256', 's3_objects')
+    op.drop_column('s3_objects', 'blob_sha256')
+    op.drop_table('s3_blobs')
@@ -0,0 +1,47 @@
+"""
+Migration 020: Add S3 lifecycle executor support
+- Add s3_objects.noncurrent_since (backfilled from last_modified)
+- Add age-scan indexes for expiration, transitions and noncurrent expiration
+- Add buckets.lifecycle_checkpoint for incremental lifecycle runs
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '020_s3_lifecycle'
+down_revision = '019_s3_blobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    op.add_column('s3_objects', sa.Column('noncurrent_since', sa.DateTime(), nullable=True))
+
+    # Best available approximation for versions that are already noncurrent
+    op.execute(
+        "UPDATE s3_objects SET noncurrent_since = last_modified WHERE is_latest = false"
+    )
+
+    op.create_index(
+        'ix_s3_objects_lifecycle',
+        's3_objects',
+        ['account_id', 'bucket_name', 'is_latest', 'created_at']
+    )
+    op.create_index(
+        'ix_s3_objects_noncurrent',
+        's3_objects',
+        ['account_id', 'bucket_name', 'noncurrent_since']
+    )
+
+    op.add_column('buckets', sa.Column('lifecycle_checkpoint', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_column('buckets', 'lifecycle_checkpoint')
+    op.drop_index('ix_s3_objects_noncurrent', 's3_objects')
+    op.drop_index('ix_s3_objects_lifecycle', 's3_objects')
+    op.drop_column('s3_objects', 'noncurrent_since')
@@ -0,0 +1,74 @@
+"""
+Migration 021: Add incrementally maintained S3 bucket stats
+- Create s3_bucket_stats table (object count and bytes per bucket,
+  top-level prefix and storage class)
+- Backfill it from the existing object rows
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '021_s3_bucket_stats'
+down_revision = '020_s3_lifecycle'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # ============================================
+    # Create s3_bucket_stats table
+    # ============================================
+
+    stats = op.create_table(
+        's3_bucket_stats',
+        sa.Column('account_id', sa.String(12), primary_key=True, nullable=False),
+        sa.Column('bucket_name', sa.String(63), primary_key=True, nullable=False),
+        sa.Column('prefix', sa.String(1024), primary_key=True, nullable=False),
+        sa.Column('storage_class', sa.String(32), primary_key=True, nullable=False),
+        sa.Column('object_count', sa.BigInteger(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False)
+    )
+
+    # ============================================
+    # Backfill from existing objects (delete markers are not counted)
+    # ============================================
+
+    totals = defaultdict(lambda: [0, 0])
+    rows = op.get_bind().execute(sa.text(
+        "SELECT account_id, bucket_name, object_key, storage_class, size_bytes "
+        "FROM s3_objects WHERE is_delete_marker = false"
+    ))
+    for account_id, bucket_name, object_key, storage_class, size_bytes in rows:
+        index = object_key.find('/')
+        prefix = object_key[:index + 1] if index >= 0 else ''
+        total = totals[(account_id, bucket_name, prefix, storage_class)]
+        total[0] += 1
+        total[1] += size_bytes
+
+    now = datetime.utcnow()
+    if totals:
+        op.bulk_insert(stats, [
+            {
+                'account_id': account_id,
+                'bucket_name': bucket_name,
+                'prefix': prefix,
+                'storage_class': storage_class,
+                'object_count': object_count,
+                'size_bytes': size_bytes,
+                'updated_at': now
+            }
+            for (account_id, bucket_name, prefix, storage_class), (object_count, size_bytes)
+            in totals.items()
+        ])
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    op.drop_table('s3_bucket_stats')
@@ -0,0 +1,52 @@
+"""
+Migration 022: Store access key secrets encrypted
+- Add access_keys.secret_access_key_encrypted (needed to verify SigV4
+  signed requests)
+- Make access_keys.secret_access_key_hash nullable; existing keys keep
+  their bcrypt hash until their first successful authentication replaces
+  it with the encrypted secret
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '022_access_key_encrypted_secrets'
+down_revision = '021_s3_bucket_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    op.add_column(
+        'access_keys',
+        sa.Column('secret_access_key_encrypted', sa.Text(), nullable=True,
+                  comment='Fernet-encrypted secret access key')
+    )
+    op.alter_column(
+        'access_keys',
+        'secret_access_key_hash',
+        existing_type=sa.String(255),
+        nullable=True,
+        comment='Bcrypt hash of secret access key (legacy keys only)'
+    )
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    # Keys without a hash cannot be verified by the previous schema; mark
+    # them inactive with an unusable hash rather than deleting them
+    op.execute(
+        "UPDATE access_keys SET secret_access_key_hash = '!', status = 'Inactive' "
+        "WHERE secret_access_key_hash IS NULL"
+    )
+    op.alter_column(
+        'access_keys',
+        'secret_access_key_hash',
+        existing_type=sa.String(255),
+        nullable=False,
+        comment='Bcrypt hash of secret access key'
+    )
+    op.drop_column('access_keys', 'secret_access_key_encrypted')
@@ -0,0 +1,46 @@
+"""
+Migration 023: Use the "C" collation for S3 object keys
+- s3_objects.object_key sorts and compares in code point order (as S3
+  does) instead of the database's locale collation, which ListObjects
+  keyset paging and common-prefix skipping rely on; indexes on the
+  column are rebuilt with it
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '023_s3_object_key_collation'
+down_revision = '022_access_key_encrypted_secrets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply migration."""
+
+    # SQLite already compares text bytewise (BINARY)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column(
+        's3_objects',
+        'object_key',
+        existing_type=sa.String(1024),
+        type_=sa.String(1024, collation='C'),
+        existing_nullable=False
+    )
+
+
+def downgrade() -> None:
+    """Revert migration."""
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column(
+        's3_objects',
+        'object_key',
+        existing_type=sa.String(1024, collation='C'),
+        type_=sa.String(1024),
+        existing_nullable=False
+    )
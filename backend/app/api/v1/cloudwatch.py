@@ -60,8 +60,8 @@ def put_metric_data(
             for datum in request.metric_data
         ]
         
-        # Store metrics
-        metrics = cloudwatch_service.put_metric_data_batch(
+        # Store metrics (validated up front, single insert and commit)
+        result = cloudwatch_service.put_metric_data_bulk(
             db,
             current_user.account_id,
             request.namespace,
@@ -70,10 +70,12 @@ def put_metric_data(
         
         return PutMetricDataResponse(
             message="Metrics stored successfully",
-            metrics_stored=len(metrics)
+            metrics_stored=result["metrics_stored"],
+            series_updated=result["series_updated"]
         )
     except ValidationError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        # Keep the per-datum errors ({"field": "metric_data[i]", "message": ...})
+        raise HTTPException(status_code=400, detail={"message": e.message, **e.details})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
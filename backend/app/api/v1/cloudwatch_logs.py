@@ -313,3 +313,121 @@ def get_log_events(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.post("/logs/events/filter", response_model=FilterLogEventsResponse)
+def filter_log_events(
+    request: FilterLogEventsRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search log events across the streams of a log group.
+    Required IAM permission: logs:FilterLogEvents
+    """
+    try:
+        result = logs_service.filter_log_events(
+            db,
+            current_user.account_id,
+            request.log_group_name,
+            log_stream_names=request.log_stream_names,
+            log_stream_name_prefix=request.log_stream_name_prefix,
+            start_time=request.start_time,
+            end_time=request.end_time,
+            filter_pattern=request.filter_pattern,
+            limit=request.limit,
+            next_token=request.next_token
+        )
+        
+        return FilterLogEventsResponse(
+            events=[
+                FilteredLogEvent(
+                    log_stream_name=event["logStreamName"],
+                    timestamp=event["timestamp"],
+                    message=event["message"],
+                    ingestion_time=event["ingestionTime"],
+                    event_id=event["eventId"]
+                )
+                for event in result["events"]
+            ],
+            next_token=result["nextToken"]
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== Logs Insights ====================
+
+@router.post("/logs/insights/start", response_model=StartQueryResponse)
+async def start_query(
+    request: StartQueryRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a Logs Insights query; poll /logs/insights/results for the outcome.
+    Required IAM permission: logs:StartQuery
+    """
+    try:
+        query_id = logs_service.start_query(
+            current_user.account_id,
+            request.log_group_names,
+            request.start_time,
+            request.end_time,
+            request.query_string,
+            request.limit
+        )
+        
+        return StartQueryResponse(query_id=query_id)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/logs/insights/results", response_model=GetQueryResultsResponse)
+def get_query_results(
+    request: QueryIdRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status and results of a Logs Insights query.
+    Required IAM permission: logs:GetQueryResults
+    """
+    try:
+        result = logs_service.get_query_results(current_user.account_id, request.query_id)
+        
+        return GetQueryResultsResponse(
+            status=result["status"],
+            results=[
+                [ResultField(**field) for field in row]
+                for row in result["results"]
+            ],
+            statistics=QueryStatistics(**result["statistics"]),
+            error=result["error"]
+        )
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/logs/insights/stop", response_model=StopQueryResponse)
+def stop_query(
+    request: QueryIdRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stop a running Logs Insights query.
+    Required IAM permission: logs:StopQuery
+    """
+    try:
+        success = logs_service.stop_query(current_user.account_id, request.query_id)
+        
+        return StopQueryResponse(success=success)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
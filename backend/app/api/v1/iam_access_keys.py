@@ -19,6 +19,7 @@ from app.schemas.common import SuccessResponse
 from app.models.iam_user import User
 from app.models.iam_access_key import AccessKey
 from app.services.auth_service import AuthService
+from app.services.access_key_cache import access_key_cache
 from app.core.resource_ids import generate_access_key
 from app.core.exceptions import ResourceNotFoundError, LimitExceededError
 import secrets
@@ -77,14 +78,14 @@ async def create_access_key(
     access_key_id = generate_access_key()
     secret_access_key = secrets.token_urlsafe(32)  # 40+ characters
     
-    # Hash secret
-    secret_hash = AuthService.hash_password(secret_access_key)
+    # Encrypt secret (SigV4 verification needs it back)
+    secret_encrypted = AuthService.encrypt_secret(secret_access_key)
     
     # Create access key
     access_key = AccessKey(
         access_key_id=access_key_id,
         user_id=user.user_id,
-        secret_access_key_hash=secret_hash,
+        secret_access_key_encrypted=secret_encrypted,
         status="Active"
     )
     
@@ -176,6 +177,7 @@ async def update_access_key_status(
     # Update status
     access_key.status = status
     await db.commit()
+    access_key_cache.invalidate(access_key_id)
     
     return SuccessResponse(
         success=True,
@@ -219,6 +221,7 @@ async def delete_access_key(
     
     await db.delete(access_key)
     await db.commit()
+    access_key_cache.invalidate(access_key_id)
     
     return SuccessResponse(
         success=True,
@@ -20,6 +20,7 @@ from app.schemas.iam_operations import (
 from app.schemas.common import SuccessResponse
 from app.models.iam_group import Group
 from app.models.iam_user import User
+from app.services.policy_cache import policy_cache
 from app.core.resource_ids import generate_id, ResourceType
 from app.utils.arn import build_arn
 from app.core.exceptions import ResourceAlreadyExistsError, ResourceNotFoundError
@@ -168,6 +169,7 @@ async def add_user_to_group(
     if user not in group.users:
         group.users.append(user)
         await db.commit()
+        policy_cache.bump()
     
     return SuccessResponse(
         success=True,
@@ -218,6 +220,7 @@ async def remove_user_from_group(
     if user in group.users:
         group.users.remove(user)
         await db.commit()
+        policy_cache.bump()
     
     return SuccessResponse(
         success=True,
@@ -254,6 +257,7 @@ async def delete_group(
     
     await db.delete(group)
     await db.commit()
+    policy_cache.bump()
     
     return SuccessResponse(
         success=True,
@@ -17,13 +17,17 @@ from app.schemas.iam_operations import (
     PolicyResponse,
     ListPoliciesResponse,
     AttachPolicyRequest,
-    DetachPolicyRequest
+    DetachPolicyRequest,
+    SimulatePrincipalPolicyRequest,
+    SimulatePrincipalPolicyResponse
 )
 from app.schemas.common import SuccessResponse
 from app.schemas.iam_policy import PolicyDocument
 from app.models.iam_policy import Policy
 from app.models.iam_user import User
 from app.models.iam_group import Group
+from app.services.policy_cache import policy_cache
+from app.services.policy_service import PolicyEvaluator
 from app.core.resource_ids import generate_id, ResourceType
 from app.utils.arn import build_arn
 from app.core.exceptions import ResourceAlreadyExistsError, ResourceNotFoundError, ValidationError
@@ -156,6 +160,58 @@ async def list_policies(
     )
 
 
+@router.post(
+    "/simulate",
+    response_model=SimulatePrincipalPolicyResponse,
+    summary="Simulate a user's policies",
+    dependencies=[Depends(RequirePermission("iam:SimulatePrincipalPolicy"))]
+)
+async def simulate_principal_policy(
+    request: SimulatePrincipalPolicyRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> SimulatePrincipalPolicyResponse:
+    """
+    Evaluate a user's effective policies for every action × resource pair
+    
+    **Required Permission:** `iam:SimulatePrincipalPolicy`
+    
+    The whole matrix is evaluated in one pass over the user's compiled
+    policies. Only statements that decide some cell are returned.
+    """
+    result = await db.execute(
+        select(User.user_id).where(
+            User.username == request.username,
+            User.account_id == current_user.account_id
+        )
+    )
+    user_id = result.scalar_one_or_none()
+    if not user_id:
+        raise ResourceNotFoundError(resource_type="User", resource_id=request.username)
+    
+    compiled = await PolicyEvaluator.get_compiled_policies(db, user_id)
+    statements, matrix = compiled.simulate(request.actions, request.resources)
+    
+    # Renumber to the statements that decide at least one cell
+    used = sorted({index for row in matrix for index in row if index >= 0})
+    renumbered = {index: position for position, index in enumerate(used)}
+    renumbered[-1] = -1
+    
+    denied = sum(1 for row in matrix for index in row if index >= 0 and statements[index].effect == "Deny")
+    implicitly_denied = sum(row.count(-1) for row in matrix)
+    
+    return SimulatePrincipalPolicyResponse(
+        username=request.username,
+        actions=request.actions,
+        resources=request.resources,
+        statements=[statements[index].summary for index in used],
+        matrix=[[renumbered[index] for index in row] for row in matrix],
+        allowed=len(request.actions) * len(request.resources) - denied - implicitly_denied,
+        denied=denied,
+        implicitly_denied=implicitly_denied
+    )
+
+
 @router.post(
     "/attach/user/{username}",
     response_model=SuccessResponse,
@@ -197,6 +253,7 @@ async def attach_user_policy(
         user.attached_policies.append(policy)
         policy.attachment_count += 1
         await db.commit()
+        policy_cache.bump()
     
     return SuccessResponse(
         success=True,
@@ -245,6 +302,7 @@ async def detach_user_policy(
         user.attached_policies.remove(policy)
         policy.attachment_count -= 1
         await db.commit()
+        policy_cache.bump()
     
     return SuccessResponse(
         success=True,
@@ -293,6 +351,7 @@ async def attach_group_policy(
         group.attached_policies.append(policy)
         policy.attachment_count += 1
         await db.commit()
+        policy_cache.bump()
     
     return SuccessResponse(
         success=True,
@@ -334,6 +393,7 @@ async def delete_policy(
     
     await db.delete(policy)
     await db.commit()
+    policy_cache.bump()
     
     return SuccessResponse(
         success=True,
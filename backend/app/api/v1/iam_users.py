@@ -20,6 +20,8 @@ from app.schemas.iam_operations import (
 from app.schemas.common import SuccessResponse
 from app.models.iam_user import User
 from app.services.auth_service import AuthService
+from app.services.policy_cache import policy_cache
+from app.services.access_key_cache import access_key_cache
 from app.core.resource_ids import generate_id, ResourceType
 from app.utils.arn import build_arn
 from app.core.exceptions import ResourceAlreadyExistsError, ResourceNotFoundError
@@ -241,6 +243,7 @@ async def update_user(
     
     await db.commit()
     await db.refresh(user)
+    access_key_cache.invalidate_user(user.user_id)
     
     return UserResponse.model_validate(user)
 
@@ -283,6 +286,8 @@ async def delete_user(
     
     await db.delete(user)
     await db.commit()
+    policy_cache.bump()
+    access_key_cache.invalidate_user(user.user_id)
     
     return SuccessResponse(
         success=True,
@@ -4,9 +4,13 @@ S3 API Routes
 IAM-protected endpoints for S3 bucket and object operations.
 """
 
-from io import BytesIO
-from fastapi import APIRouter, Depends, UploadFile, File, Query, HTTPException
-from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, UploadFile, File, Query, Header, HTTPException, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -21,6 +25,7 @@ from app.schemas.s3 import (
     CreateBucketRequest,
     BucketResponse,
     ListBucketsResponse,
+    BucketMetricsResponse,
     DeleteBucketRequest,
     PutObjectRequest,
     ObjectResponse,
@@ -28,7 +33,13 @@ from app.schemas.s3 import (
     ListObjectsResponse,
     GetObjectResponse,
     DeleteObjectsRequest,
-    DeleteObjectsResponse
+    DeleteObjectsResponse,
+    CopyObjectRequest,
+    MultipartUploadResponse,
+    UploadPartResponse,
+    UploadPartCopyRequest,
+    ListPartsResponse,
+    CompleteMultipartUploadRequest
 )
 from app.core.exceptions import ResourceNotFoundError, ValidationError, ConflictError
 
@@ -146,6 +157,39 @@ async def get_bucket(
     return bucket
 
 
+@router.get("/buckets/{bucket_name}/metrics", response_model=BucketMetricsResponse)
+
+async def get_bucket_metrics(
+    bucket_name: str,
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Get bucket object count and size, by storage class and top-level prefix.
+    
+    Served from counters maintained with every object change, so the cost
+    does not depend on the number of objects.
+    
+    Requires: s3:GetBucket
+    
+    Args:
+        bucket_name: Bucket name
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Bucket storage metrics
+    
+    Raises:
+        ResourceNotFoundError: If bucket not found
+    """
+    return s3_service.get_bucket_metrics(
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name
+    )
+
+
 @router.delete("/buckets/{bucket_name}")
 
 async def delete_bucket(
@@ -218,17 +262,15 @@ async def put_object(
     if content_type is None:
         content_type = file.content_type
     
-    # Read file content
-    content = await file.read()
-    content_io = BytesIO(content)
-    
-    # Upload object
-    s3_object = s3_service.put_object(
+    # Stream the spooled upload straight into the bucket, off the event loop
+    await file.seek(0)
+    s3_object = await run_in_threadpool(
+        s3_service.put_object,
         db=db,
         account_id=current_account.account_id,
         bucket_name=bucket_name,
         object_key=object_key,
-        content=content_io,
+        content=file.file,
         content_type=content_type,
         metadata=None,
         tags=None
@@ -242,8 +284,11 @@ async def put_object(
 async def list_objects(
     bucket_name: str,
     prefix: str = Query(default=None),
+    delimiter: str = Query(default=None, description="Roll keys up into common prefixes (e.g., '/')"),
     limit: int = Query(default=1000, ge=1, le=1000),
-    offset: int = Query(default=0, ge=0),
+    continuation_token: str = Query(default=None),
+    start_after: str = Query(default=None),
+    fetch_count: bool = Query(default=False, description="Also count all matching objects"),
     db: Session = Depends(get_db),
     current_account: Account = Depends(get_current_account)
 ):
@@ -255,41 +300,119 @@ async def list_objects(
     Args:
         bucket_name: Source bucket
         prefix: Filter by key prefix (e.g., "folder/")
-        limit: Maximum results
-        offset: Pagination offset
+        delimiter: Roll keys up into common prefixes at this delimiter
+        limit: Maximum objects plus common prefixes
+        continuation_token: Token from the previous page
+        start_after: Start listing after this key
+        fetch_count: Also count all matching objects (costs a full scan)
         db: Database session
         current_account: Authenticated account
     
     Returns:
-        List of objects with total count
+        One page of objects and common prefixes
     
     Raises:
         ResourceNotFoundError: If bucket not found
+        ValidationError: If the continuation token is invalid
     """
-    objects = s3_service.list_objects(
+    objects, common_prefixes, next_token = s3_service.list_objects(
         db=db,
         account_id=current_account.account_id,
         bucket_name=bucket_name,
         prefix=prefix,
-        limit=limit,
-        offset=offset
+        delimiter=delimiter,
+        max_keys=limit,
+        continuation_token=continuation_token,
+        start_after=start_after
     )
     
-    # Get total count
-    query = db.query(func.count(S3Object.object_id)).filter(
-        S3Object.bucket_name == bucket_name,
-        S3Object.account_id == current_account.account_id
+    total = None
+    if fetch_count:
+        total = s3_service.count_objects(
+            db=db,
+            account_id=current_account.account_id,
+            bucket_name=bucket_name,
+            prefix=prefix
+        )
+    
+    return ListObjectsResponse(
+        objects=objects,
+        common_prefixes=common_prefixes,
+        bucket_name=bucket_name,
+        prefix=prefix,
+        delimiter=delimiter,
+        key_count=len(objects) + len(common_prefixes),
+        is_truncated=next_token is not None,
+        next_continuation_token=next_token,
+        total=total
     )
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header to naive UTC; invalid dates are ignored."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _object_headers(s3_object: S3Object) -> dict:
+    """Validator headers shared by 200, 206 and 304 responses."""
+    return {
+        "ETag": f'"{s3_object.etag}"',
+        "Last-Modified": format_datetime(
+            s3_object.last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    }
+
+
+def _serve_object(
+    bucket_name: str,
+    object_key: str,
+    db: Session,
+    current_account: Account,
+    if_match: Optional[str],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    if_unmodified_since: Optional[str]
+) -> Response:
+    """
+    Build the GetObject/HeadObject response.
     
-    if prefix:
-        query = query.filter(S3Object.object_key.like(f"{prefix}%"))
+    Conditional headers are evaluated first (304/412). Otherwise the file
+    is served with FileResponse, which honours Range (single and multiple
+    ranges, If-Range) and hands full-file sends to the server's zero-copy
+    path where the server supports it. HEAD requests get headers only.
+    """
+    s3_object, object_path = s3_service.get_object_file(
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        object_key=object_key
+    )
     
-    total = query.scalar()
+    headers = _object_headers(s3_object)
     
-    return ListObjectsResponse(
-        objects=objects,
-        total=total,
-        bucket_name=bucket_name
+    not_modified = s3_service.check_preconditions(
+        s3_object,
+        if_match=if_match,
+        if_none_match=if_none_match,
+        if_modified_since=_parse_http_date(if_modified_since),
+        if_unmodified_since=_parse_http_date(if_unmodified_since)
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(
+        object_path,
+        media_type=s3_object.content_type,
+        filename=object_key.split("/")[-1],
+        headers=headers
     )
 
 
@@ -299,6 +422,10 @@ async def get_object(
     bucket_name: str,
     object_key: str,
     download: bool = Query(default=True, description="Download file content"),
+    if_match: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+    if_unmodified_since: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_account: Account = Depends(get_current_account)
 ):
@@ -307,10 +434,17 @@ async def get_object(
     
     Requires: s3:GetObject
     
+    Supports Range (including multiple ranges) and the If-Match,
+    If-None-Match, If-Modified-Since and If-Unmodified-Since headers.
+    
     Args:
         bucket_name: Source bucket
         object_key: Object key/path
         download: If True, download content; if False, return metadata only
+        if_match: Serve only if the ETag matches (else 412)
+        if_none_match: Respond 304 if the ETag matches
+        if_modified_since: Respond 304 unless modified after this date
+        if_unmodified_since: Serve only if not modified after this date (else 412)
         db: Database session
         current_account: Authenticated account
     
@@ -319,25 +453,12 @@ async def get_object(
     
     Raises:
         ResourceNotFoundError: If object not found
+        PreconditionFailedError: If If-Match or If-Unmodified-Since fails
     """
     if download:
-        # Download object content
-        s3_object, file_handle = s3_service.get_object(
-            db=db,
-            account_id=current_account.account_id,
-            bucket_name=bucket_name,
-            object_key=object_key
-        )
-        
-        # Return as streaming response
-        return StreamingResponse(
-            file_handle,
-            media_type=s3_object.content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{object_key.split("/")[-1]}"',
-                "ETag": s3_object.etag,
-                "Content-Length": str(s3_object.size_bytes)
-            }
+        return _serve_object(
+            bucket_name, object_key, db, current_account,
+            if_match, if_none_match, if_modified_since, if_unmodified_since
         )
     else:
         # Return metadata only
@@ -351,6 +472,35 @@ async def get_object(
         return GetObjectResponse(object=s3_object)
 
 
+@router.head("/buckets/{bucket_name}/objects/{object_key:path}")
+
+async def head_object(
+    bucket_name: str,
+    object_key: str,
+    if_match: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+    if_unmodified_since: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Get an object's headers without its content.
+    
+    Requires: s3:GetObject
+    
+    Honours Range and conditional headers exactly like GetObject.
+    
+    Raises:
+        ResourceNotFoundError: If object not found
+        PreconditionFailedError: If If-Match or If-Unmodified-Since fails
+    """
+    return _serve_object(
+        bucket_name, object_key, db, current_account,
+        if_match, if_none_match, if_modified_since, if_unmodified_since
+    )
+
+
 @router.delete("/buckets/{bucket_name}/objects/{object_key:path}")
 
 async def delete_object(
@@ -408,23 +558,13 @@ async def delete_objects(
     Returns:
         List of deleted objects and errors
     """
-    deleted = []
-    errors = []
-    
-    for object_key in request.object_keys:
-        try:
-            s3_service.delete_object(
-                db=db,
-                account_id=current_account.account_id,
-                bucket_name=bucket_name,
-                object_key=object_key
-            )
-            deleted.append(object_key)
-        except Exception as e:
-            errors.append({
-                "object_key": object_key,
-                "error": str(e)
-            })
+    deleted, errors = await run_in_threadpool(
+        s3_service.delete_objects,
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        object_keys=request.object_keys
+    )
     
     return DeleteObjectsResponse(
         deleted=deleted,
@@ -432,3 +572,309 @@ async def delete_objects(
     )
 
 
+@router.post("/buckets/{bucket_name}/copy-object", response_model=ObjectResponse)
+
+async def copy_object(
+    bucket_name: str,
+    request: CopyObjectRequest,
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Copy an object into a bucket server-side.
+    
+    Requires: s3:GetObject (source), s3:PutObject (target)
+    
+    Args:
+        bucket_name: Target bucket
+        request: Source object, target key and metadata directive
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Created object information
+    
+    Raises:
+        ResourceNotFoundError: If a bucket or the source object is not found
+        ValidationError: If the target key is invalid or the copy would not
+            change anything
+    """
+    return await run_in_threadpool(
+        s3_service.copy_object,
+        db=db,
+        account_id=current_account.account_id,
+        source_bucket=request.source_bucket,
+        source_key=request.source_key,
+        bucket_name=bucket_name,
+        object_key=request.object_key,
+        source_version_id=request.source_version_id,
+        metadata_directive=request.metadata_directive,
+        content_type=request.content_type,
+        metadata=request.metadata,
+        tags=request.tags
+    )
+
+
+# Multipart Upload Operations
+
+@router.post("/buckets/{bucket_name}/multipart-uploads", response_model=MultipartUploadResponse)
+
+async def create_multipart_upload(
+    bucket_name: str,
+    object_key: str = Query(..., description="Object key/path"),
+    content_type: str = Query(default=None),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Start a multipart upload.
+    
+    Requires: s3:PutObject
+    
+    Args:
+        bucket_name: Target bucket
+        object_key: Object key/path
+        content_type: MIME type (auto-detected if not provided)
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Upload information, including the upload ID for subsequent calls
+    
+    Raises:
+        ResourceNotFoundError: If bucket not found
+        ValidationError: If object key is invalid
+    """
+    return s3_service.create_multipart_upload(
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        content_type=content_type
+    )
+
+
+@router.put(
+    "/buckets/{bucket_name}/multipart-uploads/{upload_id}/parts/{part_number}",
+    response_model=UploadPartResponse
+)
+
+async def upload_part(
+    bucket_name: str,
+    upload_id: str,
+    part_number: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Upload one part of a multipart upload.
+    
+    Requires: s3:PutObject
+    
+    Parts may be uploaded concurrently and in any order; re-uploading a
+    part number replaces it.
+    
+    Args:
+        bucket_name: Target bucket
+        upload_id: Upload identifier
+        part_number: Part number (1-10000)
+        file: Part content
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Part number, ETag and size
+    
+    Raises:
+        ResourceNotFoundError: If upload not found
+        ValidationError: If part number is out of range
+    """
+    await file.seek(0)
+    return await run_in_threadpool(
+        s3_service.upload_part,
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        upload_id=upload_id,
+        part_number=part_number,
+        content=file.file
+    )
+
+
+@router.put(
+    "/buckets/{bucket_name}/multipart-uploads/{upload_id}/parts/{part_number}/copy",
+    response_model=UploadPartResponse
+)
+
+async def upload_part_copy(
+    bucket_name: str,
+    upload_id: str,
+    part_number: int,
+    request: UploadPartCopyRequest,
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Upload one part of a multipart upload by copying an existing object.
+    
+    Requires: s3:GetObject (source), s3:PutObject (target)
+    
+    Args:
+        bucket_name: Target bucket
+        upload_id: Upload identifier
+        part_number: Part number (1-10000)
+        request: Source object and optional byte range
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Part number, ETag and size
+    
+    Raises:
+        ResourceNotFoundError: If the upload or source object is not found
+        ValidationError: If part number or byte range is out of range
+    """
+    byte_range = None
+    if request.source_range:
+        first, last = request.source_range[len("bytes="):].split("-")
+        byte_range = (int(first), int(last))
+    
+    return await run_in_threadpool(
+        s3_service.upload_part_copy,
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        upload_id=upload_id,
+        part_number=part_number,
+        source_bucket=request.source_bucket,
+        source_key=request.source_key,
+        source_version_id=request.source_version_id,
+        byte_range=byte_range
+    )
+
+
+@router.get(
+    "/buckets/{bucket_name}/multipart-uploads/{upload_id}/parts",
+    response_model=ListPartsResponse
+)
+
+async def list_parts(
+    bucket_name: str,
+    upload_id: str,
+    part_number_marker: int = Query(default=0, ge=0),
+    max_parts: int = Query(default=1000, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    List uploaded parts of a multipart upload.
+    
+    Requires: s3:ListMultipartUploadParts
+    
+    Args:
+        bucket_name: Target bucket
+        upload_id: Upload identifier
+        part_number_marker: Return parts after this part number
+        max_parts: Maximum results
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Parts ordered by part number
+    
+    Raises:
+        ResourceNotFoundError: If upload not found
+    """
+    parts, is_truncated = s3_service.list_parts(
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        upload_id=upload_id,
+        part_number_marker=part_number_marker,
+        max_parts=max_parts
+    )
+    
+    return ListPartsResponse(
+        upload_id=upload_id,
+        bucket_name=bucket_name,
+        parts=parts,
+        is_truncated=is_truncated,
+        next_part_number_marker=parts[-1].part_number if is_truncated else None
+    )
+
+
+@router.post(
+    "/buckets/{bucket_name}/multipart-uploads/{upload_id}/complete",
+    response_model=ObjectResponse
+)
+
+async def complete_multipart_upload(
+    bucket_name: str,
+    upload_id: str,
+    request: CompleteMultipartUploadRequest,
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Complete a multipart upload by assembling its parts.
+    
+    Requires: s3:PutObject
+    
+    Args:
+        bucket_name: Target bucket
+        upload_id: Upload identifier
+        request: Parts (number and ETag) to assemble, in ascending order
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Created object information
+    
+    Raises:
+        ResourceNotFoundError: If upload not found
+        ValidationError: If the part list is invalid
+    """
+    return await run_in_threadpool(
+        s3_service.complete_multipart_upload,
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        upload_id=upload_id,
+        parts=[(part.part_number, part.etag) for part in request.parts]
+    )
+
+
+@router.delete("/buckets/{bucket_name}/multipart-uploads/{upload_id}")
+
+async def abort_multipart_upload(
+    bucket_name: str,
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account)
+):
+    """
+    Abort a multipart upload and delete its uploaded parts.
+    
+    Requires: s3:AbortMultipartUpload
+    
+    Args:
+        bucket_name: Target bucket
+        upload_id: Upload identifier
+        db: Database session
+        current_account: Authenticated account
+    
+    Returns:
+        Success message
+    
+    Raises:
+        ResourceNotFoundError: If upload not found
+    """
+    s3_service.abort_multipart_upload(
+        db=db,
+        account_id=current_account.account_id,
+        bucket_name=bucket_name,
+        upload_id=upload_id
+    )
+    
+    return {"message": f"Multipart upload '{upload_id}' aborted"}
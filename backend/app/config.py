@@ -43,6 +43,9 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    ACCESS_KEY_ENCRYPTION_KEY: Optional[str] = None  # Fernet key for access key secrets; None = derived from SECRET_KEY
+    ACCESS_KEY_USAGE_FLUSH_INTERVAL: int = 60  # Seconds between batched last_used writes
+    SIGV4_MAX_CLOCK_SKEW: int = 900  # Seconds a signed request's X-Amz-Date may be off
     
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8080"]
@@ -60,13 +63,50 @@ class Settings(BaseSettings):
     DOCKER_NETWORK_PREFIX: str = "cloudsim"
     DOCKER_VOLUME_PREFIX: str = "cloudsim"
     
+    # CloudWatch
+    METRICS_COLLECTION_INTERVAL: int = 60
+    METRICS_COLLECTOR_MAX_WORKERS: int = 8  # Concurrent Docker stats calls per sweep
+    ALARM_EVALUATION_INTERVAL: int = 60
+    
+    # Retention
+    RETENTION_ENFORCEMENT_INTERVAL: int = 3600
+    RETENTION_BATCH_SIZE: int = 5000  # Rows deleted per transaction
+    RETENTION_MAX_BATCHES: int = 200  # Per run; the remainder carries over to the next run
+    METRIC_RAW_RETENTION_DAYS: int = 15
+    
+    # S3
+    S3_MULTIPART_SWEEP_INTERVAL: int = 3600
+    S3_MULTIPART_UPLOAD_EXPIRY_DAYS: int = 7  # Incomplete uploads older than this are aborted
+    S3_LIFECYCLE_INTERVAL: int = 3600
+    S3_LIFECYCLE_BATCH_SIZE: int = 1000  # Objects per transaction
+    S3_LIFECYCLE_MAX_BATCHES: int = 100  # Per run; large buckets continue on the next run
+    S3_STORAGE_METRICS_INTERVAL: int = 3600  # AWS/S3 BucketSizeBytes and NumberOfObjects
+    S3_CONTENT_ADDRESSED_STORAGE: bool = False  # Store object content once per SHA-256, shared across keys and versions
+    
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
-    RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_PER_MINUTE: int = 60  # Tokens per minute per principal and API action (also the burst size)
+    RATE_LIMIT_BACKEND: str = "memory"  # memory (per process), sqlite (workers on one host) or redis
+    RATE_LIMIT_SQLITE_PATH: Optional[str] = None  # None = cloudsim-rate-limits.db in the temp directory
+    RATE_LIMIT_ACTION_COSTS: dict[str, int] = {  # Tokens per call of expensive actions (default 1)
+        "RunInstances": 10,
+        "StartInstances": 5,
+        "CreateDBInstance": 10,
+        "RestoreDBInstanceFromSnapshot": 10,
+        "CreateDBSnapshot": 5,
+        "CreateStack": 10,
+        "CreateFunction": 5,
+        "UpdateFunctionCode": 5,
+        "InvokeFunction": 5,
+        "StartQuery": 5,
+        "FilterLogEvents": 2,
+        "CopyObject": 2,
+        "CompleteMultipartUpload": 2,
+    }
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -145,6 +145,17 @@ class LimitExceededError(CloudSimException):
         )
 
 
+class ThrottlingError(CloudSimException):
+    """Request rate exceeded"""
+    def __init__(self, action: str, retry_after: int):
+        super().__init__(
+            message=f"Rate exceeded for {action}. Retry after {retry_after} second(s)",
+            error_code="ThrottlingException",
+            status_code=429,
+            details={"action": action, "retry_after": retry_after}
+        )
+
+
 class InsufficientCapacityError(CloudSimException):
     """Not enough capacity to fulfill request"""
     def __init__(self, message: str = "Insufficient capacity to fulfill request"):
@@ -211,6 +222,16 @@ class StorageError(CloudSimException):
         )
 
 
+class PreconditionFailedError(CloudSimException):
+    """Conditional request precondition not met"""
+    def __init__(self, message: str = "At least one of the preconditions you specified did not hold"):
+        super().__init__(
+            message=message,
+            error_code="PreconditionFailed",
+            status_code=412
+        )
+
+
 # Internal Errors
 
 class InternalServiceError(CloudSimException):
@@ -0,0 +1,236 @@
+"""
+Token Bucket Rate Limiters
+Per-key token buckets, in process or shared between worker processes
+"""
+
+import asyncio
+import math
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from app.config import settings
+
+
+# Buckets kept in memory before refilled (idle) ones are dropped
+MAX_MEMORY_BUCKETS = 100000
+
+
+class RateLimiter(ABC):
+    """
+    Token bucket per key
+
+    A bucket holds up to ``capacity`` tokens and refills at ``rate`` tokens
+    per second. A request takes ``cost`` tokens; when the bucket holds fewer
+    it is rejected and nothing is taken.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initialize limiter
+
+        Args:
+            capacity: Bucket size (burst)
+            rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.rate = rate
+
+    @abstractmethod
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        """
+        Take ``cost`` tokens from a bucket
+
+        Returns:
+            0 if the request may proceed, otherwise seconds until the bucket
+            holds enough tokens
+        """
+
+    async def close(self):
+        """Release connections held by the limiter."""
+
+    def _refill(self, tokens: float, elapsed: float) -> float:
+        return min(self.capacity, tokens + max(elapsed, 0.0) * self.rate)
+
+    def _take(self, tokens: float, cost: float):
+        """New token count and wait (0 when the tokens were taken)."""
+        if tokens >= cost:
+            return tokens - cost, 0.0
+        return tokens, (cost - tokens) / self.rate
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Buckets in process memory (the default)
+
+    acquire() never awaits between reading and updating a bucket, so on the
+    event loop it is atomic without a lock. Each worker process has its own
+    buckets, so the effective limit scales with the number of workers.
+    """
+
+    def __init__(self, capacity: float, rate: float, max_buckets: int = MAX_MEMORY_BUCKETS):
+        super().__init__(capacity, rate)
+        self.max_buckets = max_buckets
+        # key -> [tokens, monotonic time of last update]
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune(now)
+            bucket = self._buckets[key] = [self.capacity, now]
+
+        tokens, wait = self._take(self._refill(bucket[0], now - bucket[1]), cost)
+        bucket[0] = tokens
+        bucket[1] = now
+        return wait
+
+    def _prune(self, now: float):
+        """Drop buckets that have refilled completely (same as a new bucket)."""
+        full_after = self.capacity / self.rate
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if now - bucket[1] < full_after
+        }
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Buckets in a local SQLite file shared by the worker processes of a host
+
+    For multi-worker deployments without Redis. Each acquire() is one short
+    IMMEDIATE transaction, run in a thread to keep the event loop free.
+    """
+
+    def __init__(self, capacity: float, rate: float, path: str):
+        super().__init__(capacity, rate)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        return await asyncio.to_thread(self._acquire, key, cost)
+
+    def _acquire(self, key: str, cost: float) -> float:
+        with self._lock:
+            connection = self._connection
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens = self._refill(row[0], now - row[1]) if row else self.capacity
+                tokens, wait = self._take(tokens, cost)
+                connection.execute(
+                    "INSERT INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, "
+                    "updated_at = excluded.updated_at",
+                    (key, tokens, now)
+                )
+                # Drop refilled buckets now and then to bound the file
+                if row is None:
+                    connection.execute(
+                        "DELETE FROM rate_limit_buckets WHERE updated_at < ?",
+                        (now - self.capacity / self.rate,)
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def close(self):
+        self._connection.close()
+
+
+# KEYS[1] = bucket; ARGV = capacity, rate, cost. Uses the Redis clock so
+# application hosts need not agree on the time. Returns the wait as a
+# string (Lua numbers are truncated to integers in replies).
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + math.max(0, now - tonumber(state[2])) * rate)
+end
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Buckets in Redis, shared by every worker process and host
+
+    Each acquire() is one atomic Lua script call; buckets expire once they
+    would have refilled.
+    """
+
+    def __init__(self, capacity: float, rate: float, url: str, prefix: str = "cloudsim:ratelimit:"):
+        super().__init__(capacity, rate)
+        import redis.asyncio as redis  # Only needed for this backend
+
+        self.prefix = prefix
+        self._client = redis.from_url(url, max_connections=settings.REDIS_MAX_CONNECTIONS)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        wait = await self._script(keys=[self.prefix + key], args=[self.capacity, self.rate, cost])
+        return float(wait)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Limiter for the configured RATE_LIMIT_BACKEND and RATE_LIMIT_PER_MINUTE."""
+    capacity = float(settings.RATE_LIMIT_PER_MINUTE)
+    rate = capacity / 60.0
+    backend = settings.RATE_LIMIT_BACKEND
+
+    if backend == "memory":
+        return MemoryRateLimiter(capacity, rate)
+    if backend == "sqlite":
+        path = settings.RATE_LIMIT_SQLITE_PATH or os.path.join(
+            tempfile.gettempdir(), "cloudsim-rate-limits.db"
+        )
+        return SQLiteRateLimiter(capacity, rate, path)
+    if backend == "redis":
+        return RedisRateLimiter(capacity, rate, settings.REDIS_URL)
+
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{backend}' (expected memory, sqlite or redis)")
+
+
+def retry_after_seconds(wait: float) -> int:
+    """Retry-After header value for a wait (whole seconds, at least 1)."""
+    return max(1, math.ceil(wait))
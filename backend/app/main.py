@@ -15,6 +15,7 @@ from fastapi.responses import JSONResponse
 from app.config import settings
 from app.core.database import close_db
 from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.api.router import setup_routers
 from app.schemas.common import HealthCheckResponse
 from app.core.exception_handlers import register_exception_handlers
@@ -44,6 +45,11 @@ async def lifespan(app: FastAPI):
     # Start background workers
     from app.workers.metrics_collector import start_metrics_collector
     from app.workers.alarm_evaluator import start_alarm_evaluator
+    from app.workers.retention_worker import start_retention_worker
+    from app.workers.multipart_sweeper import start_multipart_sweeper
+    from app.workers.lifecycle_worker import start_lifecycle_worker
+    from app.workers.storage_metrics_worker import start_storage_metrics_worker
+    from app.workers.access_key_usage_flusher import start_access_key_usage_flusher
     
     start_metrics_collector()
     logger.info("CloudWatch metrics collector started")
@@ -51,6 +57,21 @@ async def lifespan(app: FastAPI):
     start_alarm_evaluator()
     logger.info("CloudWatch alarm evaluator started")
     
+    start_retention_worker()
+    logger.info("CloudWatch retention worker started")
+    
+    start_multipart_sweeper()
+    logger.info("S3 multipart upload sweeper started")
+    
+    start_lifecycle_worker()
+    logger.info("S3 lifecycle worker started")
+    
+    start_storage_metrics_worker()
+    logger.info("S3 storage metrics worker started")
+    
+    start_access_key_usage_flusher()
+    logger.info("IAM access key usage flusher started")
+    
     # TODO: Initialize other services
     # - Database connection pool
     # - Redis connection
@@ -66,13 +87,37 @@ async def lifespan(app: FastAPI):
     # Stop background workers
     from app.workers.metrics_collector import stop_metrics_collector
     from app.workers.alarm_evaluator import stop_alarm_evaluator
+    from app.workers.retention_worker import stop_retention_worker
+    from app.workers.multipart_sweeper import stop_multipart_sweeper
+    from app.workers.lifecycle_worker import stop_lifecycle_worker
+    from app.workers.storage_metrics_worker import stop_storage_metrics_worker
+    from app.workers.access_key_usage_flusher import stop_access_key_usage_flusher
     
-    stop_metrics_collector()
+    await stop_metrics_collector()
     logger.info("CloudWatch metrics collector stopped")
     
-    stop_alarm_evaluator()
+    await stop_alarm_evaluator()
     logger.info("CloudWatch alarm evaluator stopped")
     
+    await stop_retention_worker()
+    logger.info("CloudWatch retention worker stopped")
+    
+    await stop_multipart_sweeper()
+    logger.info("S3 multipart upload sweeper stopped")
+    
+    await stop_lifecycle_worker()
+    logger.info("S3 lifecycle worker stopped")
+    
+    await stop_storage_metrics_worker()
+    logger.info("S3 storage metrics worker stopped")
+    
+    await stop_access_key_usage_flusher()
+    logger.info("IAM access key usage flusher stopped")
+    
+    # Cancel running Logs Insights queries
+    from app.api.v1.cloudwatch_logs import logs_service
+    logs_service.shutdown_queries()
+    
     # Close database connections
     await close_db()
     
@@ -99,6 +144,11 @@ app = FastAPI(
 # MIDDLEWARE CONFIGURATION
 # ============================================
 
+# Rate Limiting - added before CORS so it runs inside it (each middleware
+# wraps the ones added before it) and throttled responses get CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # 1. CORS Middleware - Must be first
 app.add_middleware(
     CORSMiddleware,
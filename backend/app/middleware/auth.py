@@ -1,8 +1,9 @@
 """
 Authentication Middleware
-JWT token validation and user context injection
+JWT token and SigV4 signature validation and user context injection
 """
 
+import hashlib
 import logging
 from typing import Optional
 from fastapi import Request, Depends, HTTPException, status
@@ -10,6 +11,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.services import sigv4
 from app.services.auth_service import AuthService
 from app.schemas.iam_auth import AuthenticatedUser
 from app.core.exceptions import AuthenticationError, InvalidCredentialsError
@@ -24,6 +26,36 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer(auto_error=False)
 
 
+async def _payload_hash(request: Request) -> str:
+    """
+    Hex SHA-256 of the request body, as covered by a SigV4 signature
+    
+    Clients may send x-amz-content-sha256: UNSIGNED-PAYLOAD to leave the
+    body unsigned; multipart form uploads must, since their body is
+    streamed to the endpoint rather than buffered.
+    
+    Raises:
+        AuthenticationError: If the declared hash does not match the body
+    """
+    declared = request.headers.get("x-amz-content-sha256")
+    if declared == sigv4.UNSIGNED_PAYLOAD:
+        return declared
+    
+    try:
+        body = await request.body()
+    except RuntimeError:
+        raise AuthenticationError(
+            message="Sign streamed requests with x-amz-content-sha256: UNSIGNED-PAYLOAD"
+        )
+    
+    actual = hashlib.sha256(body).hexdigest()
+    if declared is not None and declared.lower() != actual:
+        raise AuthenticationError(
+            message="x-amz-content-sha256 does not match the request body"
+        )
+    return actual
+
+
 async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -32,7 +64,8 @@ async def get_current_user(
     """
     Dependency to get current authenticated user
     
-    Validates JWT token and returns user context
+    Validates a JWT bearer token, or an AWS Signature Version 4 signed
+    request made with an access key, and returns user context
     
     Usage:
         @app.get("/instances")
@@ -54,6 +87,29 @@ async def get_current_user(
             auth_method="none"
         )
     
+    authorization = request.headers.get("authorization")
+    if sigv4.is_signed_request(authorization):
+        try:
+            user = await AuthService.authenticate_signed_request(
+                db,
+                authorization,
+                method=request.method,
+                path=request.url.path,
+                query=request.url.query,
+                headers=request.headers,
+                payload_hash=await _payload_hash(request)
+            )
+        except (AuthenticationError, InvalidCredentialsError) as e:
+            logger.warning(f"Signed request authentication failed: {e.message}")
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.message,
+                headers={"WWW-Authenticate": sigv4.ALGORITHM},
+            )
+        
+        request.state.user = user
+        return user
+    
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,158 @@
+"""
+Rate Limiting Middleware
+Token bucket throttling per principal and API action
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.core.exceptions import ThrottlingError
+from app.core.rate_limiter import RateLimiter, create_rate_limiter, retry_after_seconds
+from app.services.auth_service import AuthService
+
+
+logger = logging.getLogger(__name__)
+
+
+# Paths never throttled
+EXEMPT_PATHS = frozenset(["/health", "/docs", "/openapi.json", "/redoc"])
+
+# (method, path) -> API action, most recent first
+ACTION_CACHE_SIZE = 10000
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying RATE_LIMIT_PER_MINUTE per principal and
+    API action
+    
+    The principal is the account of a bearer token (whose signature is
+    checked here), or the client address for anything else. SigV4 signed
+    requests are keyed by client address too: their signature is only
+    verified later, against the key's secret, so an access key ID named in
+    the header cannot be trusted to pick the bucket. The API
+    action is derived from the matched route, e.g. "instances:RunInstances",
+    and costs RATE_LIMIT_ACTION_COSTS tokens (1 unless listed).
+    
+    Throttled requests get a 429 ThrottlingException with Retry-After.
+    If a shared backend fails, requests are let through.
+    """
+    
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or create_rate_limiter()
+        self.costs = {
+            name.lower(): min(float(cost), self.limiter.capacity)
+            for name, cost in settings.RATE_LIMIT_ACTION_COSTS.items()
+        }
+        self._actions: "OrderedDict[Tuple[str, str], Tuple[str, str]]" = OrderedDict()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._closing_on_shutdown(receive), send)
+            return
+        
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        action, operation = self._resolve_action(scope)
+        key = f"{self._principal(scope)}|{action}"
+        cost = self.costs.get(operation.lower(), 1.0)
+        
+        try:
+            wait = await self.limiter.acquire(key, cost)
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, not throttling: {str(e)}")
+            wait = 0.0
+        
+        if wait > 0:
+            await self._throttled(action, wait)(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
+    
+    def _closing_on_shutdown(self, receive: Receive) -> Receive:
+        """Wrap the lifespan receive channel to close the limiter on shutdown."""
+        async def receive_message():
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                await self.limiter.close()
+            return message
+        return receive_message
+    
+    def _principal(self, scope: Scope) -> str:
+        """Bucket owner: verified bearer token account, or client address."""
+        authorization = Headers(scope=scope).get("authorization")
+        
+        if authorization and authorization[:7].lower() == "bearer ":
+            try:
+                return "account:" + AuthService.decode_token(authorization[7:])["account_id"]
+            except Exception:
+                pass
+        
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+    
+    def _resolve_action(self, scope: Scope) -> Tuple[str, str]:
+        """
+        API action of a request as ("<service>:<Operation>", "<Operation>")
+        
+        Resolved from the route the request will be dispatched to, and
+        cached per method and path.
+        """
+        cache_key = (scope["method"], scope["path"])
+        resolved = self._actions.get(cache_key)
+        if resolved is not None:
+            self._actions.move_to_end(cache_key)
+            return resolved
+        
+        resolved = ("unknown:Unknown", "Unknown")
+        app = scope.get("app")
+        for route in getattr(getattr(app, "router", None), "routes", []):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                resolved = _route_action(route)
+                break
+        
+        self._actions[cache_key] = resolved
+        while len(self._actions) > ACTION_CACHE_SIZE:
+            self._actions.popitem(last=False)
+        return resolved
+    
+    @staticmethod
+    def _throttled(action: str, wait: float) -> JSONResponse:
+        """AWS-style ThrottlingException response."""
+        retry_after = retry_after_seconds(wait)
+        exc = ThrottlingError(action=action, retry_after=retry_after)
+        logger.info(f"Throttled {action}, retry after {retry_after}s")
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={
+                "detail": {
+                    "error_code": exc.error_code,
+                    "message": exc.message,
+                    **exc.details
+                }
+            },
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+def _route_action(route) -> Tuple[str, str]:
+    """Service (first path segment under the API prefix) and operation (endpoint name)."""
+    path = getattr(route, "path", "")
+    if path.startswith(settings.API_V1_PREFIX):
+        path = path[len(settings.API_V1_PREFIX):]
+    service = path.strip("/").split("/", 1)[0] or "cloudsim"
+    
+    name = getattr(route, "name", None) or "unknown"
+    operation = "".join(part.capitalize() for part in name.split("_"))
+    return f"{service}:{operation}", operation
@@ -29,6 +29,8 @@ class Bucket(Base):
         region: AWS region (e.g., us-east-1)
         versioning_enabled: Whether object versioning is enabled
         public_access_blocked: Whether public access is blocked (default True)
+        lifecycle_rules: JSON-encoded lifecycle rules
+        lifecycle_checkpoint: JSON-encoded lifecycle executor cursors
         filesystem_path: Absolute path to bucket directory on filesystem
         tags: JSON-encoded tags
         created_at: Bucket creation timestamp
@@ -96,6 +98,12 @@ class Bucket(Base):
         comment="JSON-encoded lifecycle rules"
     )
     
+    lifecycle_checkpoint: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+        comment="JSON-encoded lifecycle executor progress per rule action"
+    )
+    
     # Filesystem backing
     filesystem_path: Mapped[str] = mapped_column(
         String(500),
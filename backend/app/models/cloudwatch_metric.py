@@ -3,7 +3,7 @@ CloudWatch Metric Model
 Stores time-series metric data points
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, Text, Index, Integer
+from sqlalchemy import Column, String, Float, DateTime, Text, Index, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -26,9 +26,12 @@ class CloudWatchMetric(Base):
     namespace: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     metric_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     
-    # Dimensions (JSON encoded: {"InstanceId": "i-abc123", "Region": "us-east-1"})
+    # Dimensions (JSON encoded with sorted keys: {"InstanceId": "i-abc123", "Region": "us-east-1"})
     dimensions: Mapped[str] = mapped_column(Text, nullable=True)
     
+    # Owning series (see MetricSeries)
+    series_id: Mapped[str] = mapped_column(String(64), nullable=True)
+    
     # Timestamp and value
     timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     value: Mapped[float] = mapped_column(Float, nullable=False)
@@ -47,7 +50,110 @@ class CloudWatchMetric(Base):
         Index('ix_cloudwatch_metrics_namespace_name', 'namespace', 'metric_name'),
         Index('ix_cloudwatch_metrics_namespace_name_time', 'namespace', 'metric_name', 'timestamp'),
         Index('ix_cloudwatch_metrics_account_namespace', 'account_id', 'namespace'),
+        Index('ix_cloudwatch_metrics_series_time', 'series_id', 'timestamp'),
     )
     
     def __repr__(self):
         return f"<CloudWatchMetric(id={self.metric_id}, namespace={self.namespace}, metric={self.metric_name}, value={self.value}, time={self.timestamp})>"
+
+
+class MetricSeries(Base):
+    """
+    Metric series index.
+    
+    One row per distinct (account, namespace, metric name, dimensions).
+    The primary key is a stable sha256 of those fields, shared by raw
+    datapoints and rollups, so ListMetrics scans this table instead of
+    running DISTINCT over every datapoint.
+    """
+    
+    __tablename__ = "metric_series"
+    
+    # Primary key (sha256 of account, namespace, metric name and sorted dimensions)
+    series_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    
+    # Series identification
+    account_id: Mapped[str] = mapped_column(String(12), nullable=False)
+    namespace: Mapped[str] = mapped_column(String(255), nullable=False)
+    metric_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    dimensions: Mapped[str] = mapped_column(Text, nullable=True)  # JSON, sorted keys
+    
+    # Metadata
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('ix_metric_series_account_namespace_name', 'account_id', 'namespace', 'metric_name'),
+    )
+    
+    def __repr__(self):
+        return f"<MetricSeries(id={self.series_id}, namespace={self.namespace}, metric={self.metric_name})>"
+
+
+class MetricSeriesDimension(Base):
+    """
+    Inverted index from a dimension (name, value) pair to the series carrying it.
+    
+    Used for partial-dimension ListMetrics filters.
+    """
+    
+    __tablename__ = "metric_series_dimensions"
+    
+    series_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("metric_series.series_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    value: Mapped[str] = mapped_column(String(1024), nullable=False)
+    
+    # Denormalized for account-scoped index lookups
+    account_id: Mapped[str] = mapped_column(String(12), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_metric_series_dimensions_lookup', 'account_id', 'name', 'value'),
+    )
+    
+    def __repr__(self):
+        return f"<MetricSeriesDimension(series={self.series_id}, {self.name}={self.value})>"
+
+
+class CloudWatchMetricRollup(Base):
+    """
+    Pre-aggregated metric rollup.
+    
+    One row holds sum/count/min/max for a single series over a fixed
+    resolution bucket (60s, 300s or 3600s). Rollups are maintained at
+    write time so statistics queries never have to scan raw datapoints.
+    """
+    
+    __tablename__ = "cloudwatch_metric_rollups"
+    
+    # Series identification (MetricSeries.series_id)
+    account_id: Mapped[str] = mapped_column(String(12), primary_key=True)
+    series_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    
+    # Bucket resolution in seconds and aligned bucket start
+    resolution: Mapped[int] = mapped_column(Integer, primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    
+    # Denormalized series fields for filtering without a join
+    namespace: Mapped[str] = mapped_column(String(255), nullable=False)
+    metric_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    dimensions: Mapped[str] = mapped_column(Text, nullable=True)
+    unit: Mapped[str] = mapped_column(String(50), nullable=False)
+    
+    # Aggregates
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    minimum: Mapped[float] = mapped_column(Float, nullable=False)
+    maximum: Mapped[float] = mapped_column(Float, nullable=False)
+    
+    __table_args__ = (
+        Index(
+            'ix_cloudwatch_metric_rollups_lookup',
+            'account_id', 'namespace', 'metric_name', 'resolution', 'period_start'
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<CloudWatchMetricRollup(series={self.series_key}, resolution={self.resolution}, start={self.period_start}, count={self.sample_count})>"
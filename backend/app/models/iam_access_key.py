@@ -6,7 +6,7 @@ Programmatic access credentials (AWS CLI, SDK, API)
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, Boolean, ForeignKey
+from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -23,6 +23,10 @@ class AccessKey(Base, TimestampMixin):
     - Access Key ID (public identifier)
     - Secret Access Key (private secret)
     
+    The secret is stored encrypted, since verifying SigV4 signed requests
+    needs the secret itself. Keys created before that only have a bcrypt
+    hash until their first successful authentication.
+    
     Users can have up to 2 active access keys (for rotation).
     """
     
@@ -44,11 +48,17 @@ class AccessKey(Base, TimestampMixin):
         comment="User this access key belongs to"
     )
     
-    # Secret access key (hashed)
-    secret_access_key_hash: Mapped[str] = mapped_column(
+    # Secret access key (encrypted; never store plaintext)
+    secret_access_key_encrypted: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Fernet-encrypted secret access key"
+    )
+    
+    secret_access_key_hash: Mapped[Optional[str]] = mapped_column(
         String(255),
-        nullable=False,
-        comment="Bcrypt hash of secret access key (never store plaintext)"
+        nullable=True,
+        comment="Bcrypt hash of secret access key (legacy keys only)"
     )
     
     # Status
@@ -100,3 +100,33 @@ class LogEvent(Base):
     
     def __repr__(self):
         return f"<LogEvent(stream={self.stream_id}, time={self.timestamp})>"
+
+
+class LogEventTerm(Base):
+    """
+    Inverted index entry: one row per distinct token of a log event.
+    
+    Keyed by (log group, term, timestamp, event) so a term lookup over a
+    time range is a single index range scan across every stream of a group.
+    """
+    
+    __tablename__ = "log_event_terms"
+    
+    log_group_name: Mapped[str] = mapped_column(String(512), primary_key=True)
+    term: Mapped[str] = mapped_column(String(255), primary_key=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    event_id: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("log_events.event_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    # Stream of the event (for stream-restricted searches)
+    stream_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_log_event_terms_event_id', 'event_id'),
+    )
+    
+    def __repr__(self):
+        return f"<LogEventTerm(group={self.log_group_name}, term={self.term}, event={self.event_id})>"
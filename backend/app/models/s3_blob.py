@@ -0,0 +1,70 @@
+"""
+S3 Blob Model
+
+Content-addressed object content. When content-addressed storage is
+enabled, each distinct object body is stored once under its SHA-256 and
+shared by every object row (and version) with that content.
+"""
+
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class S3Blob(Base):
+    """
+    S3 Blob Model
+
+    Attributes:
+        sha256: SHA-256 hex digest of the content
+        size_bytes: Content size in bytes
+        md5: MD5 hex digest of the content (single-part ETag)
+        ref_count: Number of object rows pointing at this blob
+        filesystem_path: Absolute path to the blob file
+        created_at: First upload timestamp
+    """
+
+    __tablename__ = "s3_blobs"
+
+    # Primary key
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="SHA-256 hex digest of the content"
+    )
+
+    size_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Content size in bytes"
+    )
+
+    md5: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        comment="MD5 hex digest of the content"
+    )
+
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        comment="Object rows referencing this blob"
+    )
+
+    filesystem_path: Mapped[str] = mapped_column(
+        String(1500),
+        nullable=False,
+        comment="Absolute path to blob file"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="First upload timestamp"
+    )
+
+    def __repr__(self) -> str:
+        return f"<S3Blob(sha256={self.sha256}, refs={self.ref_count})>"
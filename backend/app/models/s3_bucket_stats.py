@@ -0,0 +1,86 @@
+"""
+S3 Bucket Stats Model
+
+Object count and byte totals of a bucket, kept per top-level key prefix
+and storage class. Maintained in the same transaction as the object rows,
+so reading bucket sizes never scans objects or the filesystem.
+"""
+
+from datetime import datetime
+from sqlalchemy import String, DateTime, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class S3BucketStats(Base):
+    """
+    S3 Bucket Stats Model
+
+    Counts every stored version except delete markers, which is what the
+    bucket is billed for (and what S3 reports as NumberOfObjects).
+
+    Attributes:
+        account_id: Owner account ID
+        bucket_name: Bucket name
+        prefix: Top-level key prefix up to and including the first "/"
+            ("" for keys without one)
+        storage_class: Storage class (STANDARD, GLACIER, etc.)
+        object_count: Stored objects
+        size_bytes: Total size of the stored objects
+        updated_at: Last change timestamp
+    """
+
+    __tablename__ = "s3_bucket_stats"
+
+    # Primary key
+    account_id: Mapped[str] = mapped_column(
+        String(12),
+        primary_key=True,
+        comment="Owner account ID"
+    )
+
+    bucket_name: Mapped[str] = mapped_column(
+        String(63),
+        primary_key=True,
+        comment="Bucket name"
+    )
+
+    prefix: Mapped[str] = mapped_column(
+        String(1024),
+        primary_key=True,
+        comment="Top-level key prefix ('' for keys without a '/')"
+    )
+
+    storage_class: Mapped[str] = mapped_column(
+        String(32),
+        primary_key=True,
+        comment="Storage class (STANDARD, GLACIER, etc.)"
+    )
+
+    # Counters
+    object_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Stored objects (all versions, excluding delete markers)"
+    )
+
+    size_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Total size of the stored objects"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="Last change timestamp"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<S3BucketStats(bucket={self.bucket_name}, prefix={self.prefix}, "
+            f"class={self.storage_class}, objects={self.object_count})>"
+        )
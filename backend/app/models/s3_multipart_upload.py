@@ -0,0 +1,160 @@
+"""
+S3 Multipart Upload Models
+
+In-progress multipart uploads and their uploaded parts. Part content is
+stored in the bucket's staging directory until the upload is completed
+(concatenated into an object) or aborted.
+"""
+
+from datetime import datetime
+from sqlalchemy import String, DateTime, Text, Integer, BigInteger, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.models.base import Base
+
+
+class MultipartUpload(Base):
+    """
+    S3 Multipart Upload Model
+
+    Attributes:
+        upload_id: Upload identifier returned by CreateMultipartUpload
+        bucket_name: Target bucket
+        account_id: Owner account ID
+        object_key: Key the completed object is stored under
+        content_type: MIME type for the completed object (None = detect)
+        object_metadata: Custom metadata for the completed object
+        tags: Tags for the completed object
+        initiated_at: Upload creation timestamp
+
+    Relationships:
+        parts: Uploaded parts
+    """
+
+    __tablename__ = "s3_multipart_uploads"
+
+    # Primary key
+    upload_id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="Upload identifier"
+    )
+
+    bucket_name: Mapped[str] = mapped_column(
+        String(63),
+        nullable=False,
+        index=True,
+        comment="Target bucket"
+    )
+
+    account_id: Mapped[str] = mapped_column(
+        String(12),
+        nullable=False,
+        index=True,
+        comment="Owner account ID"
+    )
+
+    object_key: Mapped[str] = mapped_column(
+        String(1024),
+        nullable=False,
+        comment="Target object key"
+    )
+
+    content_type: Mapped[str] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="MIME type for the completed object"
+    )
+
+    object_metadata: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Custom metadata for the completed object"
+    )
+
+    tags: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Tags for the completed object"
+    )
+
+    initiated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        index=True,
+        comment="Upload creation timestamp"
+    )
+
+    # Relationships
+    parts: Mapped[list["MultipartUploadPart"]] = relationship(
+        "MultipartUploadPart",
+        back_populates="upload",
+        cascade="all, delete-orphan",
+        order_by="MultipartUploadPart.part_number"
+    )
+
+    def __repr__(self) -> str:
+        return f"<MultipartUpload(id={self.upload_id}, bucket={self.bucket_name}, key={self.object_key})>"
+
+
+class MultipartUploadPart(Base):
+    """
+    S3 Multipart Upload Part Model
+
+    Attributes:
+        upload_id: Parent upload
+        part_number: Part number (1-10000)
+        size_bytes: Part size in bytes
+        etag: MD5 hex digest of the part content
+        filesystem_path: Absolute path to the part file
+        last_modified: Upload timestamp (re-uploads replace the part)
+    """
+
+    __tablename__ = "s3_multipart_parts"
+
+    upload_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("s3_multipart_uploads.upload_id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Parent upload"
+    )
+
+    part_number: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        comment="Part number (1-10000)"
+    )
+
+    size_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Part size in bytes"
+    )
+
+    etag: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="MD5 hex digest of the part"
+    )
+
+    filesystem_path: Mapped[str] = mapped_column(
+        String(1500),
+        nullable=False,
+        comment="Absolute path to part file"
+    )
+
+    last_modified: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="Upload timestamp"
+    )
+
+    # Relationships
+    upload: Mapped["MultipartUpload"] = relationship(
+        "MultipartUpload",
+        back_populates="parts"
+    )
+
+    def __repr__(self) -> str:
+        return f"<MultipartUploadPart(upload={self.upload_id}, part={self.part_number})>"
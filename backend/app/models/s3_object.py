@@ -7,7 +7,7 @@ Stores metadata in database, actual content in filesystem.
 
 from datetime import datetime
 from typing import TYPE_CHECKING
-from sqlalchemy import String, DateTime, Integer, Text, BigInteger, Boolean
+from sqlalchemy import String, DateTime, Integer, Text, BigInteger, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 
@@ -32,8 +32,10 @@ class S3Object(Base):
         content_type: MIME type (e.g., application/json, image/png)
         etag: Entity tag for version/integrity checking
         filesystem_path: Absolute path to object file on filesystem
+        blob_sha256: Content-addressed blob backing the object, if any
         storage_class: Storage class (STANDARD, GLACIER, etc.)
         version_id: Version identifier (if versioning enabled)
+        noncurrent_since: When this version stopped being the latest
         metadata: JSON-encoded custom metadata
         tags: JSON-encoded tags
         created_at: Object upload timestamp
@@ -47,6 +49,9 @@ class S3Object(Base):
         - bucket_name (for listing bucket objects)
         - account_id (for listing user's objects)
         - object_key (for lookups within bucket)
+        - (account_id, bucket_name, is_latest, object_key) (keyset listing)
+        - (account_id, bucket_name, is_latest, created_at) (lifecycle age scans)
+        - (account_id, bucket_name, noncurrent_since) (noncurrent version expiration)
     
     Example:
         obj = S3Object(
@@ -62,6 +67,12 @@ class S3Object(Base):
     
     __tablename__ = "s3_objects"
     
+    __table_args__ = (
+        Index("ix_s3_objects_listing", "account_id", "bucket_name", "is_latest", "object_key"),
+        Index("ix_s3_objects_lifecycle", "account_id", "bucket_name", "is_latest", "created_at"),
+        Index("ix_s3_objects_noncurrent", "account_id", "bucket_name", "noncurrent_since"),
+    )
+    
     # Primary key
     object_id: Mapped[str] = mapped_column(
         String(22),
@@ -86,7 +97,8 @@ class S3Object(Base):
     
     # Object identification
     object_key: Mapped[str] = mapped_column(
-        String(1024),
+        # "C" collation on PostgreSQL: keys sort in code point order, as in S3
+        String(1024).with_variant(String(1024, collation="C"), "postgresql"),
         nullable=False,
         index=True,
         comment="Object key/path (e.g., folder/file.txt)"
@@ -119,6 +131,13 @@ class S3Object(Base):
         comment="Absolute path to object file"
     )
     
+    blob_sha256: Mapped[str] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="Content-addressed blob (None = file owned by this row)"
+    )
+    
     # Storage configuration
     storage_class: Mapped[str] = mapped_column(
         String(32),
@@ -148,6 +167,12 @@ class S3Object(Base):
         comment="Whether this is a delete marker (versioned delete)"
     )
     
+    noncurrent_since: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="When a newer version replaced this one (None while latest)"
+    )
+    
     # Metadata
     object_metadata: Mapped[str] = mapped_column(
         Text,
@@ -58,12 +58,14 @@ class PutMetricDataResponse(BaseModel):
     """Response for PutMetricData."""
     message: str = Field(..., description="Success message")
     metrics_stored: int = Field(..., description="Number of metrics stored")
+    series_updated: int = Field(0, description="Number of distinct metric series written")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "message": "Metrics stored successfully",
-                "metrics_stored": 1
+                "metrics_stored": 1,
+                "series_updated": 1
             }
         }
 
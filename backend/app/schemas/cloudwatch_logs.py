@@ -161,3 +161,77 @@ class GetLogEventsResponse(BaseModel):
     events: List[LogEventOutput]
     next_forward_token: Optional[str] = None
     next_backward_token: Optional[str] = None
+
+
+class FilterLogEventsRequest(BaseModel):
+    """Request to search log events across a log group."""
+    log_group_name: str
+    log_stream_names: Optional[List[str]] = Field(None, max_length=100)
+    log_stream_name_prefix: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    filter_pattern: Optional[str] = Field(None, max_length=1024, description="CloudWatch filter pattern (terms, \"phrases\", ?optional, -excluded, or { JSON predicate })")
+    limit: int = Field(10000, ge=1, le=10000)
+    next_token: Optional[str] = None
+
+
+class FilteredLogEvent(BaseModel):
+    """Log event matched by a filter."""
+    log_stream_name: str
+    timestamp: datetime
+    message: str
+    ingestion_time: datetime
+    event_id: str
+
+
+class FilterLogEventsResponse(BaseModel):
+    """Response from searching log events."""
+    events: List[FilteredLogEvent]
+    next_token: Optional[str] = None
+
+
+# ==================== Logs Insights ====================
+
+class StartQueryRequest(BaseModel):
+    """Request to start a Logs Insights query."""
+    log_group_names: List[str] = Field(..., min_length=1, max_length=50)
+    start_time: datetime
+    end_time: datetime
+    query_string: str = Field(..., min_length=1, max_length=10000)
+    limit: int = Field(1000, ge=1, le=10000)
+
+
+class StartQueryResponse(BaseModel):
+    """Response from starting a query."""
+    query_id: str
+
+
+class QueryIdRequest(BaseModel):
+    """Request naming a query."""
+    query_id: str
+
+
+class ResultField(BaseModel):
+    """One field of a query result row."""
+    field: str
+    value: str
+
+
+class QueryStatistics(BaseModel):
+    """Query progress statistics."""
+    records_matched: int
+    records_scanned: int
+    bytes_scanned: int
+
+
+class GetQueryResultsResponse(BaseModel):
+    """Response with query status and results."""
+    status: str = Field(..., description="Scheduled, Running, Complete, Failed or Cancelled")
+    results: List[List[ResultField]]
+    statistics: QueryStatistics
+    error: Optional[str] = None
+
+
+class StopQueryResponse(BaseModel):
+    """Response from stopping a query."""
+    success: bool
@@ -193,3 +193,49 @@ class DetachPolicyRequest(BaseModel):
     """Request to detach policy"""
     
     policy_arn: str
+
+
+class SimulatePrincipalPolicyRequest(BaseModel):
+    """Request to simulate a user's policies over actions × resources"""
+    
+    username: str = Field(..., min_length=1, max_length=64)
+    actions: List[str] = Field(..., min_length=1, max_length=1000)
+    resources: List[str] = Field(default=["*"], min_length=1, max_length=1000)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "username": "alice",
+                "actions": ["ec2:StartInstances", "s3:GetObject"],
+                "resources": ["*", "arn:aws:s3:::my-bucket/report.csv"]
+            }
+        }
+    )
+
+
+class SimulatedStatement(BaseModel):
+    """A statement that decides at least one simulated cell"""
+    
+    effect: str
+    sid: Optional[str] = None
+    action: List[str]
+    resource: List[str]
+
+
+class SimulatePrincipalPolicyResponse(BaseModel):
+    """
+    Simulation result matrix
+    
+    matrix[i][j] is the index in statements of the statement deciding
+    actions[i] on resources[j] (its effect is the decision), or -1 for an
+    implicit deny.
+    """
+    
+    username: str
+    actions: List[str]
+    resources: List[str]
+    statements: List[SimulatedStatement]
+    matrix: List[List[int]]
+    allowed: int
+    denied: int
+    implicitly_denied: int
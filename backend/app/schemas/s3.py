@@ -62,6 +62,32 @@ class ListBucketsResponse(BaseModel):
     total: int
 
 
+class StorageClassMetrics(BaseModel):
+    """Stored objects of one storage class."""
+    
+    storage_class: str
+    object_count: int
+    size_bytes: int
+
+
+class PrefixMetrics(BaseModel):
+    """Stored objects under one top-level prefix ("" for keys without a '/')."""
+    
+    prefix: str
+    object_count: int
+    size_bytes: int
+
+
+class BucketMetricsResponse(BaseModel):
+    """Bucket storage inventory (every stored version, excluding delete markers)."""
+    
+    bucket_name: str
+    object_count: int
+    size_bytes: int
+    storage_classes: list[StorageClassMetrics]
+    prefixes: list[PrefixMetrics]
+
+
 class DeleteBucketRequest(BaseModel):
     """Request to delete a bucket."""
     
@@ -117,6 +143,48 @@ class ObjectResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class CopyObjectRequest(BaseModel):
+    """Request to copy an object server-side."""
+    
+    object_key: str = Field(
+        ...,
+        min_length=1,
+        max_length=1024,
+        description="Target object key/path"
+    )
+    source_bucket: str = Field(
+        ...,
+        description="Bucket to copy from"
+    )
+    source_key: str = Field(
+        ...,
+        min_length=1,
+        max_length=1024,
+        description="Object key to copy from"
+    )
+    source_version_id: Optional[str] = Field(
+        default=None,
+        description="Source version (latest if not provided)"
+    )
+    metadata_directive: str = Field(
+        default="COPY",
+        pattern="^(COPY|REPLACE)$",
+        description="COPY keeps the source's content type, metadata and tags; REPLACE uses the ones given"
+    )
+    content_type: Optional[str] = Field(
+        default=None,
+        description="MIME type for REPLACE (auto-detected if not provided)"
+    )
+    metadata: Optional[dict] = Field(
+        default=None,
+        description="Custom metadata for REPLACE"
+    )
+    tags: Optional[dict] = Field(
+        default=None,
+        description="Object tags for REPLACE"
+    )
+
+
 class ListObjectsRequest(BaseModel):
     """Request to list objects in a bucket."""
     
@@ -124,16 +192,23 @@ class ListObjectsRequest(BaseModel):
         default=None,
         description="Filter by key prefix (e.g., 'folder/')"
     )
+    delimiter: Optional[str] = Field(
+        default=None,
+        description="Roll keys up into common prefixes at this delimiter (e.g., '/')"
+    )
     limit: int = Field(
         default=1000,
         ge=1,
         le=1000,
-        description="Maximum results"
+        description="Maximum objects plus common prefixes"
     )
-    offset: int = Field(
-        default=0,
-        ge=0,
-        description="Pagination offset"
+    continuation_token: Optional[str] = Field(
+        default=None,
+        description="Token from the previous page"
+    )
+    start_after: Optional[str] = Field(
+        default=None,
+        description="Start listing after this key"
     )
 
 
@@ -141,8 +216,14 @@ class ListObjectsResponse(BaseModel):
     """Response for list objects operation."""
     
     objects: list[ObjectResponse]
-    total: int
+    common_prefixes: list[str] = []
     bucket_name: str
+    prefix: Optional[str] = None
+    delimiter: Optional[str] = None
+    key_count: int
+    is_truncated: bool
+    next_continuation_token: Optional[str] = None
+    total: Optional[int] = None  # Only when requested with fetch_count
 
 
 class GetObjectResponse(BaseModel):
@@ -168,3 +249,79 @@ class DeleteObjectsResponse(BaseModel):
     
     deleted: list[str]
     errors: list[dict] = []
+
+
+# Multipart Upload Schemas
+
+class MultipartUploadResponse(BaseModel):
+    """In-progress multipart upload."""
+    
+    upload_id: str
+    bucket_name: str
+    object_key: str
+    initiated_at: datetime
+    
+    model_config = {"from_attributes": True}
+
+
+class UploadPartResponse(BaseModel):
+    """Uploaded part information."""
+    
+    part_number: int
+    etag: str
+    size_bytes: int
+    last_modified: datetime
+    
+    model_config = {"from_attributes": True}
+
+
+class UploadPartCopyRequest(BaseModel):
+    """Request to upload a part by copying an existing object."""
+    
+    source_bucket: str = Field(
+        ...,
+        description="Bucket to copy from"
+    )
+    source_key: str = Field(
+        ...,
+        min_length=1,
+        max_length=1024,
+        description="Object key to copy from"
+    )
+    source_version_id: Optional[str] = Field(
+        default=None,
+        description="Source version (latest if not provided)"
+    )
+    source_range: Optional[str] = Field(
+        default=None,
+        pattern=r"^bytes=\d+-\d+$",
+        description="Byte range to copy, as bytes=first-last (whole object if not provided)"
+    )
+
+
+class ListPartsResponse(BaseModel):
+    """Response for list parts operation."""
+    
+    upload_id: str
+    bucket_name: str
+    parts: list[UploadPartResponse]
+    is_truncated: bool
+    next_part_number_marker: Optional[int] = None
+
+
+class CompletedPart(BaseModel):
+    """Part to include in the completed object."""
+    
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str
+
+
+class CompleteMultipartUploadRequest(BaseModel):
+    """Request to complete a multipart upload."""
+    
+    parts: list[CompletedPart] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="Parts in ascending part number order"
+    )
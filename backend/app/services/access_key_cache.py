@@ -0,0 +1,81 @@
+"""
+Access Key Credential Cache
+Decrypted access key secrets and their owners, kept in memory so signed
+requests are verified without a database round trip
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from app.services.sigv4 import signing_key_cache
+
+
+# Seconds a loaded credential is trusted. Key status, key deletion and user
+# changes made through this process invalidate immediately; this bounds
+# staleness for changes made by other processes.
+ACCESS_KEY_CACHE_TTL = 60.0
+
+
+@dataclass(frozen=True)
+class AccessKeyCredentials:
+    """An active access key of an enabled user"""
+
+    access_key_id: str
+    secret_access_key: str = field(repr=False)
+    user_id: str
+    username: str
+    account_id: str
+
+
+class AccessKeyCache:
+    """
+    Active access key credentials by access key ID
+
+    Only keys that authenticated successfully are stored, so requests with
+    unknown or invalid keys cannot grow the cache.
+    """
+
+    def __init__(self, ttl: float = ACCESS_KEY_CACHE_TTL):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds an entry is used before it is reloaded
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, AccessKeyCredentials]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, access_key_id: str) -> Optional[AccessKeyCredentials]:
+        """Credentials of an access key, or None on a miss"""
+        entry = self._entries.get(access_key_id)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def put(self, credentials: AccessKeyCredentials):
+        with self._lock:
+            self._entries[credentials.access_key_id] = (time.monotonic(), credentials)
+
+    def invalidate(self, access_key_id: str):
+        """Drop a key after its status changed or it was deleted"""
+        with self._lock:
+            self._entries.pop(access_key_id, None)
+        signing_key_cache.invalidate([access_key_id])
+
+    def invalidate_user(self, user_id: str):
+        """Drop every key of a user after the user was changed or deleted"""
+        with self._lock:
+            access_key_ids = [
+                access_key_id for access_key_id, (_, credentials) in self._entries.items()
+                if credentials.user_id == user_id
+            ]
+            for access_key_id in access_key_ids:
+                del self._entries[access_key_id]
+        signing_key_cache.invalidate(access_key_ids)
+
+
+# Shared by every request in the process
+access_key_cache = AccessKeyCache()
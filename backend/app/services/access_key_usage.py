@@ -0,0 +1,135 @@
+"""
+Access Key Usage Tracking
+Coalesces access key last-used updates in memory; the usage flusher worker
+writes them in one batch per interval instead of one write per request
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.iam_access_key import AccessKey
+from app.models.iam_user import User
+
+
+@dataclass
+class AccessKeyUse:
+    """Most recent use of an access key"""
+
+    user_id: str
+    used_at: datetime
+    service: Optional[str] = None
+    region: Optional[str] = None
+
+
+class AccessKeyUsageTracker:
+    """
+    Latest use of each access key since the last flush
+
+    Recording only overwrites an in-memory entry, so the cost per request is
+    constant however busy a key is. Usage recorded in the last interval
+    before a crash is lost, which only makes last_used slightly older.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, AccessKeyUse] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        access_key_id: str,
+        user_id: str,
+        service: Optional[str] = None,
+        region: Optional[str] = None
+    ):
+        """Record a use of an access key (and activity of its user)"""
+        use = AccessKeyUse(user_id, datetime.utcnow(), service, region)
+        with self._lock:
+            self._pending[access_key_id] = use
+
+    def pending(self) -> int:
+        """Access keys with unflushed usage"""
+        return len(self._pending)
+
+    async def flush(self, db: AsyncSession) -> int:
+        """
+        Write the pending usage and commit
+
+        On failure the usage is put back (unless a newer use was recorded
+        meanwhile) so the next flush retries it.
+
+        Returns:
+            Number of access keys updated
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        try:
+            await self._write(db, pending)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            with self._lock:
+                for access_key_id, use in pending.items():
+                    self._pending.setdefault(access_key_id, use)
+            raise
+
+        return len(pending)
+
+    @staticmethod
+    async def _write(db: AsyncSession, pending: Dict[str, AccessKeyUse]):
+        # Keys or users deleted since they were used simply match no row
+        keys = AccessKey.__table__
+        users = User.__table__
+
+        # Service and region are only known for signed requests; keys used
+        # without them keep their previous values
+        signed_rows = [
+            {"key_id": access_key_id, "used_at": use.used_at, "service": use.service, "region": use.region}
+            for access_key_id, use in pending.items() if use.service is not None
+        ]
+        other_rows = [
+            {"key_id": access_key_id, "used_at": use.used_at}
+            for access_key_id, use in pending.items() if use.service is None
+        ]
+
+        user_activity: Dict[str, datetime] = {}
+        for use in pending.values():
+            if use.used_at > user_activity.get(use.user_id, use.used_at.min):
+                user_activity[use.user_id] = use.used_at
+
+        if signed_rows:
+            await db.execute(
+                update(keys)
+                .where(keys.c.access_key_id == bindparam("key_id"))
+                .values(
+                    last_used=bindparam("used_at"),
+                    last_used_service=bindparam("service"),
+                    last_used_region=bindparam("region")
+                ),
+                signed_rows
+            )
+        if other_rows:
+            await db.execute(
+                update(keys)
+                .where(keys.c.access_key_id == bindparam("key_id"))
+                .values(last_used=bindparam("used_at")),
+                other_rows
+            )
+        await db.execute(
+            update(users)
+            .where(users.c.user_id == bindparam("uid"))
+            .values(last_activity=bindparam("used_at")),
+            [{"uid": user_id, "used_at": used_at} for user_id, used_at in user_activity.items()]
+        )
+
+
+# Shared by every request in the process
+access_key_usage = AccessKeyUsageTracker()
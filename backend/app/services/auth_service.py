@@ -3,9 +3,13 @@ Authentication Service
 Handles password verification, JWT tokens, and access key authentication
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import base64
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Mapping
 
+from cryptography.fernet import Fernet, InvalidToken
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy import select
@@ -20,11 +24,30 @@ from app.core.exceptions import (
 from app.models.iam_user import User
 from app.models.iam_access_key import AccessKey
 from app.schemas.iam_auth import AuthenticatedUser, TokenInfo
+from app.services import sigv4
+from app.services.access_key_cache import AccessKeyCredentials, access_key_cache
+from app.services.access_key_usage import access_key_usage
 
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Access key secrets are encrypted at rest: SigV4 verification needs the
+# secret itself, which a hash cannot give back
+_secret_cipher: Optional[Fernet] = None
+
+
+def _get_secret_cipher() -> Fernet:
+    """Fernet cipher keyed by ACCESS_KEY_ENCRYPTION_KEY (derived from SECRET_KEY if unset)"""
+    global _secret_cipher
+    if _secret_cipher is None:
+        key = settings.ACCESS_KEY_ENCRYPTION_KEY
+        if not key:
+            digest = hashlib.sha256(f"access-keys:{settings.SECRET_KEY}".encode("utf-8")).digest()
+            key = base64.urlsafe_b64encode(digest).decode("ascii")
+        _secret_cipher = Fernet(key)
+    return _secret_cipher
+
 
 class AuthService:
     """
@@ -34,7 +57,7 @@ class AuthService:
     - Password verification (bcrypt)
     - JWT token creation (access + refresh)
     - JWT token verification
-    - Access key authentication
+    - Access key authentication (secret exchange and SigV4 signed requests)
     - Token refresh logic
     """
     
@@ -69,6 +92,40 @@ class AuthService:
         """
         return pwd_context.verify(plain_password, hashed_password)
     
+    @staticmethod
+    def encrypt_secret(secret: str) -> str:
+        """
+        Encrypt an access key secret for storage
+        
+        Args:
+            secret: Plain text secret access key
+            
+        Returns:
+            Fernet token
+        """
+        return _get_secret_cipher().encrypt(secret.encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def decrypt_secret(encrypted_secret: str) -> str:
+        """
+        Decrypt a stored access key secret
+        
+        Args:
+            encrypted_secret: Fernet token from encrypt_secret
+            
+        Returns:
+            Plain text secret access key
+            
+        Raises:
+            InvalidCredentialsError: If the secret was encrypted with another key
+        """
+        try:
+            return _get_secret_cipher().decrypt(encrypted_secret.encode("ascii")).decode("utf-8")
+        except InvalidToken:
+            raise InvalidCredentialsError(
+                message="Access key secret cannot be decrypted (encryption key changed?)"
+            )
+    
     @staticmethod
     def create_access_token(
         user_id: str,
@@ -273,6 +330,10 @@ class AuthService:
         """
         Authenticate user with access key credentials
         
+        Keys created before secrets were stored encrypted are verified
+        against their bcrypt hash once and then upgraded to an encrypted
+        secret, after which they can also sign requests.
+        
         Args:
             db: Database session
             access_key_id: Access Key ID (AKIA...)
@@ -294,8 +355,7 @@ class AuthService:
         if not access_key:
             raise ResourceNotFoundError(
                 resource_type="AccessKey",
-                resource_id=access_key_id,
-                message=f"Access key '{access_key_id}' not found"
+                resource_id=access_key_id
             )
         
         # Check if access key is active
@@ -305,7 +365,19 @@ class AuthService:
             )
         
         # Verify secret access key
-        if not AuthService.verify_password(secret_access_key, access_key.secret_access_key_hash):
+        if access_key.secret_access_key_encrypted:
+            stored_secret = AuthService.decrypt_secret(access_key.secret_access_key_encrypted)
+            valid = hmac.compare_digest(
+                stored_secret.encode("utf-8"),
+                secret_access_key.encode("utf-8")
+            )
+            upgrade = False
+        else:
+            valid = bool(access_key.secret_access_key_hash) and \
+                AuthService.verify_password(secret_access_key, access_key.secret_access_key_hash)
+            upgrade = valid
+        
+        if not valid:
             raise InvalidCredentialsError(
                 message="Invalid access key credentials"
             )
@@ -319,8 +391,7 @@ class AuthService:
         if not user:
             raise ResourceNotFoundError(
                 resource_type="User",
-                resource_id=access_key.user_id,
-                message="User associated with access key not found"
+                resource_id=access_key.user_id
             )
         
         # Check if user is enabled
@@ -329,13 +400,137 @@ class AuthService:
                 message="User account is disabled"
             )
         
-        # Update last used
-        access_key.last_used = datetime.utcnow()
-        user.last_activity = datetime.utcnow()
-        await db.commit()
+        # Replace the legacy hash with the encrypted secret
+        if upgrade:
+            access_key.secret_access_key_encrypted = AuthService.encrypt_secret(secret_access_key)
+            access_key.secret_access_key_hash = None
+            await db.commit()
+        
+        # Last used is written by the access key usage flusher
+        access_key_usage.record(access_key.access_key_id, user.user_id)
         
         return user, access_key
     
+    @staticmethod
+    async def get_access_key_credentials(
+        db: AsyncSession,
+        access_key_id: str
+    ) -> AccessKeyCredentials:
+        """
+        Get the credentials of an active access key, from the cache if possible
+        
+        Args:
+            db: Database session
+            access_key_id: Access Key ID (AKIA...)
+            
+        Returns:
+            AccessKeyCredentials with the decrypted secret
+            
+        Raises:
+            InvalidCredentialsError: If the key is unknown, inactive, belongs to
+                a disabled user or has no encrypted secret yet
+        """
+        credentials = access_key_cache.get(access_key_id)
+        if credentials is not None:
+            return credentials
+        
+        result = await db.execute(
+            select(AccessKey, User)
+            .join(User, User.user_id == AccessKey.user_id)
+            .where(AccessKey.access_key_id == access_key_id)
+        )
+        row = result.first()
+        
+        if not row:
+            raise InvalidCredentialsError(
+                message="The security token included in the request is invalid"
+            )
+        
+        access_key, user = row
+        if access_key.status != "Active":
+            raise InvalidCredentialsError(
+                message="Access key is not active"
+            )
+        if not user.enabled:
+            raise InvalidCredentialsError(
+                message="User account is disabled"
+            )
+        if not access_key.secret_access_key_encrypted:
+            raise InvalidCredentialsError(
+                message="Access key predates signed requests; authenticate with it "
+                        "once via /auth/access-key to enable signing"
+            )
+        
+        credentials = AccessKeyCredentials(
+            access_key_id=access_key.access_key_id,
+            secret_access_key=AuthService.decrypt_secret(access_key.secret_access_key_encrypted),
+            user_id=user.user_id,
+            username=user.username,
+            account_id=user.account_id
+        )
+        access_key_cache.put(credentials)
+        return credentials
+    
+    @staticmethod
+    async def authenticate_signed_request(
+        db: AsyncSession,
+        authorization: str,
+        method: str,
+        path: str,
+        query: str,
+        headers: Mapping[str, str],
+        payload_hash: str
+    ) -> AuthenticatedUser:
+        """
+        Authenticate a request signed with AWS Signature Version 4
+        
+        Args:
+            db: Database session (only used when the key is not cached)
+            authorization: AWS4-HMAC-SHA256 Authorization header
+            method: HTTP method
+            path: Decoded request path
+            query: Raw query string
+            headers: Request headers (case-insensitive lookup)
+            payload_hash: Hex SHA-256 of the body, or UNSIGNED-PAYLOAD
+            
+        Returns:
+            AuthenticatedUser for the key's owner
+            
+        Raises:
+            AuthenticationError: If the request is malformed, stale or the
+                signature does not match
+            InvalidCredentialsError: If the access key cannot be used
+        """
+        auth = sigv4.parse_authorization(authorization)
+        credentials = await AuthService.get_access_key_credentials(db, auth.access_key_id)
+        
+        sigv4.verify_signature(
+            auth,
+            credentials.secret_access_key,
+            method=method,
+            path=path,
+            query=query,
+            headers=headers,
+            payload_hash=payload_hash,
+            now=datetime.now(timezone.utc),
+            max_skew=settings.SIGV4_MAX_CLOCK_SKEW
+        )
+        
+        access_key_usage.record(
+            credentials.access_key_id,
+            credentials.user_id,
+            service=auth.service,
+            region=auth.region
+        )
+        
+        return AuthenticatedUser(
+            user_id=credentials.user_id,
+            username=credentials.username,
+            account_id=credentials.account_id,
+            auth_method="access_key",
+            access_key_id=credentials.access_key_id
+        )
+    
     @staticmethod
     async def refresh_access_token(
         db: AsyncSession,
@@ -3,24 +3,122 @@ CloudWatch Alarms Service
 Handles alarm CRUD, evaluation, and actions
 """
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.cloudwatch_alarm import CloudWatchAlarm
 from app.models.instance import Instance
 from app.services.cloudwatch_service import CloudWatchService
+from app.services.metric_store import epoch_seconds, series_key
 from app.services.instance_service import InstanceService
 from app.core.exceptions import ValidationError, ResourceNotFoundError
 from app.core.resource_ids import generate_id, ResourceType
 
 
+# Granularity of the in-memory series windows (matches the 1-minute rollups)
+WINDOW_RESOLUTION = 60
+
+# Seconds re-read behind a window's watermark to pick up late datapoints
+LATE_DATA_GRACE = 120
+
+# Datapoint keys for each alarm statistic
+STATISTIC_KEYS = {
+    "Average": "average",
+    "Sum": "sum",
+    "Minimum": "minimum",
+    "Maximum": "maximum",
+    "SampleCount": "sample_count"
+}
+
+
+class SeriesWindow:
+    """
+    Sliding window of 1-minute aggregates for one metric series.
+    
+    Buckets map bucket start (epoch seconds) to [count, sum, min, max] and
+    are replaced wholesale on refresh, since rollup rows are running totals.
+    """
+    
+    __slots__ = ("lookback", "buckets", "watermark")
+    
+    def __init__(self, lookback: int):
+        self.lookback = lookback
+        self.buckets: Dict[int, List[Any]] = {}
+        self.watermark: Optional[int] = None
+    
+    def fetch_from(self, now_epoch: int) -> int:
+        """Earliest bucket start that needs to be (re)read on this tick."""
+        oldest = now_epoch - self.lookback - WINDOW_RESOLUTION
+        if self.watermark is None:
+            return oldest
+        return max(oldest, self.watermark - LATE_DATA_GRACE)
+    
+    def merge(self, buckets: Dict[int, List[Any]], now_epoch: int):
+        """Replace refreshed buckets and drop those that fell out of the window."""
+        self.buckets.update(buckets)
+        
+        oldest = now_epoch - self.lookback - WINDOW_RESOLUTION
+        for start in [start for start in self.buckets if start < oldest]:
+            del self.buckets[start]
+        
+        self.watermark = now_epoch
+    
+    def period_values(
+        self,
+        window_end: int,
+        period: int,
+        evaluation_periods: int,
+        statistic: str
+    ) -> List[float]:
+        """Statistic value of each non-empty period in the evaluation range, oldest first."""
+        window_start = window_end - period * evaluation_periods
+        periods: Dict[int, List[Any]] = {}
+        
+        for start, (count, total, minimum, maximum) in self.buckets.items():
+            if start < window_start or start >= window_end:
+                continue
+            
+            index = (start - window_start) // period
+            agg = periods.get(index)
+            if agg is None:
+                periods[index] = [count, total, minimum, maximum]
+            else:
+                agg[0] += count
+                agg[1] += total
+                agg[2] = min(agg[2], minimum)
+                agg[3] = max(agg[3], maximum)
+        
+        values = []
+        for index in sorted(periods):
+            count, total, minimum, maximum = periods[index]
+            if statistic == "Average":
+                values.append(total / count)
+            elif statistic == "Sum":
+                values.append(total)
+            elif statistic == "Minimum":
+                values.append(minimum)
+            elif statistic == "Maximum":
+                values.append(maximum)
+            elif statistic == "SampleCount":
+                values.append(float(count))
+        
+        return values
+
+
 class CloudWatchAlarmsService:
     """Service for CloudWatch Alarms operations."""
     
     def __init__(self):
         self.cloudwatch_service = CloudWatchService()
         self.instance_service = InstanceService()
+        
+        # Per-series sliding windows, kept across evaluation sweeps
+        self._windows: Dict[Tuple[str, ...], SeriesWindow] = {}
+        
+        # Alarm metric definition -> window key, so unchanged alarms skip hashing
+        self._window_keys: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
     
     # ==================== Alarm CRUD ====================
     
@@ -279,8 +377,99 @@ class CloudWatchAlarmsService:
             }
         
         datapoints = stats.get("datapoints", [])
+        stat_key = STATISTIC_KEYS[alarm.statistic]
+        values = [dp.get(stat_key) for dp in datapoints]
+        
+        return self._evaluate_values(alarm, [v for v in values if v is not None])
+    
+    def evaluate_all_alarms(
+        self,
+        db: Session
+    ) -> List[Dict[str, any]]:
+        """
+        Evaluate all alarms across all accounts.
+        
+        Alarms are grouped by series (account, namespace, metric, dimensions)
+        so each series is read once per sweep. Each series keeps a sliding
+        window of 1-minute rollup buckets in memory; after the first sweep
+        only buckets newer than the window's watermark are fetched. State
+        changes are committed together before any actions run.
+        """
+        alarms = db.query(CloudWatchAlarm).all()
+        now = datetime.utcnow()
+        
+        # Group alarms per series; periods that are not whole minutes cannot
+        # be built from 1-minute buckets and use the per-alarm query path
+        groups = defaultdict(list)
+        unaligned = []
+        window_keys = {}
+        
+        for alarm in alarms:
+            if alarm.period % WINDOW_RESOLUTION:
+                unaligned.append(alarm)
+                continue
+            
+            definition = (alarm.account_id, alarm.namespace, alarm.metric_name, alarm.dimensions)
+            key = self._window_keys.get(definition)
+            if key is None:
+                key = self._series_window_key(alarm)
+            window_keys[definition] = key
+            groups[key].append(alarm)
+        
+        self._window_keys = window_keys
+        self._refresh_windows(db, groups, now)
+        
+        results = []
+        
+        # Evaluation ranges end at the close of the current (open) minute
+        window_end = int(epoch_seconds(now)) // WINDOW_RESOLUTION * WINDOW_RESOLUTION + WINDOW_RESOLUTION
+        
+        for key, group in groups.items():
+            window = self._windows[key]
+            for alarm in group:
+                try:
+                    values = window.period_values(
+                        window_end, alarm.period, alarm.evaluation_periods, alarm.statistic
+                    )
+                    results.append(self._evaluate_values(alarm, values))
+                except Exception as e:
+                    print(f"Error evaluating alarm {alarm.alarm_name}: {str(e)}")
+        
+        for alarm in unaligned:
+            try:
+                results.append(self.evaluate_alarm(db, alarm))
+            except Exception as e:
+                print(f"Error evaluating alarm {alarm.alarm_name}: {str(e)}")
+        
+        # Apply all state changes in one commit
+        changed = [r for r in results if r["new_state"] != r["old_state"]]
+        
+        for result in changed:
+            alarm = result["alarm"]
+            alarm.state_value = result["new_state"]
+            alarm.state_reason = result["reason"]
+            alarm.state_updated_timestamp = now
         
-        if not datapoints:
+        if changed:
+            db.commit()
+        
+        # Execute actions if enabled
+        for result in changed:
+            alarm = result["alarm"]
+            if alarm.actions_enabled:
+                self._execute_alarm_actions(db, alarm, result["old_state"], result["new_state"])
+        
+        return results
+    
+    def _evaluate_values(
+        self,
+        alarm: CloudWatchAlarm,
+        values: List[float]
+    ) -> Dict[str, any]:
+        """Decide an alarm's state from its per-period statistic values."""
+        old_state = alarm.state_value
+        
+        if not values:
             # No data
             new_state = self._handle_missing_data(alarm, "INSUFFICIENT_DATA")
             return {
@@ -293,18 +482,12 @@ class CloudWatchAlarmsService:
             }
         
         # Evaluate each datapoint
-        breaching_count = 0
-        stat_key = alarm.statistic.lower()
-        
-        for dp in datapoints:
-            value = dp.get(stat_key)
-            if value is None:
-                continue
-            
-            if self._is_breaching(value, alarm.threshold, alarm.comparison_operator):
-                breaching_count += 1
+        breaching_count = sum(
+            1 for value in values
+            if self._is_breaching(value, alarm.threshold, alarm.comparison_operator)
+        )
         
-        total_datapoints = len(datapoints)
+        total_datapoints = len(values)
         
         # Determine state
         required_breaches = alarm.datapoints_to_alarm or alarm.evaluation_periods
@@ -328,35 +511,69 @@ class CloudWatchAlarmsService:
             "total_datapoints": total_datapoints
         }
     
-    def evaluate_all_alarms(
+    # ==================== Series Windows ====================
+    
+    def _series_window_key(self, alarm: CloudWatchAlarm) -> Tuple[str, ...]:
+        """
+        Window key for an alarm's series.
+        
+        Exact-dimension alarms are keyed by (account_id, series_key); alarms
+        without dimensions aggregate every series of the metric and are keyed
+        by (account_id, namespace, metric_name).
+        """
+        dimensions = json.loads(alarm.dimensions) if alarm.dimensions else None
+        if dimensions:
+            return (
+                alarm.account_id,
+                series_key(alarm.account_id, alarm.namespace, alarm.metric_name, dimensions)
+            )
+        return (alarm.account_id, alarm.namespace, alarm.metric_name)
+    
+    def _refresh_windows(
         self,
-        db: Session
-    ) -> List[Dict[str, any]]:
-        """Evaluate all alarms across all accounts."""
-        alarms = db.query(CloudWatchAlarm).all()
+        db: Session,
+        groups: Dict[Tuple[str, ...], List[CloudWatchAlarm]],
+        now: datetime
+    ):
+        """
+        Pull new rollup buckets for every watched series.
         
-        results = []
-        for alarm in alarms:
-            try:
-                result = self.evaluate_alarm(db, alarm)
-                
-                # Update state if changed
-                if result["new_state"] != result["old_state"]:
-                    alarm.state_value = result["new_state"]
-                    alarm.state_reason = result["reason"]
-                    alarm.state_updated_timestamp = datetime.utcnow()
-                    db.commit()
-                    
-                    # Execute actions if enabled
-                    if alarm.actions_enabled:
-                        self._execute_alarm_actions(db, alarm, result["old_state"], result["new_state"])
-                
-                results.append(result)
-            except Exception as e:
-                print(f"Error evaluating alarm {alarm.alarm_name}: {str(e)}")
-                continue
+        Series are grouped by the bucket they need to read from, with one
+        batched read per group: in steady state every window shares the
+        same watermark, and a new or widened window only re-reads its own
+        lookback.
+        """
+        # Forget series that no longer have alarms
+        for key in list(self._windows):
+            if key not in groups:
+                del self._windows[key]
         
-        return results
+        if not groups:
+            return
+        
+        now_epoch = int(epoch_seconds(now))
+        by_since: Dict[int, List[Tuple[str, ...]]] = defaultdict(list)
+        
+        for key, group in groups.items():
+            lookback = max(alarm.period * alarm.evaluation_periods for alarm in group)
+            window = self._windows.get(key)
+            
+            if window is None or window.lookback < lookback:
+                window = self._windows[key] = SeriesWindow(lookback)
+            
+            by_since[window.fetch_from(now_epoch)].append(key)
+        
+        for since_epoch, keys in by_since.items():
+            buckets = self.cloudwatch_service.metric_store.read_buckets(
+                db,
+                WINDOW_RESOLUTION,
+                datetime(1970, 1, 1) + timedelta(seconds=since_epoch),
+                series=[key for key in keys if len(key) == 2],
+                metrics=[key for key in keys if len(key) == 3]
+            )
+            
+            for key in keys:
+                self._windows[key].merge(buckets.get(key, {}), now_epoch)
     
     def _is_breaching(self, value: float, threshold: float, operator: str) -> bool:
         """Check if value breaches threshold."""
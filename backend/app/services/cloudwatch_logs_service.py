@@ -2,20 +2,155 @@
 CloudWatch Logs Service
 Handles log groups, streams, and events
 """
+import asyncio
+import base64
 import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, case, insert, select, update
 
 from app.models.log_group import LogGroup
-from app.models.log_stream import LogStream, LogEvent
+from app.models.log_stream import LogStream, LogEvent, LogEventTerm
 from app.models.instance import Instance
 from app.core.exceptions import ValidationError, ResourceNotFoundError
+from app.core.database import AsyncSessionLocal
 from app.core.resource_ids import generate_id, ResourceType
+from app.services.log_filter_pattern import FilterPattern, IndexPlan, tokenize
+from app.services.logs_insights import DEFAULT_RESULT_LIMIT, InsightsQuery
 import docker
 
 
+logger = logging.getLogger(__name__)
+
+
+# Per-event storage overhead added to the UTF-8 message size
+EVENT_OVERHEAD_BYTES = 26
+
+# Ingestion buffer flush thresholds
+LOG_BUFFER_MAX_BYTES = 1024 * 1024
+LOG_BUFFER_MAX_DELAY = 1.0  # Seconds since the oldest buffered event
+
+# Container log lines read ahead of the ingesting generator
+LOG_READER_QUEUE_SIZE = 1000
+
+# Upper bound on cached stream ids
+MAX_CACHED_STREAMS = 10000
+
+# FilterLogEvents: candidates fetched per round and scanned per call
+FILTER_SCAN_CHUNK = 1000
+FILTER_MAX_SCANNED = 100000
+
+# Logs Insights: rows fetched per round trip, concurrent queries, finished queries kept
+INSIGHTS_SCAN_CHUNK = 5000
+INSIGHTS_MAX_CONCURRENT_QUERIES = 4
+INSIGHTS_MAX_RETAINED_QUERIES = 1000
+INSIGHTS_FETCH_TIMEOUT = 300  # Seconds a chunk fetch may wait on the event loop
+
+
+class QueryCancelledError(Exception):
+    """Raised inside a running Insights query after StopQuery."""
+
+
+class LogEventBuffer:
+    """
+    Buffers log events for one stream and writes them in bulk.
+    
+    Events are flushed through ``CloudWatchLogsService.put_log_events`` once
+    the buffered payload reaches ``max_bytes`` or the oldest buffered event
+    is ``max_delay`` seconds old. Thresholds are checked on append; while
+    the source is quiet the owner waits at most ``seconds_until_due()`` for
+    the next event and then calls ``flush_if_due()``, and calls ``flush()``
+    when the source ends.
+    """
+    
+    def __init__(
+        self,
+        service: "CloudWatchLogsService",
+        db: Session,
+        account_id: str,
+        log_group_name: str,
+        log_stream_name: str,
+        max_bytes: int = LOG_BUFFER_MAX_BYTES,
+        max_delay: float = LOG_BUFFER_MAX_DELAY
+    ):
+        self.service = service
+        self.db = db
+        self.account_id = account_id
+        self.log_group_name = log_group_name
+        self.log_stream_name = log_stream_name
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        
+        self._events: List[Dict[str, Any]] = []
+        self._bytes = 0
+        self._oldest: Optional[float] = None
+    
+    def __len__(self) -> int:
+        return len(self._events)
+    
+    def append(self, timestamp: datetime, message: str) -> bool:
+        """
+        Buffer one event, flushing if a threshold is reached.
+        
+        Returns:
+            True if the buffer was flushed
+        """
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        
+        self._events.append({"timestamp": timestamp, "message": message})
+        self._bytes += len(message.encode('utf-8')) + EVENT_OVERHEAD_BYTES
+        
+        if self._bytes >= self.max_bytes or self.seconds_until_due() == 0:
+            self.flush()
+            return True
+        return False
+    
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the oldest buffered event reaches ``max_delay`` (None if empty)."""
+        if self._oldest is None:
+            return None
+        return max(0.0, self.max_delay - (time.monotonic() - self._oldest))
+    
+    def flush_if_due(self) -> bool:
+        """
+        Flush if the oldest buffered event has reached ``max_delay``.
+        
+        Returns:
+            True if the buffer was flushed
+        """
+        if self.seconds_until_due() == 0:
+            self.flush()
+            return True
+        return False
+    
+    def flush(self):
+        """Write all buffered events in one batch."""
+        if not self._events:
+            return
+        
+        events = self._events
+        self._events = []
+        self._bytes = 0
+        self._oldest = None
+        
+        self.service.put_log_events(
+            self.db,
+            self.account_id,
+            self.log_group_name,
+            self.log_stream_name,
+            events
+        )
+
+
 class CloudWatchLogsService:
     """Service for CloudWatch Logs operations."""
     
@@ -24,6 +159,13 @@ class CloudWatchLogsService:
             self.docker_client = docker.from_env()
         except Exception:
             self.docker_client = None
+        
+        # (account_id, log_group_name, log_stream_name) -> stream_id
+        self._stream_ids: Dict[Tuple[str, str, str], str] = {}
+        
+        # Logs Insights queries by id, oldest first
+        self._queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._query_executor: Optional[ThreadPoolExecutor] = None
     
     # ==================== Log Groups ====================
     
@@ -118,6 +260,9 @@ class CloudWatchLogsService:
         
         db.delete(log_group)
         db.commit()
+        
+        for key in [k for k in self._stream_ids if k[0] == account_id and k[1] == log_group_name]:
+            del self._stream_ids[key]
     
     def put_retention_policy(
         self,
@@ -251,6 +396,8 @@ class CloudWatchLogsService:
         
         db.delete(log_stream)
         db.commit()
+        
+        self._stream_ids.pop((account_id, log_group_name, log_stream_name), None)
     
     # ==================== Log Events ====================
     
@@ -274,59 +421,140 @@ class CloudWatchLogsService:
         
         Returns:
             {"nextSequenceToken": str}
+        
+        Events and their inverted-index terms are written with bulk inserts;
+        stream and group counters
+        are updated with one aggregate UPDATE each, in a single commit.
         """
-        # Get log stream
-        log_stream = db.query(LogStream).filter(
-            LogStream.log_group_name == log_group_name,
-            LogStream.log_stream_name == log_stream_name,
-            LogStream.account_id == account_id
-        ).first()
+        if not log_events:
+            return {"nextSequenceToken": "next-token"}
         
-        if not log_stream:
-            raise ResourceNotFoundError(f"Log stream '{log_stream_name}' not found")
+        key = (account_id, log_group_name, log_stream_name)
+        cached = key in self._stream_ids
+        stream_id = self._resolve_stream_id(db, *key)
         
-        # Add events
+        # One pass: rows, byte total and the batch's timestamp range
         now = datetime.utcnow()
         total_bytes = 0
+        first_timestamp = last_timestamp = log_events[0]["timestamp"]
+        rows = []
+        term_rows = []
         
         for event_data in log_events:
+            timestamp = event_data["timestamp"]
+            message = event_data["message"]
             event_id = generate_id(ResourceType.LOG_GROUP)  # Reuse prefix
             
-            event = LogEvent(
-                event_id=event_id,
-                stream_id=log_stream.stream_id,
-                timestamp=event_data["timestamp"],
-                message=event_data["message"],
-                ingestion_time=now
-            )
-            
-            db.add(event)
+            rows.append({
+                "event_id": event_id,
+                "stream_id": stream_id,
+                "timestamp": timestamp,
+                "message": message,
+                "ingestion_time": now
+            })
             
-            # Calculate size
-            message_bytes = len(event_data["message"].encode('utf-8'))
-            total_bytes += message_bytes + 26  # +26 for overhead
+            for term in tokenize(message):
+                term_rows.append({
+                    "log_group_name": log_group_name,
+                    "term": term,
+                    "timestamp": timestamp,
+                    "event_id": event_id,
+                    "stream_id": stream_id
+                })
             
-            # Update stream timestamps
-            if not log_stream.first_event_timestamp or event_data["timestamp"] < log_stream.first_event_timestamp:
-                log_stream.first_event_timestamp = event_data["timestamp"]
-            
-            if not log_stream.last_event_timestamp or event_data["timestamp"] > log_stream.last_event_timestamp:
-                log_stream.last_event_timestamp = event_data["timestamp"]
+            total_bytes += len(message.encode('utf-8')) + EVENT_OVERHEAD_BYTES
+            if timestamp < first_timestamp:
+                first_timestamp = timestamp
+            if timestamp > last_timestamp:
+                last_timestamp = timestamp
         
-        log_stream.last_ingestion_time = now
-        log_stream.stored_bytes += total_bytes
+        # Update the stream first: no rows matched means a stale cached id
+        result = db.execute(
+            update(LogStream)
+            .where(LogStream.stream_id == stream_id)
+            .values(
+                stored_bytes=LogStream.stored_bytes + total_bytes,
+                first_event_timestamp=case(
+                    (
+                        or_(
+                            LogStream.first_event_timestamp.is_(None),
+                            LogStream.first_event_timestamp > first_timestamp
+                        ),
+                        first_timestamp
+                    ),
+                    else_=LogStream.first_event_timestamp
+                ),
+                last_event_timestamp=case(
+                    (
+                        or_(
+                            LogStream.last_event_timestamp.is_(None),
+                            LogStream.last_event_timestamp < last_timestamp
+                        ),
+                        last_timestamp
+                    ),
+                    else_=LogStream.last_event_timestamp
+                ),
+                last_ingestion_time=now
+            )
+            .execution_options(synchronize_session=False)
+        )
         
-        # Update log group bytes
-        log_group = db.query(LogGroup).filter(
-            LogGroup.log_group_name == log_group_name
-        ).first()
-        if log_group:
-            log_group.stored_bytes += total_bytes
+        if result.rowcount == 0:
+            db.rollback()
+            self._stream_ids.pop(key, None)
+            if cached:
+                # Stream deleted (and maybe recreated) since it was cached:
+                # look it up again, which raises if it no longer exists
+                return self.put_log_events(db, account_id, log_group_name, log_stream_name, log_events)
+            raise ResourceNotFoundError(resource_type="LogStream", resource_id=log_stream_name)
+        
+        # Table-level executemany: skips per-row ORM bulk bookkeeping
+        db.execute(insert(LogEvent.__table__), rows)
+        if term_rows:
+            db.execute(insert(LogEventTerm.__table__), term_rows)
+        
+        db.execute(
+            update(LogGroup)
+            .where(
+                LogGroup.log_group_name == log_group_name,
+                LogGroup.account_id == account_id
+            )
+            .values(stored_bytes=LogGroup.stored_bytes + total_bytes)
+            .execution_options(synchronize_session=False)
+        )
         
         db.commit()
         
         return {"nextSequenceToken": "next-token"}
     
+    def _resolve_stream_id(
+        self,
+        db: Session,
+        account_id: str,
+        log_group_name: str,
+        log_stream_name: str
+    ) -> str:
+        """Look up a stream id, caching it for subsequent batches."""
+        key = (account_id, log_group_name, log_stream_name)
+        stream_id = self._stream_ids.get(key)
+        if stream_id is not None:
+            return stream_id
+        
+        log_stream = db.query(LogStream).filter(
+            LogStream.log_group_name == log_group_name,
+            LogStream.log_stream_name == log_stream_name,
+            LogStream.account_id == account_id
+        ).first()
+        
+        if not log_stream:
+            raise ResourceNotFoundError(resource_type="LogStream", resource_id=log_stream_name)
+        
+        if len(self._stream_ids) >= MAX_CACHED_STREAMS:
+            self._stream_ids.clear()
+        self._stream_ids[key] = log_stream.stream_id
+        
+        return log_stream.stream_id
+    
     def get_log_events(
         self,
         db: Session,
@@ -377,6 +605,415 @@ class CloudWatchLogsService:
             for event in events
         ]
     
+    def filter_log_events(
+        self,
+        db: Session,
+        account_id: str,
+        log_group_name: str,
+        log_stream_names: Optional[List[str]] = None,
+        log_stream_name_prefix: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        filter_pattern: Optional[str] = None,
+        limit: int = 10000,
+        next_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Search log events across the streams of a log group.
+        
+        Candidates are narrowed through the term index when the pattern
+        yields required tokens, then checked against the full pattern.
+        Results are ordered by (timestamp, event id) and paginated with an
+        opaque keyset token. A call scans at most FILTER_MAX_SCANNED
+        candidates, so a page may hold fewer than ``limit`` events while
+        still returning a token.
+        
+        Returns:
+            {"events": [...], "nextToken": str or None}
+        """
+        log_group = db.query(LogGroup).filter(
+            LogGroup.log_group_name == log_group_name,
+            LogGroup.account_id == account_id
+        ).first()
+        
+        if not log_group:
+            raise ResourceNotFoundError(resource_type="LogGroup", resource_id=log_group_name)
+        
+        if log_stream_names and log_stream_name_prefix:
+            raise ValidationError("Specify log_stream_names or log_stream_name_prefix, not both")
+        
+        pattern = FilterPattern(filter_pattern)
+        
+        # Resolve the streams to search
+        stream_query = select(LogStream.stream_id, LogStream.log_stream_name).where(
+            LogStream.log_group_name == log_group_name
+        )
+        if log_stream_names:
+            stream_query = stream_query.where(LogStream.log_stream_name.in_(log_stream_names))
+        if log_stream_name_prefix:
+            stream_query = stream_query.where(LogStream.log_stream_name.startswith(log_stream_name_prefix))
+        
+        stream_names = dict(db.execute(stream_query).all())
+        if not stream_names:
+            return {"events": [], "nextToken": None}
+        
+        conditions = [LogEvent.stream_id.in_(list(stream_names.keys()))]
+        if start_time:
+            conditions.append(LogEvent.timestamp >= start_time)
+        if end_time:
+            conditions.append(LogEvent.timestamp <= end_time)
+        if pattern.plan is not None:
+            conditions.append(self._plan_condition(pattern.plan, log_group_name, start_time, end_time))
+        
+        cursor = self._decode_filter_token(next_token) if next_token else None
+        events = []
+        scanned = 0
+        exhausted = False
+        
+        while len(events) < limit and scanned < FILTER_MAX_SCANNED:
+            query = select(
+                LogEvent.event_id,
+                LogEvent.stream_id,
+                LogEvent.timestamp,
+                LogEvent.message,
+                LogEvent.ingestion_time
+            ).where(*conditions)
+            
+            if cursor:
+                query = query.where(or_(
+                    LogEvent.timestamp > cursor[0],
+                    and_(LogEvent.timestamp == cursor[0], LogEvent.event_id > cursor[1])
+                ))
+            
+            chunk = db.execute(
+                query.order_by(LogEvent.timestamp, LogEvent.event_id).limit(FILTER_SCAN_CHUNK)
+            ).all()
+            
+            for event_id, stream_id, timestamp, message, ingestion_time in chunk:
+                scanned += 1
+                cursor = (timestamp, event_id)
+                
+                if pattern.matches(message):
+                    events.append({
+                        "logStreamName": stream_names[stream_id],
+                        "timestamp": timestamp.isoformat(),
+                        "message": message,
+                        "ingestionTime": ingestion_time.isoformat(),
+                        "eventId": event_id
+                    })
+                    if len(events) >= limit:
+                        break
+            
+            if len(chunk) < FILTER_SCAN_CHUNK and len(events) < limit:
+                exhausted = True
+                break
+        
+        return {
+            "events": events,
+            "nextToken": None if exhausted or cursor is None else self._encode_filter_token(*cursor)
+        }
+    
+    def _plan_condition(
+        self,
+        plan: IndexPlan,
+        log_group_name: str,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime]
+    ):
+        """Translate an index plan into event_id IN (term lookup) conditions."""
+        kind, operand = plan
+        
+        if kind == "and":
+            return and_(*[
+                self._plan_condition(member, log_group_name, start_time, end_time)
+                for member in operand
+            ])
+        if kind == "or":
+            return or_(*[
+                self._plan_condition(member, log_group_name, start_time, end_time)
+                for member in operand
+            ])
+        
+        lookup = select(LogEventTerm.event_id).where(
+            LogEventTerm.log_group_name == log_group_name,
+            LogEventTerm.term == operand
+        )
+        if start_time:
+            lookup = lookup.where(LogEventTerm.timestamp >= start_time)
+        if end_time:
+            lookup = lookup.where(LogEventTerm.timestamp <= end_time)
+        
+        return LogEvent.event_id.in_(lookup)
+    
+    def _encode_filter_token(self, timestamp: datetime, event_id: str) -> str:
+        """Encode a (timestamp, event id) position as an opaque token."""
+        payload = json.dumps({"t": timestamp.isoformat(), "e": event_id})
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    def _decode_filter_token(self, token: str) -> Tuple[datetime, str]:
+        """Decode a token produced by ``_encode_filter_token``."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            return datetime.fromisoformat(payload["t"]), payload["e"]
+        except (ValueError, KeyError, TypeError):
+            raise ValidationError("Invalid nextToken")
+    
+    # ==================== Logs Insights ====================
+    
+    def run_insights_query(
+        self,
+        db: Session,
+        account_id: str,
+        log_group_names: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        query_string: str,
+        limit: int = DEFAULT_RESULT_LIMIT
+    ) -> Dict[str, Any]:
+        """
+        Run a Logs Insights query synchronously on ``db``.
+        
+        Returns:
+            {"results": [[{"field", "value"}]], "statistics": {...}}
+        """
+        query = InsightsQuery(query_string)
+        self._validate_query_range(start_time, end_time)
+        
+        def fetch(statement):
+            return db.execute(statement).all()
+        
+        return self._execute_insights_query(
+            fetch, account_id, log_group_names, start_time, end_time, query, limit
+        )
+    
+    def start_query(
+        self,
+        account_id: str,
+        log_group_names: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        query_string: str,
+        limit: int = DEFAULT_RESULT_LIMIT
+    ) -> str:
+        """
+        Start a Logs Insights query in the background.
+        
+        Must be called from the event loop. The pipeline runs on a small
+        thread pool; each chunk of rows is fetched on the event loop
+        through the app's async engine, so a long scan holds neither an
+        HTTP worker nor the loop.
+        
+        Returns:
+            Query id for get_query_results / stop_query
+        
+        Raises:
+            ValidationError: If the query does not parse or the range is invalid
+        """
+        query = InsightsQuery(query_string)
+        self._validate_query_range(start_time, end_time)
+        
+        if not log_group_names:
+            raise ValidationError("At least one log group is required")
+        
+        loop = asyncio.get_running_loop()
+        if self._query_executor is None:
+            self._query_executor = ThreadPoolExecutor(
+                max_workers=INSIGHTS_MAX_CONCURRENT_QUERIES,
+                thread_name_prefix="logs-insights"
+            )
+        
+        query_id = str(uuid.uuid4())
+        state = {
+            "query_id": query_id,
+            "account_id": account_id,
+            "query_string": query_string,
+            "log_group_names": list(log_group_names),
+            "status": "Scheduled",
+            "results": [],
+            "statistics": {"records_matched": 0, "records_scanned": 0, "bytes_scanned": 0},
+            "error": None,
+            "cancelled": False,
+            "created_at": datetime.utcnow()
+        }
+        self._register_query(state)
+        
+        def fetch(statement):
+            if state["cancelled"]:
+                raise QueryCancelledError()
+            
+            async def run():
+                async with AsyncSessionLocal() as session:
+                    return (await session.execute(statement)).all()
+            
+            return asyncio.run_coroutine_threadsafe(run(), loop).result(INSIGHTS_FETCH_TIMEOUT)
+        
+        def execute():
+            state["status"] = "Running"
+            try:
+                outcome = self._execute_insights_query(
+                    fetch, account_id, log_group_names, start_time, end_time,
+                    query, limit, statistics=state["statistics"]
+                )
+                state["results"] = outcome["results"]
+                state["status"] = "Complete"
+            except QueryCancelledError:
+                state["status"] = "Cancelled"
+            except Exception as e:
+                logger.error(f"Insights query {query_id} failed: {str(e)}", exc_info=True)
+                state["error"] = str(e)
+                state["status"] = "Failed"
+        
+        self._query_executor.submit(execute)
+        return query_id
+    
+    def get_query_results(self, account_id: str, query_id: str) -> Dict[str, Any]:
+        """
+        Get the status, statistics and (once complete) results of a query.
+        
+        Statistics are updated while the query runs.
+        """
+        state = self._queries.get(query_id)
+        if state is None or state["account_id"] != account_id:
+            raise ResourceNotFoundError(resource_type="Query", resource_id=query_id)
+        
+        return {
+            "status": state["status"],
+            "results": state["results"],
+            "statistics": dict(state["statistics"]),
+            "error": state["error"]
+        }
+    
+    def stop_query(self, account_id: str, query_id: str) -> bool:
+        """
+        Cancel a scheduled or running query.
+        
+        Returns:
+            True if the query was still in progress
+        """
+        state = self._queries.get(query_id)
+        if state is None or state["account_id"] != account_id:
+            raise ResourceNotFoundError(resource_type="Query", resource_id=query_id)
+        
+        if state["status"] not in ("Scheduled", "Running"):
+            return False
+        
+        state["cancelled"] = True
+        return True
+    
+    def shutdown_queries(self):
+        """Cancel in-flight queries and release the query thread pool."""
+        for state in self._queries.values():
+            if state["status"] in ("Scheduled", "Running"):
+                state["cancelled"] = True
+        
+        if self._query_executor is not None:
+            self._query_executor.shutdown(wait=False, cancel_futures=True)
+            self._query_executor = None
+    
+    def _register_query(self, state: Dict[str, Any]):
+        """Track a query, evicting the oldest finished ones beyond the cap."""
+        self._queries[state["query_id"]] = state
+        
+        excess = len(self._queries) - INSIGHTS_MAX_RETAINED_QUERIES
+        for query_id in list(self._queries):
+            if excess <= 0:
+                break
+            if self._queries[query_id]["status"] not in ("Scheduled", "Running"):
+                del self._queries[query_id]
+                excess -= 1
+    
+    def _validate_query_range(self, start_time: datetime, end_time: datetime):
+        if start_time is None or end_time is None:
+            raise ValidationError("start_time and end_time are required")
+        if start_time > end_time:
+            raise ValidationError("start_time must be before end_time")
+    
+    def _execute_insights_query(
+        self,
+        fetch,
+        account_id: str,
+        log_group_names: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        query: InsightsQuery,
+        limit: int,
+        statistics: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream the query's rows through its pipeline.
+        
+        The time range, log groups (scoped to the account) and the query's
+        pushed-down stream and message filters become SQL; rows are read
+        in keyset chunks in the planned scan order.
+        """
+        statistics = statistics if statistics is not None else {
+            "records_matched": 0, "records_scanned": 0, "bytes_scanned": 0
+        }
+        
+        conditions = [
+            LogStream.account_id == account_id,
+            LogStream.log_group_name.in_(log_group_names),
+            LogEvent.timestamp >= start_time,
+            LogEvent.timestamp <= end_time
+        ]
+        if query.stream_names is not None:
+            conditions.append(LogStream.log_stream_name.in_(query.stream_names))
+        for text in query.message_contains:
+            conditions.append(LogEvent.message.contains(text, autoescape=True))
+        
+        if query.descending:
+            order = (LogEvent.timestamp.desc(), LogEvent.event_id.desc())
+        else:
+            order = (LogEvent.timestamp.asc(), LogEvent.event_id.asc())
+        
+        def records():
+            cursor = None
+            while True:
+                statement = select(
+                    LogEvent.event_id,
+                    LogEvent.timestamp,
+                    LogEvent.message,
+                    LogEvent.ingestion_time,
+                    LogStream.log_stream_name,
+                    LogStream.log_group_name
+                ).join(LogStream, LogStream.stream_id == LogEvent.stream_id).where(*conditions)
+                
+                if cursor:
+                    timestamp, event_id = cursor
+                    if query.descending:
+                        statement = statement.where(or_(
+                            LogEvent.timestamp < timestamp,
+                            and_(LogEvent.timestamp == timestamp, LogEvent.event_id < event_id)
+                        ))
+                    else:
+                        statement = statement.where(or_(
+                            LogEvent.timestamp > timestamp,
+                            and_(LogEvent.timestamp == timestamp, LogEvent.event_id > event_id)
+                        ))
+                
+                chunk = fetch(statement.order_by(*order).limit(INSIGHTS_SCAN_CHUNK))
+                
+                for event_id, timestamp, message, ingestion_time, stream_name, group_name in chunk:
+                    statistics["records_scanned"] += 1
+                    statistics["bytes_scanned"] += len(message.encode('utf-8'))
+                    yield {
+                        "@timestamp": timestamp,
+                        "@message": message,
+                        "@logStream": stream_name,
+                        "@log": group_name,
+                        "@ingestionTime": ingestion_time,
+                        "@ptr": event_id
+                    }
+                
+                if len(chunk) < INSIGHTS_SCAN_CHUNK:
+                    return
+                cursor = (chunk[-1][1], chunk[-1][0])
+        
+        results, matched = query.run(records(), limit)
+        statistics["records_matched"] = matched
+        
+        return {"results": results, "statistics": statistics}
+    
     # ==================== Container Log Streaming ====================
     
     def stream_container_logs(
@@ -438,29 +1075,78 @@ class CloudWatchLogsService:
         if not log_stream:
             log_stream = self.create_log_stream(db, account_id, log_group_name, log_stream_name)
         
-        # Stream logs
-        for log_line in container.logs(stream=True, follow=follow, timestamps=True):
-            line = log_line.decode('utf-8').strip()
-            
-            # Parse timestamp from Docker log format
-            # Format: "2024-01-31T12:00:00.123456789Z message"
-            try:
-                timestamp_str, message = line.split(' ', 1)
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            except:
-                timestamp = datetime.utcnow()
-                message = line
-            
-            # Store in database
-            self.put_log_events(
-                db,
-                account_id,
-                log_group_name,
-                log_stream_name,
-                [{"timestamp": timestamp, "message": message}]
-            )
-            
-            yield line
-
+        # Stream logs, writing them in size/time-bounded batches. Lines are
+        # read on a separate thread so a quiet followed container does not
+        # hold buffered events past the buffer's max delay.
+        buffer = LogEventBuffer(self, db, account_id, log_group_name, log_stream_name)
+        log_lines = container.logs(stream=True, follow=follow, timestamps=True)
+        lines: "queue.Queue" = queue.Queue(maxsize=LOG_READER_QUEUE_SIZE)
+        stopped = threading.Event()
+        reader = threading.Thread(
+            target=_read_log_lines,
+            args=(log_lines, lines, stopped),
+            name=f"logs-{instance_id}",
+            daemon=True
+        )
+        reader.start()
+        
+        try:
+            while True:
+                try:
+                    log_line = lines.get(timeout=buffer.seconds_until_due())
+                except queue.Empty:
+                    buffer.flush_if_due()
+                    continue
+                
+                if log_line is None:
+                    break
+                if isinstance(log_line, Exception):
+                    raise log_line
+                
+                line = log_line.decode('utf-8').strip()
+                
+                # Parse timestamp from Docker log format
+                # Format: "2024-01-31T12:00:00.123456789Z message"
+                try:
+                    timestamp_str, message = line.split(' ', 1)
+                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+                    timestamp = timestamp.replace(tzinfo=None)  # Stored as naive UTC
+                except:
+                    timestamp = datetime.utcnow()
+                    message = line
+                
+                buffer.append(timestamp, message)
+                
+                yield line
+        finally:
+            stopped.set()
+            close = getattr(log_lines, "close", None)
+            if close is not None:
+                close()
+            buffer.flush()
 
 
+def _read_log_lines(log_lines, lines: "queue.Queue", stopped: threading.Event):
+    """
+    Move Docker log lines onto a queue until the stream ends or ``stopped`` is set.
+    
+    Ends with None, preceded by the exception if reading failed.
+    """
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                lines.put(item, timeout=LOG_BUFFER_MAX_DELAY)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    try:
+        for log_line in log_lines:
+            if not put(log_line):
+                return
+    except Exception as e:
+        if stopped.is_set():
+            return
+        put(e)
+    put(None)
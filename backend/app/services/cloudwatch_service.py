@@ -4,18 +4,46 @@ Handles metric collection, storage, and retrieval
 """
 import json
 import secrets
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert
 
 from app.models.cloudwatch_metric import CloudWatchMetric
 from app.models.instance import Instance
+from app.services.metric_store import (
+    MetricStore,
+    canonical_dimensions,
+    epoch_seconds,
+    series_key,
+    to_utc_naive
+)
+from app.services.s3_bucket_stats import storage_metric_points
 from app.core.exceptions import ValidationError, ResourceNotFoundError
 from app.core.resource_ids import generate_id, ResourceType
 import docker
 
 
+VALID_UNITS = frozenset([
+    "Seconds", "Microseconds", "Milliseconds", "Bytes", "Kilobytes",
+    "Megabytes", "Gigabytes", "Terabytes", "Bits", "Kilobits",
+    "Megabits", "Gigabits", "Terabits", "Percent", "Count",
+    "Bytes/Second", "Kilobytes/Second", "Megabytes/Second",
+    "Gigabytes/Second", "Terabytes/Second", "Bits/Second",
+    "Kilobits/Second", "Megabits/Second", "Gigabits/Second",
+    "Terabits/Second", "Count/Second", "None"
+])
+
+# Maximum datapoints accepted by a single PutMetricData call
+MAX_METRIC_DATA_PER_REQUEST = 1000
+
+# Namespace for the collector's own health metrics
+COLLECTOR_NAMESPACE = "CloudSim/Collector"
+
+
 class CloudWatchService:
     """Service for CloudWatch metrics operations."""
     
@@ -25,6 +53,8 @@ class CloudWatchService:
         except Exception:
             # Docker not available, will skip container metrics
             self.docker_client = None
+        
+        self.metric_store = MetricStore()
     
     # ==================== Metric Storage ====================
     
@@ -59,25 +89,14 @@ class CloudWatchService:
             ValidationError: If parameters invalid
         """
         # Validate
-        if not namespace or len(namespace) > 255:
-            raise ValidationError("Namespace must be 1-255 characters")
-        
-        if not metric_name or len(metric_name) > 255:
-            raise ValidationError("Metric name must be 1-255 characters")
-        
-        valid_units = ["Seconds", "Microseconds", "Milliseconds", "Bytes", "Kilobytes", 
-                      "Megabytes", "Gigabytes", "Terabytes", "Bits", "Kilobits", 
-                      "Megabits", "Gigabits", "Terabits", "Percent", "Count", 
-                      "Bytes/Second", "Kilobytes/Second", "Megabytes/Second", 
-                      "Gigabytes/Second", "Terabytes/Second", "Bits/Second", 
-                      "Kilobits/Second", "Megabits/Second", "Gigabits/Second", 
-                      "Terabits/Second", "Count/Second", "None"]
-        
-        if unit not in valid_units:
-            raise ValidationError(f"Invalid unit: {unit}")
+        self._validate_namespace(namespace)
+        error = self._validate_datum(metric_name, unit)
+        if error:
+            raise ValidationError(error)
         
         # Create metric
         metric_id = generate_id(ResourceType.CLOUDWATCH_METRIC)
+        timestamp = to_utc_naive(timestamp) if timestamp else datetime.utcnow()
         
         metric = CloudWatchMetric(
             metric_id=metric_id,
@@ -85,13 +104,25 @@ class CloudWatchService:
             metric_name=metric_name,
             value=value,
             unit=unit,
-            timestamp=timestamp or datetime.utcnow(),
-            dimensions=json.dumps(dimensions) if dimensions else None,
+            timestamp=timestamp,
+            dimensions=canonical_dimensions(dimensions),
+            series_id=series_key(account_id, namespace, metric_name, dimensions),
             account_id=account_id,
             created_at=datetime.utcnow()
         )
         
         db.add(metric)
+        
+        # Maintain rollups in the same transaction
+        self.metric_store.record(db, account_id, [{
+            "namespace": namespace,
+            "metric_name": metric_name,
+            "dimensions": dimensions,
+            "unit": unit,
+            "value": value,
+            "timestamp": timestamp
+        }])
+        
         db.commit()
         db.refresh(metric)
         
@@ -133,6 +164,124 @@ class CloudWatchService:
         
         return metrics
     
+    def put_metric_data_bulk(
+        self,
+        db: Session,
+        account_id: str,
+        namespace: str,
+        metric_data: List[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Put a batch of metric data points in one transaction.
+        
+        The whole batch is validated before anything is written; datapoints
+        are then stored with a single multi-row insert, rollups are updated
+        once for the batch and the session is committed once.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            namespace: Metric namespace
+            metric_data: List of metric dictionaries (metric_name, value, unit,
+                optional timestamp and dimensions)
+        
+        Returns:
+            Counts of stored datapoints and distinct series touched
+        
+        Raises:
+            ValidationError: If any datapoint is invalid (nothing is stored)
+        """
+        self._validate_namespace(namespace)
+        
+        if len(metric_data) > MAX_METRIC_DATA_PER_REQUEST:
+            raise ValidationError(
+                f"At most {MAX_METRIC_DATA_PER_REQUEST} datapoints allowed per request"
+            )
+        
+        errors = []
+        for index, data in enumerate(metric_data):
+            error = self._validate_datum(data.get("metric_name"), data.get("unit"))
+            if error:
+                errors.append({"field": f"metric_data[{index}]", "message": error})
+        
+        if errors:
+            raise ValidationError(errors)
+        
+        if not metric_data:
+            return {"metrics_stored": 0, "series_updated": 0}
+        
+        now = datetime.utcnow()
+        points = [
+            {
+                "namespace": namespace,
+                "metric_name": data["metric_name"],
+                "dimensions": data.get("dimensions"),
+                "unit": data["unit"],
+                "value": data["value"],
+                "timestamp": to_utc_naive(data["timestamp"]) if data.get("timestamp") else now
+            }
+            for data in metric_data
+        ]
+        
+        series_updated = self._insert_datapoints(db, account_id, points)
+        db.commit()
+        
+        return {"metrics_stored": len(points), "series_updated": series_updated}
+    
+    def _insert_datapoints(
+        self,
+        db: Session,
+        account_id: str,
+        points: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Insert validated datapoints with one multi-row INSERT and update rollups.
+        
+        Points carry namespace, metric_name, dimensions, unit, value and a
+        naive UTC timestamp. Does not commit.
+        
+        Returns:
+            Number of distinct series written
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "metric_id": generate_id(ResourceType.CLOUDWATCH_METRIC),
+                "namespace": point["namespace"],
+                "metric_name": point["metric_name"],
+                "value": point["value"],
+                "unit": point["unit"],
+                "timestamp": point["timestamp"],
+                "dimensions": canonical_dimensions(point["dimensions"]),
+                "series_id": series_key(
+                    account_id, point["namespace"], point["metric_name"], point["dimensions"]
+                ),
+                "account_id": account_id,
+                "created_at": now
+            }
+            for point in points
+        ]
+        
+        db.execute(insert(CloudWatchMetric).values(rows))
+        self.metric_store.record(db, account_id, points)
+        
+        return len({row["series_id"] for row in rows})
+    
+    def _validate_namespace(self, namespace: str):
+        """Validate a metric namespace."""
+        if not namespace or len(namespace) > 255:
+            raise ValidationError("Namespace must be 1-255 characters")
+    
+    def _validate_datum(self, metric_name: Optional[str], unit: Optional[str]) -> Optional[str]:
+        """Validate a single datapoint, returning an error message or None."""
+        if not metric_name or len(metric_name) > 255:
+            return "Metric name must be 1-255 characters"
+        
+        if unit not in VALID_UNITS:
+            return f"Invalid unit: {unit}"
+        
+        return None
+    
     # ==================== Metric Retrieval ====================
     
     def get_metric_statistics(
@@ -179,68 +328,50 @@ class CloudWatchService:
             if stat not in valid_stats:
                 raise ValidationError(f"Invalid statistic: {stat}")
         
-        # Build query
-        query = db.query(CloudWatchMetric).filter(
-            CloudWatchMetric.account_id == account_id,
-            CloudWatchMetric.namespace == namespace,
-            CloudWatchMetric.metric_name == metric_name,
-            CloudWatchMetric.timestamp >= start_time,
-            CloudWatchMetric.timestamp <= end_time
+        # Load samples (rollups where aligned, raw datapoints otherwise)
+        chunk = self.metric_store.read(
+            db,
+            account_id,
+            namespace,
+            metric_name,
+            start_time,
+            end_time,
+            period,
+            dimensions
         )
         
-        # Filter by dimensions
-        if dimensions:
-            dimensions_json = json.dumps(dimensions, sort_keys=True)
-            query = query.filter(CloudWatchMetric.dimensions == dimensions_json)
-        
-        # Get metrics
-        metrics = query.order_by(CloudWatchMetric.timestamp).all()
-        
-        if not metrics:
+        if not len(chunk):
             return {
                 "label": metric_name,
                 "datapoints": []
             }
         
-        # Aggregate by period
+        # Aggregate by period in a single pass, anchored at the aligned start
         datapoints = []
-        current_period_start = start_time
+        origin = chunk.origin
         
-        while current_period_start < end_time:
-            current_period_end = current_period_start + timedelta(seconds=period)
+        for index, count, total, minimum, maximum in chunk.bin(epoch_seconds(origin), period):
+            datapoint = {
+                "timestamp": (origin + timedelta(seconds=index * period)).isoformat(),
+                "unit": chunk.unit
+            }
             
-            # Get metrics in this period
-            period_metrics = [
-                m for m in metrics 
-                if current_period_start <= m.timestamp < current_period_end
-            ]
+            if "Average" in statistics:
+                datapoint["average"] = total / count
             
-            if period_metrics:
-                values = [m.value for m in period_metrics]
-                
-                datapoint = {
-                    "timestamp": current_period_start.isoformat(),
-                    "unit": period_metrics[0].unit
-                }
-                
-                if "Average" in statistics:
-                    datapoint["average"] = sum(values) / len(values)
-                
-                if "Sum" in statistics:
-                    datapoint["sum"] = sum(values)
-                
-                if "Minimum" in statistics:
-                    datapoint["minimum"] = min(values)
-                
-                if "Maximum" in statistics:
-                    datapoint["maximum"] = max(values)
-                
-                if "SampleCount" in statistics:
-                    datapoint["sample_count"] = len(values)
-                
-                datapoints.append(datapoint)
+            if "Sum" in statistics:
+                datapoint["sum"] = total
             
-            current_period_start = current_period_end
+            if "Minimum" in statistics:
+                datapoint["minimum"] = minimum
+            
+            if "Maximum" in statistics:
+                datapoint["maximum"] = maximum
+            
+            if "SampleCount" in statistics:
+                datapoint["sample_count"] = count
+            
+            datapoints.append(datapoint)
         
         return {
             "label": metric_name,
@@ -263,30 +394,18 @@ class CloudWatchService:
             account_id: Account ID
             namespace: Optional namespace filter
             metric_name: Optional metric name filter
-            dimensions: Optional dimension filters
+            dimensions: Optional partial dimension filter (series must carry every pair)
         
         Returns:
             List of unique metric definitions
         """
-        query = db.query(
-            CloudWatchMetric.namespace,
-            CloudWatchMetric.metric_name,
-            CloudWatchMetric.dimensions
-        ).filter(
-            CloudWatchMetric.account_id == account_id
-        ).distinct()
-        
-        if namespace:
-            query = query.filter(CloudWatchMetric.namespace == namespace)
-        
-        if metric_name:
-            query = query.filter(CloudWatchMetric.metric_name == metric_name)
-        
-        if dimensions:
-            dimensions_json = json.dumps(dimensions, sort_keys=True)
-            query = query.filter(CloudWatchMetric.dimensions == dimensions_json)
-        
-        results = query.all()
+        results = self.metric_store.list_series(
+            db,
+            account_id,
+            namespace,
+            metric_name,
+            dimensions
+        )
         
         metrics = []
         for namespace, metric_name, dimensions_str in results:
@@ -305,7 +424,7 @@ class CloudWatchService:
         db: Session,
         account_id: str,
         instance_id: str
-    ) -> List[CloudWatchMetric]:
+    ) -> List[Dict[str, Any]]:
         """
         Collect metrics from a running EC2 instance (Docker container).
         
@@ -315,7 +434,7 @@ class CloudWatchService:
             instance_id: Instance ID
         
         Returns:
-            List of collected metrics
+            List of collected datapoints
         
         Raises:
             ResourceNotFoundError: If instance not found
@@ -327,144 +446,238 @@ class CloudWatchService:
         ).first()
         
         if not instance:
-            raise ResourceNotFoundError(f"Instance {instance_id} not found")
+            raise ResourceNotFoundError(resource_type="Instance", resource_id=instance_id)
         
         if instance.state != "running":
             raise ValidationError(f"Instance {instance_id} is not running")
         
-        # Get Docker container
-        try:
-            container = self.docker_client.containers.get(instance.container_id)
-        except docker.errors.NotFound:
-            raise ResourceNotFoundError(f"Container {instance.container_id} not found")
+        if instance.docker_container_id is None:
+            raise ValidationError(f"Instance {instance_id} has no container")
         
-        # Get container stats (single point, no streaming)
-        stats = container.stats(stream=False)
+        stats, _ = self.sample_container(instance.docker_container_id)
+        points = self._build_instance_datapoints(instance, stats, datetime.utcnow())
         
-        # Calculate metrics
-        timestamp = datetime.utcnow()
-        dimensions = {
-            "InstanceId": instance_id,
-            "InstanceType": instance.instance_type
-        }
+        self._insert_datapoints(db, account_id, points)
+        db.commit()
         
-        metrics = []
+        return points
+    
+    def collect_all_instance_metrics(
+        self,
+        db: Session,
+        max_workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Collect metrics from all running instances across all accounts.
         
-        # CPU Utilization
-        cpu_percent = self._calculate_cpu_percent(stats)
-        metrics.append(self.put_metric_data(
-            db,
-            account_id,
-            "AWS/EC2",
-            "CPUUtilization",
-            cpu_percent,
-            "Percent",
-            timestamp,
-            dimensions
-        ))
+        Container stats calls block while Docker samples CPU twice, so they
+        are fanned out across a bounded thread pool. Instance rows are loaded
+        once and reused, and the whole sweep (including CloudSim/Collector
+        sweep duration and per-container latency metrics) is written with
+        one insert per account and a single commit.
         
-        # Memory Utilization
-        memory_percent = self._calculate_memory_percent(stats)
-        metrics.append(self.put_metric_data(
-            db,
-            account_id,
-            "AWS/EC2",
-            "MemoryUtilization",
-            memory_percent,
-            "Percent",
-            timestamp,
-            dimensions
-        ))
+        Args:
+            db: Database session
+            max_workers: Maximum concurrent Docker stats calls
         
-        # Network In
-        network_in = self._get_network_bytes_in(stats)
-        metrics.append(self.put_metric_data(
-            db,
-            account_id,
-            "AWS/EC2",
-            "NetworkIn",
-            network_in,
-            "Bytes",
-            timestamp,
-            dimensions
-        ))
+        Returns:
+            Dictionary mapping instance_id to list of datapoints
+        """
+        sweep_started = time.perf_counter()
         
-        # Network Out
-        network_out = self._get_network_bytes_out(stats)
-        metrics.append(self.put_metric_data(
-            db,
-            account_id,
-            "AWS/EC2",
-            "NetworkOut",
-            network_out,
-            "Bytes",
-            timestamp,
-            dimensions
-        ))
+        # Get all running instances that have a container to sample
+        instances = db.query(Instance).filter(
+            Instance.state == "running",
+            Instance.docker_container_id.isnot(None)
+        ).all()
         
-        # Disk Read Bytes
-        disk_read = self._get_disk_read_bytes(stats)
-        metrics.append(self.put_metric_data(
-            db,
-            account_id,
-            "AWS/EC2",
-            "DiskReadBytes",
-            disk_read,
-            "Bytes",
-            timestamp,
-            dimensions
-        ))
+        if not instances:
+            return {}
         
-        # Disk Write Bytes
-        disk_write = self._get_disk_write_bytes(stats)
-        metrics.append(self.put_metric_data(
-            db,
-            account_id,
-            "AWS/EC2",
-            "DiskWriteBytes",
-            disk_write,
-            "Bytes",
-            timestamp,
-            dimensions
-        ))
+        samples = {}
         
-        return metrics
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(instances)))) as pool:
+            futures = {
+                pool.submit(self.sample_container, instance.docker_container_id): instance
+                for instance in instances
+            }
+            
+            for future in as_completed(futures):
+                instance = futures[future]
+                try:
+                    samples[instance.instance_id] = future.result()
+                except Exception as e:
+                    samples[instance.instance_id] = e
+        
+        return self.store_sweep(
+            db,
+            instances,
+            samples,
+            time.perf_counter() - sweep_started,
+            datetime.utcnow()
+        )
     
-    def collect_all_instance_metrics(
+    def store_sweep(
         self,
-        db: Session
-    ) -> Dict[str, List[CloudWatchMetric]]:
+        db: Session,
+        instances: List[Any],
+        samples: Dict[str, Any],
+        sweep_duration: float,
+        timestamp: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Collect metrics from all running instances across all accounts.
+        Write one collection sweep in a single transaction.
         
         Args:
             db: Database session
+            instances: Instances that were sampled (Instance objects or rows
+                with instance_id, account_id and instance_type)
+            samples: instance_id -> (stats, latency seconds), or the exception
+                raised while sampling that instance
+            sweep_duration: Wall-clock duration of the sweep in seconds
+            timestamp: Timestamp for every datapoint in the sweep
         
         Returns:
-            Dictionary mapping instance_id to list of metrics
+            Dictionary mapping instance_id to list of datapoints
         """
-        # Get all running instances
-        instances = db.query(Instance).filter(
-            Instance.state == "running"
-        ).all()
-        
         results = {}
+        failures = defaultdict(int)
+        
+        # Group the sweep per account, then write everything in one transaction
+        points_by_account = defaultdict(list)
         
         for instance in instances:
-            try:
-                metrics = self.collect_instance_metrics(
-                    db,
-                    instance.account_id,
-                    instance.instance_id
-                )
-                results[instance.instance_id] = metrics
-            except Exception as e:
+            sample = samples.get(instance.instance_id)
+            
+            if sample is None or isinstance(sample, Exception):
                 # Log error but continue with other instances
-                print(f"Error collecting metrics for {instance.instance_id}: {str(e)}")
+                print(f"Error collecting metrics for {instance.instance_id}: {str(sample)}")
+                failures[instance.account_id] += 1
                 continue
+            
+            stats, latency = sample
+            results[instance.instance_id] = self._build_instance_datapoints(
+                instance, stats, timestamp
+            )
+            
+            points_by_account[instance.account_id].extend(results[instance.instance_id])
+            points_by_account[instance.account_id].append({
+                "namespace": COLLECTOR_NAMESPACE,
+                "metric_name": "ContainerStatsLatency",
+                "dimensions": {"InstanceId": instance.instance_id},
+                "unit": "Milliseconds",
+                "value": round(latency * 1000.0, 3),
+                "timestamp": timestamp
+            })
+        
+        for account_id in {instance.account_id for instance in instances}:
+            points_by_account[account_id].extend([
+                {
+                    "namespace": COLLECTOR_NAMESPACE,
+                    "metric_name": "SweepDuration",
+                    "dimensions": None,
+                    "unit": "Milliseconds",
+                    "value": round(sweep_duration * 1000.0, 3),
+                    "timestamp": timestamp
+                },
+                {
+                    "namespace": COLLECTOR_NAMESPACE,
+                    "metric_name": "CollectionFailures",
+                    "dimensions": None,
+                    "unit": "Count",
+                    "value": float(failures[account_id]),
+                    "timestamp": timestamp
+                }
+            ])
+        
+        for account_id, points in points_by_account.items():
+            self._insert_datapoints(db, account_id, points)
+        
+        db.commit()
         
         return results
     
+    def store_storage_metrics(self, db: Session, timestamp: datetime) -> int:
+        """
+        Publish AWS/S3 BucketSizeBytes and NumberOfObjects for every bucket.
+        
+        Values come from the incrementally maintained bucket stats, so
+        this reads one counter row per bucket prefix and storage class.
+        
+        Returns:
+            Number of buckets reported
+        """
+        points_by_account = storage_metric_points(db, timestamp)
+        
+        for account_id, points in points_by_account.items():
+            self._insert_datapoints(db, account_id, points)
+        
+        db.commit()
+        
+        return sum(
+            1
+            for points in points_by_account.values()
+            for point in points if point["metric_name"] == "NumberOfObjects"
+        )
+    
+    def sample_container(self, container_id: str) -> Tuple[Dict, float]:
+        """
+        Take one stats sample from a container.
+        
+        Safe to call from worker threads; does not touch the database.
+        
+        Returns:
+            (Docker stats dict, call latency in seconds)
+        """
+        if self.docker_client is None:
+            raise ValidationError("Docker is not available")
+        
+        started = time.perf_counter()
+        
+        # Get Docker container
+        try:
+            container = self.docker_client.containers.get(container_id)
+        except docker.errors.NotFound:
+            raise ResourceNotFoundError(resource_type="Container", resource_id=container_id)
+        
+        # Get container stats (single point, no streaming)
+        stats = container.stats(stream=False)
+        
+        return stats, time.perf_counter() - started
+    
+    def _build_instance_datapoints(
+        self,
+        instance: Instance,
+        stats: Dict,
+        timestamp: datetime
+    ) -> List[Dict[str, Any]]:
+        """Turn a Docker stats sample into AWS/EC2 datapoints for an instance."""
+        dimensions = {
+            "InstanceId": instance.instance_id,
+            "InstanceType": instance.instance_type
+        }
+        
+        values = [
+            ("CPUUtilization", self._calculate_cpu_percent(stats), "Percent"),
+            ("MemoryUtilization", self._calculate_memory_percent(stats), "Percent"),
+            ("NetworkIn", self._get_network_bytes_in(stats), "Bytes"),
+            ("NetworkOut", self._get_network_bytes_out(stats), "Bytes"),
+            ("DiskReadBytes", self._get_disk_read_bytes(stats), "Bytes"),
+            ("DiskWriteBytes", self._get_disk_write_bytes(stats), "Bytes"),
+        ]
+        
+        return [
+            {
+                "namespace": "AWS/EC2",
+                "metric_name": metric_name,
+                "dimensions": dimensions,
+                "unit": unit,
+                "value": value,
+                "timestamp": timestamp
+            }
+            for metric_name, value, unit in values
+        ]
+    
     # ==================== Helper Methods ====================
     
     def _calculate_cpu_percent(self, stats: Dict) -> float:
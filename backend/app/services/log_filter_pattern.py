@@ -0,0 +1,382 @@
+"""
+CloudWatch Logs Filter Patterns
+Compiles filter patterns into a message predicate and an inverted-index plan
+
+Supported syntax:
+- Terms and quoted phrases, all of which must match: ``ERROR "connection refused"``
+- Optional terms, at least one of which must match: ``?ERROR ?WARN``
+- Excluded terms: ``ERROR -healthcheck``
+- JSON predicates: ``{ $.level = "ERROR" && ($.latency > 500 || $.user.id NOT EXISTS) }``
+  with ``= != < > <= >=``, ``*`` wildcards in string values, ``IS TRUE``,
+  ``IS FALSE``, ``IS NULL`` and ``NOT EXISTS``
+
+Terms match whole tokens (runs of letters, digits and underscores) and are
+case sensitive, like CloudWatch.
+"""
+import json
+import re
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from app.core.exceptions import ValidationError
+
+
+# Runs of characters that make up an indexed token
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+
+# Longer tokens are not indexed (and cannot narrow a search)
+MAX_TERM_LENGTH = 255
+
+# Index plan: ("term", token) | ("and", [plans]) | ("or", [plans]); None = no restriction
+IndexPlan = Optional[Tuple[str, Any]]
+
+_MISSING = object()
+
+
+def tokenize(text: str) -> Set[str]:
+    """Distinct indexable tokens in ``text``."""
+    return {
+        token for token in TOKEN_PATTERN.findall(text)
+        if len(token) <= MAX_TERM_LENGTH
+    }
+
+
+def _plan_and(plans: List[IndexPlan]) -> IndexPlan:
+    """Intersect plans; unrestricted members are dropped."""
+    plans = [plan for plan in plans if plan is not None]
+    if not plans:
+        return None
+    if len(plans) == 1:
+        return plans[0]
+    return ("and", plans)
+
+
+def _plan_or(plans: List[IndexPlan]) -> IndexPlan:
+    """Union plans; any unrestricted member makes the union unrestricted."""
+    if not plans or any(plan is None for plan in plans):
+        return None
+    if len(plans) == 1:
+        return plans[0]
+    return ("or", plans)
+
+
+def _text_plan(text: str) -> IndexPlan:
+    """Plan requiring every token of ``text``."""
+    return _plan_and([("term", token) for token in sorted(tokenize(text))])
+
+
+# ==================== Text Patterns ====================
+
+class _Term:
+    """A bare term or quoted phrase."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+
+    def matches(self, message: str, message_tokens: Set[str]) -> bool:
+        return self.tokens <= message_tokens and self.text in message
+
+
+def _split_text_pattern(pattern: str) -> List[Tuple[str, str]]:
+    """Split a text pattern into (modifier, text) pairs, honoring quotes."""
+    parts = []
+    position = 0
+
+    while position < len(pattern):
+        char = pattern[position]
+        if char.isspace():
+            position += 1
+            continue
+
+        modifier = ""
+        if char in "?-":
+            modifier = char
+            position += 1
+            if position >= len(pattern) or pattern[position].isspace():
+                raise ValidationError(f"Dangling '{modifier}' in filter pattern")
+
+        if pattern[position] == '"':
+            end = pattern.find('"', position + 1)
+            if end == -1:
+                raise ValidationError("Unterminated quoted phrase in filter pattern")
+            text = pattern[position + 1:end]
+            position = end + 1
+        else:
+            end = position
+            while end < len(pattern) and not pattern[end].isspace():
+                end += 1
+            text = pattern[position:end]
+            position = end
+
+        if text:
+            parts.append((modifier, text))
+
+    return parts
+
+
+# ==================== JSON Patterns ====================
+
+_JSON_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<selector>\$(?:\.[A-Za-z0-9_\-]+|\[\d+\])*)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<op>&&|\|\||!=|<=|>=|=|<|>|\(|\))
+      | (?P<word>[A-Za-z0-9_\-\.\*:/]+)
+    )
+    """,
+    re.VERBOSE
+)
+
+_PATH_PART = re.compile(r"\.([A-Za-z0-9_\-]+)|\[(\d+)\]")
+
+
+def _lex_json_pattern(body: str) -> List[Tuple[str, str]]:
+    """Split the inside of ``{ ... }`` into (kind, text) tokens."""
+    tokens = []
+    position = 0
+    body = body.rstrip()
+
+    while position < len(body):
+        match = _JSON_TOKEN.match(body, position)
+        if not match or match.end() == position:
+            raise ValidationError(f"Invalid filter pattern near '{body[position:position + 20]}'")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+
+    return tokens
+
+
+def _resolve_path(document: Any, selector: str) -> Any:
+    """Follow a ``$.a.b[0]`` selector; returns _MISSING when absent."""
+    value = document
+    for key, index in _PATH_PART.findall(selector):
+        if key:
+            if not isinstance(value, dict) or key not in value:
+                return _MISSING
+            value = value[key]
+        else:
+            position = int(index)
+            if not isinstance(value, list) or position >= len(value):
+                return _MISSING
+            value = value[position]
+    return value
+
+
+def _wildcard_regex(value: str) -> "re.Pattern":
+    """Compile a string value where ``*`` matches any run of characters."""
+    return re.compile("^" + ".*".join(re.escape(part) for part in value.split("*")) + "$", re.DOTALL)
+
+
+class _JsonPatternParser:
+    """Recursive-descent parser producing (predicate, index plan) pairs."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def parse(self) -> Tuple[Callable[[Any], bool], IndexPlan]:
+        result = self._or_expr()
+        if self.position != len(self.tokens):
+            raise ValidationError(f"Unexpected '{self.tokens[self.position][1]}' in filter pattern")
+        return result
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise ValidationError("Unexpected end of filter pattern")
+        self.position += 1
+        return token
+
+    def _expect_word(self, *words: str) -> str:
+        kind, text = self._next()
+        if kind != "word" or text.upper() not in words:
+            raise ValidationError(f"Expected {' or '.join(words)} in filter pattern, got '{text}'")
+        return text.upper()
+
+    def _or_expr(self):
+        operands = [self._and_expr()]
+        while self._peek() == ("op", "||"):
+            self._next()
+            operands.append(self._and_expr())
+
+        if len(operands) == 1:
+            return operands[0]
+        predicates = [predicate for predicate, _ in operands]
+        return (
+            lambda document: any(predicate(document) for predicate in predicates),
+            _plan_or([plan for _, plan in operands])
+        )
+
+    def _and_expr(self):
+        operands = [self._primary()]
+        while self._peek() == ("op", "&&"):
+            self._next()
+            operands.append(self._primary())
+
+        if len(operands) == 1:
+            return operands[0]
+        predicates = [predicate for predicate, _ in operands]
+        return (
+            lambda document: all(predicate(document) for predicate in predicates),
+            _plan_and([plan for _, plan in operands])
+        )
+
+    def _primary(self):
+        if self._peek() == ("op", "("):
+            self._next()
+            result = self._or_expr()
+            if self._next() != ("op", ")"):
+                raise ValidationError("Missing ')' in filter pattern")
+            return result
+        return self._comparison()
+
+    def _comparison(self):
+        kind, selector = self._next()
+        if kind != "selector":
+            raise ValidationError(f"Expected a $ selector in filter pattern, got '{selector}'")
+
+        kind, text = self._next()
+
+        if kind == "word" and text.upper() == "IS":
+            expected = self._expect_word("TRUE", "FALSE", "NULL")
+            target = {"TRUE": True, "FALSE": False, "NULL": None}[expected]
+            return (
+                lambda document: _resolve_path(document, selector) is target,
+                None
+            )
+
+        if kind == "word" and text.upper() == "NOT":
+            self._expect_word("EXISTS")
+            return (
+                lambda document: _resolve_path(document, selector) is _MISSING,
+                None
+            )
+
+        if kind != "op" or text not in ("=", "!=", "<", ">", "<=", ">="):
+            raise ValidationError(f"Expected a comparison operator in filter pattern, got '{text}'")
+        operator = text
+
+        value_kind, raw_value = self._next()
+        if value_kind == "number":
+            return self._numeric_comparison(selector, operator, float(raw_value))
+        if value_kind == "string":
+            value = json.loads(raw_value)
+        elif value_kind == "word":
+            value = raw_value
+        else:
+            raise ValidationError(f"Expected a value in filter pattern, got '{raw_value}'")
+
+        if operator not in ("=", "!="):
+            raise ValidationError(f"Operator '{operator}' requires a numeric value")
+        return self._string_comparison(selector, operator, value)
+
+    def _numeric_comparison(self, selector: str, operator: str, value: float):
+        compare = {
+            "=": lambda actual: actual == value,
+            "!=": lambda actual: actual != value,
+            "<": lambda actual: actual < value,
+            ">": lambda actual: actual > value,
+            "<=": lambda actual: actual <= value,
+            ">=": lambda actual: actual >= value
+        }[operator]
+
+        def predicate(document):
+            actual = _resolve_path(document, selector)
+            if isinstance(actual, bool) or not isinstance(actual, (int, float)):
+                return False
+            return compare(actual)
+
+        return predicate, None
+
+    def _string_comparison(self, selector: str, operator: str, value: str):
+        pattern = _wildcard_regex(value) if "*" in value else None
+
+        def equals(actual):
+            if actual is _MISSING or isinstance(actual, (dict, list)):
+                return False
+            text = actual if isinstance(actual, str) else json.dumps(actual)
+            return pattern.match(text) is not None if pattern else text == value
+
+        if operator == "=":
+            keys = _PATH_PART.findall(selector)
+            field = keys[-1][0] if keys else ""
+            # Only values stored verbatim in the raw JSON can be looked up by token
+            literal = all(json.dumps(text)[1:-1] == text for text in (value, field))
+            plan = _plan_and([_text_plan(value), _text_plan(field)]) if literal and not pattern else None
+            return lambda document: equals(_resolve_path(document, selector)), plan
+
+        return (
+            lambda document: (
+                _resolve_path(document, selector) is not _MISSING
+                and not equals(_resolve_path(document, selector))
+            ),
+            None
+        )
+
+
+# ==================== Compiled Pattern ====================
+
+class FilterPattern:
+    """
+    A compiled filter pattern.
+
+    ``matches(message)`` is the exact predicate; ``plan`` is a conservative
+    set of tokens (possibly None) every matching message must contain,
+    used to narrow candidates through the inverted index first.
+    """
+
+    def __init__(self, pattern: Optional[str]):
+        self.pattern = (pattern or "").strip()
+        self.plan: IndexPlan = None
+        self._json_predicate: Optional[Callable[[Any], bool]] = None
+        self._required: List[_Term] = []
+        self._optional: List[_Term] = []
+        self._excluded: List[_Term] = []
+
+        if self.pattern.startswith("{"):
+            self._compile_json()
+        elif self.pattern:
+            self._compile_text()
+
+    def _compile_json(self):
+        if not self.pattern.endswith("}"):
+            raise ValidationError("JSON filter pattern must end with '}'")
+        tokens = _lex_json_pattern(self.pattern[1:-1])
+        if not tokens:
+            raise ValidationError("Empty JSON filter pattern")
+        self._json_predicate, self.plan = _JsonPatternParser(tokens).parse()
+
+    def _compile_text(self):
+        groups = {"": self._required, "?": self._optional, "-": self._excluded}
+        for modifier, text in _split_text_pattern(self.pattern):
+            groups[modifier].append(_Term(text))
+
+        plans = [_text_plan(term.text) for term in self._required]
+        if self._optional:
+            plans.append(_plan_or([_text_plan(term.text) for term in self._optional]))
+        self.plan = _plan_and(plans)
+
+    def matches(self, message: str) -> bool:
+        """Check whether ``message`` matches the pattern."""
+        if self._json_predicate is not None:
+            try:
+                document = json.loads(message)
+            except ValueError:
+                return False
+            return self._json_predicate(document)
+
+        if not self.pattern:
+            return True
+
+        tokens = tokenize(message)
+        if not all(term.matches(message, tokens) for term in self._required):
+            return False
+        if self._optional and not any(term.matches(message, tokens) for term in self._optional):
+            return False
+        return not any(term.matches(message, tokens) for term in self._excluded)
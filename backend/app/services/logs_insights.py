@@ -0,0 +1,810 @@
+"""
+CloudWatch Logs Insights
+Query parser, planner and streaming operators
+
+A query is a pipeline of commands separated by ``|``:
+
+    fields @timestamp, @message
+    | parse @message "user=* status=*" as user, status
+    | filter status >= 500 and @logStream like "web-"
+    | stats count(*) as errors, avg(latency) by bin(5m), user
+    | sort errors desc
+    | limit 20
+
+Supported commands: ``fields``, ``display``, ``filter``, ``parse`` (glob
+or regex with named groups), ``stats`` (count, count_distinct, sum, avg,
+min, max; grouped by fields and ``bin(<n><s|m|h|d>)``), ``sort`` and
+``limit``. Each command is a generator over record dicts, so rows stream
+from the database through the pipeline and a trailing ``limit`` stops
+the scan early.
+"""
+import functools
+import heapq
+import itertools
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.exceptions import ValidationError
+
+
+# Results returned when neither the query nor the caller sets a limit
+DEFAULT_RESULT_LIMIT = 1000
+MAX_RESULT_LIMIT = 10000
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_AGGREGATES = ("count", "count_distinct", "sum", "avg", "min", "max")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+# ==================== Lexer ====================
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<regex>/(?:[^/\\]|\\.)*/)
+      | (?P<number>-?\d+(?:\.\d+)?[a-z]*)
+      | (?P<op>=~|!=|<=|>=|=|<|>|\(|\)|,|\*|\||\[|\])
+      | (?P<name>@?[A-Za-z_][A-Za-z0-9_.\-]*)
+    )
+    """,
+    re.VERBOSE
+)
+
+
+def _lex(text: str) -> List[Tuple[str, str]]:
+    """Split a query string into (kind, text) tokens."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ValidationError(f"Unexpected character in query near '{text[position:position + 20]}'")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+
+    return tokens
+
+
+def _unquote(token: str) -> str:
+    """Decode a quoted string token."""
+    body = token[1:-1]
+    return re.sub(r"\\(.)", r"\1", body)
+
+
+def _compile_regex(token: str) -> "re.Pattern":
+    """Compile a /regex/ token; (?<name>...) groups are accepted."""
+    source = token[1:-1].replace("\\/", "/")
+    source = re.sub(r"\(\?<([A-Za-z_][A-Za-z0-9_]*)>", r"(?P<\1>", source)
+    try:
+        return re.compile(source)
+    except re.error as e:
+        raise ValidationError(f"Invalid regular expression {token}: {e}")
+
+
+# ==================== Values ====================
+
+def _number(value: Any) -> Optional[float]:
+    """Interpret a value as a number, or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def render_value(value: Any) -> str:
+    """Format a field value the way Insights results present it."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _flatten(document: Any, prefix: str, into: Dict[str, Any]):
+    """Flatten nested JSON into dotted field names."""
+    if isinstance(document, dict):
+        for key, value in document.items():
+            _flatten(value, f"{prefix}{key}.", into)
+        return
+    if isinstance(document, list):
+        for index, value in enumerate(document):
+            _flatten(value, f"{prefix}{index}.", into)
+        return
+    into[prefix[:-1]] = document
+
+
+def field_value(record: Dict[str, Any], name: str) -> Any:
+    """
+    Look up a field, discovering JSON message fields on first miss.
+
+    Like Insights, a JSON ``@message`` exposes its keys as fields
+    (nested keys joined with dots).
+    """
+    if name in record:
+        return record[name]
+
+    if "_json" not in record:
+        discovered: Dict[str, Any] = {}
+        message = record.get("@message")
+        if isinstance(message, str) and message.lstrip().startswith("{"):
+            try:
+                _flatten(json.loads(message), "", discovered)
+            except ValueError:
+                pass
+        record["_json"] = discovered
+
+    return record["_json"].get(name)
+
+
+def _compare(left: Any, operator: str, right: Any) -> bool:
+    """Compare two values, numerically when both sides are numeric."""
+    if left is None or right is None:
+        return operator == "!=" and (left is None) != (right is None)
+
+    left_number, right_number = _number(left), _number(right)
+    if left_number is not None and right_number is not None:
+        left, right = left_number, right_number
+    elif isinstance(left, datetime) or isinstance(right, datetime):
+        left, right = render_value(left), render_value(right)
+    else:
+        left, right = str(left), str(right)
+
+    if operator == "=":
+        return left == right
+    if operator == "!=":
+        return left != right
+    if operator == "<":
+        return left < right
+    if operator == ">":
+        return left > right
+    if operator == "<=":
+        return left <= right
+    return left >= right
+
+
+def _sort_rank(value: Any) -> Tuple[int, Any]:
+    """Total order over mixed values: numbers, then strings, then missing."""
+    if value is None:
+        return (2, "")
+    if isinstance(value, datetime):
+        return (0, (value - _EPOCH).total_seconds())
+    number = _number(value)
+    if number is not None:
+        return (0, number)
+    return (1, str(value))
+
+
+# ==================== Expressions ====================
+
+# An expression is compiled to a function of the record
+Expression = Callable[[Dict[str, Any]], Any]
+
+
+class _Parser:
+    """Token cursor shared by the command and expression parsers."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Optional[Tuple[str, str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValidationError("Unexpected end of query")
+        self.position += 1
+        return token
+
+    def accept(self, kind: str, text: Optional[str] = None) -> bool:
+        token = self.peek()
+        if token and token[0] == kind and (text is None or token[1].lower() == text):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind: str, text: Optional[str] = None) -> str:
+        token = self.next()
+        if token[0] != kind or (text is not None and token[1].lower() != text):
+            raise ValidationError(f"Expected '{text or kind}' in query, got '{token[1]}'")
+        return token[1]
+
+    def field(self) -> str:
+        return self.expect("name")
+
+    def alias(self, default: str) -> str:
+        if self.accept("name", "as"):
+            return self.field()
+        return default
+
+    # ---- Boolean expressions ----
+
+    def expression(self) -> Tuple[Expression, List[Tuple[str, str, Any]]]:
+        """
+        Parse a filter expression.
+
+        Returns the compiled predicate and its top-level AND conjuncts of
+        the form (field, operator, literal), which the planner may push
+        into SQL.
+        """
+        conjuncts: List[Tuple[str, str, Any]] = []
+        predicate = self._or(conjuncts)
+        return predicate, conjuncts
+
+    def _or(self, conjuncts):
+        operands = [self._and(conjuncts)]
+        while self.accept("name", "or"):
+            operands.append(self._and(None))
+        if len(operands) == 1:
+            return operands[0]
+        # Nothing under an OR can be pushed down
+        conjuncts.clear()
+        return lambda record: any(operand(record) for operand in operands)
+
+    def _and(self, conjuncts):
+        operands = [self._not(conjuncts)]
+        while self.accept("name", "and"):
+            operands.append(self._not(conjuncts))
+        if len(operands) == 1:
+            return operands[0]
+        return lambda record: all(operand(record) for operand in operands)
+
+    def _not(self, conjuncts):
+        if self.accept("name", "not"):
+            operand = self._not(None)
+            return lambda record: not operand(record)
+        return self._comparison(conjuncts)
+
+    def _comparison(self, conjuncts):
+        token = self.peek()
+        if token == ("op", "("):
+            self.next()
+            inner_conjuncts: List[Tuple[str, str, Any]] = []
+            inner = self._or(inner_conjuncts)
+            self.expect("op", ")")
+            if conjuncts is not None:
+                conjuncts.extend(inner_conjuncts)
+            return inner
+
+        if token and token[0] == "name" and token[1].lower() == "ispresent" and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect("op", "(")
+            name = self.field()
+            self.expect("op", ")")
+            return lambda record: field_value(record, name) is not None
+
+        left, left_field = self._operand()
+
+        negate = self.accept("name", "not")
+
+        kind, text = self.peek() or ("", "")
+        lowered = text.lower()
+
+        if (kind == "name" and lowered == "like") or (kind == "op" and text == "=~"):
+            self.next()
+            pattern_kind, pattern = self.next()
+            if pattern_kind == "regex":
+                regex = _compile_regex(pattern)
+
+                def match(value):
+                    return value is not None and regex.search(str(value)) is not None
+            elif pattern_kind == "string":
+                needle = _unquote(pattern)
+
+                def match(value):
+                    return value is not None and needle in str(value)
+
+                if conjuncts is not None and left_field and not negate:
+                    conjuncts.append((left_field, "like", needle))
+            else:
+                raise ValidationError(f"Expected a string or /regex/ after like, got '{pattern}'")
+            if negate:
+                return lambda record: not match(left(record))
+            return lambda record: match(left(record))
+
+        if kind == "name" and lowered == "in":
+            self.next()
+            self.expect("op", "[")
+            values = []
+            while not self.accept("op", "]"):
+                values.append(self._literal())
+                self.accept("op", ",")
+            if conjuncts is not None and left_field and not negate:
+                conjuncts.append((left_field, "in", values))
+
+            def contained(record):
+                return any(_compare(left(record), "=", value) for value in values)
+
+            if negate:
+                return lambda record: not contained(record)
+            return contained
+
+        if negate:
+            raise ValidationError("Expected 'like' or 'in' after 'not'")
+
+        if kind == "op" and text in ("=", "!=", "<", ">", "<=", ">="):
+            self.next()
+            right, right_field = self._operand()
+            if conjuncts is not None and text == "=" and left_field and right_field is None:
+                conjuncts.append((left_field, "=", right({})))
+            return lambda record: _compare(left(record), text, right(record))
+
+        # Bare operand: truthiness
+        return lambda record: bool(left(record))
+
+    def _literal(self) -> Any:
+        kind, text = self.next()
+        if kind == "string":
+            return _unquote(text)
+        if kind == "number":
+            return float(text)
+        raise ValidationError(f"Expected a literal in query, got '{text}'")
+
+    def _operand(self) -> Tuple[Expression, Optional[str]]:
+        """Parse a field reference or literal; returns (getter, field name or None)."""
+        kind, text = self.next()
+        if kind == "string":
+            value = _unquote(text)
+            return (lambda record: value), None
+        if kind == "number":
+            if not re.fullmatch(r"-?\d+(?:\.\d+)?", text):
+                raise ValidationError(f"Unexpected '{text}' in expression")
+            value = float(text)
+            return (lambda record: value), None
+        if kind == "name":
+            lowered = text.lower()
+            if lowered in ("true", "false"):
+                value = lowered == "true"
+                return (lambda record: value), None
+            return (lambda record: field_value(record, text)), text
+        raise ValidationError(f"Unexpected '{text}' in expression")
+
+
+# ==================== Commands ====================
+
+class _Command:
+    """One pipeline stage."""
+
+    name = ""
+
+    def apply(self, records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class _Fields(_Command):
+    name = "fields"
+
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+
+    def apply(self, records):
+        # Fields only choose output columns; records keep every field
+        return records
+
+
+class _Filter(_Command):
+    name = "filter"
+
+    def __init__(self, predicate: Expression, conjuncts: List[Tuple[str, str, Any]]):
+        self.predicate = predicate
+        self.conjuncts = conjuncts
+
+    def apply(self, records):
+        predicate = self.predicate
+        for record in records:
+            if predicate(record):
+                yield record
+
+
+class _Parse(_Command):
+    name = "parse"
+
+    def __init__(self, source: str, regex: "re.Pattern", names: List[str]):
+        self.source = source
+        self.regex = regex
+        self.names = names
+
+    def apply(self, records):
+        for record in records:
+            value = field_value(record, self.source)
+            match = self.regex.search(str(value)) if value is not None else None
+            if match:
+                if self.names:
+                    for name, extracted in zip(self.names, match.groups()):
+                        record[name] = extracted
+                else:
+                    record.update(match.groupdict())
+            yield record
+
+
+class _Stats(_Command):
+    name = "stats"
+
+    def __init__(
+        self,
+        aggregates: List[Tuple[str, str, Optional[str]]],
+        groups: List[Tuple[str, Optional[int], Optional[str]]]
+    ):
+        # aggregates: (output name, function, field or None for *)
+        # groups: (output name, bin seconds or None, field)
+        self.aggregates = aggregates
+        self.groups = groups
+
+    @property
+    def columns(self) -> List[str]:
+        return [name for name, _, _ in self.groups] + [name for name, _, _ in self.aggregates]
+
+    def _group_key(self, record) -> Tuple:
+        key = []
+        for _, period, source in self.groups:
+            if period is not None:
+                timestamp = record["@timestamp"]
+                seconds = int((timestamp - _EPOCH).total_seconds())
+                key.append(_EPOCH + timedelta(seconds=seconds - seconds % period))
+            else:
+                key.append(field_value(record, source))
+        return tuple(key)
+
+    def apply(self, records):
+        # Per group: one accumulator per aggregate
+        groups: Dict[Tuple, List[Any]] = {}
+
+        for record in records:
+            key = self._group_key(record)
+            accumulators = groups.get(key)
+            if accumulators is None:
+                accumulators = groups[key] = [
+                    set() if function == "count_distinct" else [0, 0.0, None, None]
+                    for _, function, _ in self.aggregates
+                ]
+
+            for accumulator, (_, function, source) in zip(accumulators, self.aggregates):
+                if source is None:
+                    accumulator[0] += 1
+                    continue
+
+                value = field_value(record, source)
+                if value is None:
+                    continue
+
+                if function == "count_distinct":
+                    accumulator.add(render_value(value))
+                    continue
+
+                accumulator[0] += 1
+                if function == "count":
+                    continue
+
+                number = _number(value)
+                if function in ("min", "max") and number is None:
+                    rank = _sort_rank(value)
+                    if accumulator[2] is None or rank < _sort_rank(accumulator[2]):
+                        accumulator[2] = value
+                    if accumulator[3] is None or rank > _sort_rank(accumulator[3]):
+                        accumulator[3] = value
+                    continue
+                if number is None:
+                    continue
+
+                accumulator[1] += number
+                if accumulator[2] is None or _sort_rank(number) < _sort_rank(accumulator[2]):
+                    accumulator[2] = number
+                if accumulator[3] is None or _sort_rank(number) > _sort_rank(accumulator[3]):
+                    accumulator[3] = number
+
+        for key in sorted(groups, key=lambda k: tuple(_sort_rank(v) for v in k)):
+            row = {name: value for (name, _, _), value in zip(self.groups, key)}
+            for accumulator, (name, function, _) in zip(groups[key], self.aggregates):
+                if function == "count_distinct":
+                    row[name] = len(accumulator)
+                elif function == "count":
+                    row[name] = accumulator[0]
+                elif function == "sum":
+                    row[name] = accumulator[1]
+                elif function == "avg":
+                    row[name] = accumulator[1] / accumulator[0] if accumulator[0] else None
+                elif function == "min":
+                    row[name] = accumulator[2]
+                else:
+                    row[name] = accumulator[3]
+            yield row
+
+
+class _Sort(_Command):
+    name = "sort"
+
+    def __init__(self, keys: List[Tuple[str, bool]]):
+        # keys: (field, descending)
+        self.keys = keys
+        self.top: Optional[int] = None  # Set by the planner when a limit follows
+        self.presorted = False  # Set by the planner when the scan already yields this order
+
+    def _compare(self, left, right) -> int:
+        for name, descending in self.keys:
+            a = _sort_rank(field_value(left, name))
+            b = _sort_rank(field_value(right, name))
+            if a == b:
+                continue
+            # Missing values sort last in either direction
+            if a[0] == 2 or b[0] == 2:
+                return 1 if a[0] == 2 else -1
+            result = -1 if a < b else 1
+            return -result if descending else result
+        return 0
+
+    def apply(self, records):
+        if self.presorted:
+            return records
+        key = functools.cmp_to_key(self._compare)
+        if self.top is not None:
+            return iter(heapq.nsmallest(self.top, records, key=key))
+        return iter(sorted(records, key=key))
+
+
+class _Limit(_Command):
+    name = "limit"
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def apply(self, records):
+        return itertools.islice(records, self.count)
+
+
+def _glob_to_regex(pattern: str) -> "re.Pattern":
+    """Compile a parse glob: each ``*`` captures a lazy run of characters."""
+    parts = [re.escape(part) for part in pattern.split("*")]
+    return re.compile("(.*?)".join(parts[:-1]) + ("(.*)" if len(parts) > 1 else "") + parts[-1], re.DOTALL)
+
+
+def _parse_duration(text: str) -> int:
+    match = re.fullmatch(r"(\d+)([smhd])", text)
+    if not match:
+        raise ValidationError(f"Invalid bin period '{text}' (use e.g. 30s, 5m, 1h, 1d)")
+    return int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def _parse_command(parser: _Parser) -> _Command:
+    keyword = parser.expect("name").lower()
+
+    if keyword in ("fields", "display"):
+        columns = [parser.field()]
+        while parser.accept("op", ","):
+            columns.append(parser.field())
+        command = _Fields(columns)
+        command.name = keyword
+        return command
+
+    if keyword == "filter":
+        predicate, conjuncts = parser.expression()
+        return _Filter(predicate, conjuncts)
+
+    if keyword == "parse":
+        source = parser.field()
+        kind, text = parser.next()
+        if kind == "regex":
+            regex = _compile_regex(text)
+            if parser.accept("name", "as"):
+                raise ValidationError("parse with a regex names fields with (?<name>...) groups")
+            if not regex.groupindex:
+                raise ValidationError("parse regex needs at least one (?<name>...) group")
+            return _Parse(source, regex, [])
+        if kind != "string":
+            raise ValidationError("parse expects a \"glob *\" string or a /regex/")
+        regex = _glob_to_regex(_unquote(text))
+        parser.expect("name", "as")
+        names = [parser.field()]
+        while parser.accept("op", ","):
+            names.append(parser.field())
+        if len(names) != regex.groups:
+            raise ValidationError(f"parse pattern has {regex.groups} wildcards but {len(names)} names")
+        return _Parse(source, regex, names)
+
+    if keyword == "stats":
+        aggregates = []
+        while True:
+            function = parser.expect("name").lower()
+            if function not in _AGGREGATES:
+                raise ValidationError(f"Unsupported stats function '{function}'")
+            parser.expect("op", "(")
+            if parser.accept("op", "*"):
+                if function != "count":
+                    raise ValidationError(f"{function}(*) is not supported")
+                source = None
+            else:
+                source = parser.field()
+            parser.expect("op", ")")
+            default = f"{function}({source or '*'})"
+            aggregates.append((parser.alias(default), function, source))
+            if not parser.accept("op", ","):
+                break
+
+        groups = []
+        if parser.accept("name", "by"):
+            while True:
+                if parser.peek() and parser.peek()[1].lower() == "bin" and parser.peek(1) == ("op", "("):
+                    parser.next()
+                    parser.expect("op", "(")
+                    period_text = parser.expect("number")
+                    parser.expect("op", ")")
+                    period = _parse_duration(period_text)
+                    groups.append((parser.alias(f"bin({period_text})"), period, "@timestamp"))
+                else:
+                    source = parser.field()
+                    groups.append((parser.alias(source), None, source))
+                if not parser.accept("op", ","):
+                    break
+        return _Stats(aggregates, groups)
+
+    if keyword == "sort":
+        keys = []
+        while True:
+            name = parser.field()
+            descending = False
+            if parser.accept("name", "desc"):
+                descending = True
+            else:
+                parser.accept("name", "asc")
+            keys.append((name, descending))
+            if not parser.accept("op", ","):
+                break
+        return _Sort(keys)
+
+    if keyword == "limit":
+        count = parser.expect("number")
+        if not count.isdigit() or int(count) < 1:
+            raise ValidationError(f"Invalid limit '{count}'")
+        return _Limit(min(int(count), MAX_RESULT_LIMIT))
+
+    raise ValidationError(f"Unsupported query command '{keyword}'")
+
+
+# ==================== Query ====================
+
+class InsightsQuery:
+    """
+    A parsed and planned Insights query.
+
+    Planning extracts what SQL can answer cheaply: ``@logStream`` equality
+    and IN filters, ``@message like "text"`` substrings and, when the
+    pipeline sorts only by ``@timestamp`` ahead of a limit, the scan
+    direction. Pushed-down conditions are supersets; the pipeline still
+    applies every filter exactly.
+    """
+
+    def __init__(self, query_string: str):
+        if not query_string or not query_string.strip():
+            raise ValidationError("Query string is empty")
+
+        tokens = _lex(query_string)
+        self.commands: List[_Command] = []
+
+        segment: List[Tuple[str, str]] = []
+        for token in tokens + [("op", "|")]:
+            if token == ("op", "|"):
+                if not segment:
+                    raise ValidationError("Empty command in query")
+                parser = _Parser(segment)
+                self.commands.append(_parse_command(parser))
+                if not parser.at_end():
+                    raise ValidationError(f"Unexpected '{parser.peek()[1]}' in {self.commands[-1].name} command")
+                segment = []
+            else:
+                segment.append(token)
+
+        if sum(1 for command in self.commands if isinstance(command, _Stats)) > 1:
+            raise ValidationError("Only one stats command is supported")
+
+        self.stream_names: Optional[List[str]] = None
+        self.message_contains: List[str] = []
+        self.descending = False
+        self._plan()
+
+    def _plan(self):
+        """Derive SQL pushdowns and top-k sorts from the command list."""
+        for command in self.commands:
+            # Only filters ahead of anything that rewrites fields are pushed down
+            if isinstance(command, (_Parse, _Stats)):
+                break
+            if not isinstance(command, _Filter):
+                continue
+            for name, operator, value in command.conjuncts:
+                if name == "@logStream" and operator in ("=", "in"):
+                    values = [render_value(v) for v in (value if operator == "in" else [value])]
+                    if self.stream_names is None:
+                        self.stream_names = values
+                    else:
+                        self.stream_names = [v for v in self.stream_names if v in values]
+                elif name == "@message" and operator == "like":
+                    self.message_contains.append(value)
+
+        for index, command in enumerate(self.commands):
+            following = self.commands[index + 1] if index + 1 < len(self.commands) else None
+            if isinstance(command, _Sort) and isinstance(following, _Limit):
+                command.top = following.count
+
+        # A sort on @timestamp alone over raw records: scan in that order instead
+        for command in self.commands:
+            if isinstance(command, _Stats):
+                break
+            if isinstance(command, _Sort):
+                if len(command.keys) == 1 and command.keys[0][0] == "@timestamp":
+                    self.descending = command.keys[0][1]
+                    command.presorted = True
+                break
+
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """Output columns chosen by the last fields/display/stats command."""
+        columns = None
+        for command in self.commands:
+            if isinstance(command, _Stats):
+                columns = command.columns
+            elif isinstance(command, _Fields) and command.name in ("fields", "display"):
+                columns = command.columns
+        return columns
+
+    def run(
+        self,
+        records: Iterable[Dict[str, Any]],
+        limit: int = DEFAULT_RESULT_LIMIT
+    ) -> Tuple[List[List[Dict[str, str]]], int]:
+        """
+        Stream records through the pipeline.
+
+        Returns:
+            (result rows as [{"field", "value"}] lists, records matched)
+        """
+        matched = [0]
+
+        def count_matches(stream):
+            for record in stream:
+                matched[0] += 1
+                yield record
+
+        # Records matched = records surviving the last filter
+        last_filter = max(
+            (index for index, command in enumerate(self.commands) if isinstance(command, _Filter)),
+            default=-1
+        )
+
+        stream: Iterator[Dict[str, Any]] = iter(records)
+        if last_filter == -1:
+            stream = count_matches(stream)
+        for index, command in enumerate(self.commands):
+            stream = command.apply(stream)
+            if index == last_filter:
+                stream = count_matches(stream)
+
+        columns = self.columns
+        results = []
+        for row in itertools.islice(stream, min(limit, MAX_RESULT_LIMIT)):
+            names = columns or [name for name in row if not name.startswith("_")]
+            results.append([
+                {"field": name, "value": render_value(field_value(row, name))}
+                for name in names
+                if field_value(row, name) is not None
+            ])
+
+        return results, matched[0]
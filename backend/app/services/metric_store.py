@@ -0,0 +1,566 @@
+"""
+Metric Store
+Time-series storage engine for CloudWatch metrics.
+
+Raw datapoints stay in ``cloudwatch_metrics``; every write also folds the
+points into 1m/5m/1h rollups (sum, count, min, max) so statistics queries
+read a handful of pre-aggregated buckets instead of every raw row, and
+registers the series in ``metric_series`` so ListMetrics never scans
+datapoints.
+"""
+import hashlib
+import json
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.cloudwatch_metric import (
+    CloudWatchMetric,
+    CloudWatchMetricRollup,
+    MetricSeries,
+    MetricSeriesDimension
+)
+
+
+# Rollup resolutions in seconds, finest first
+ROLLUP_RESOLUTIONS = (60, 300, 3600)
+
+# Keys per IN (...) clause when batch-reading many series
+BATCH_LOOKUP_SIZE = 500
+
+# Upper bound on series ids remembered as already registered
+MAX_KNOWN_SERIES = 100000
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+# ==================== Series Helpers ====================
+
+def canonical_dimensions(dimensions: Optional[Dict[str, str]]) -> Optional[str]:
+    """Serialize dimensions with sorted keys so equal dimension sets compare equal."""
+    if not dimensions:
+        return None
+    return json.dumps(dimensions, sort_keys=True)
+
+
+def series_key(
+    account_id: str,
+    namespace: str,
+    metric_name: str,
+    dimensions: Optional[Dict[str, str]] = None
+) -> str:
+    """Stable sha256 identifier for an (account, namespace, metric name, dimensions) series."""
+    canonical = json.dumps(
+        {
+            "account_id": account_id,
+            "namespace": namespace,
+            "metric_name": metric_name,
+            "dimensions": dimensions or {}
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC, the storage format for metric timestamps."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def epoch_seconds(value: datetime) -> float:
+    """Seconds since the Unix epoch, treating naive datetimes as UTC."""
+    return (to_utc_naive(value) - _EPOCH).total_seconds()
+
+
+def bucket_start(value: datetime, resolution: int) -> datetime:
+    """Start of the rollup bucket of ``resolution`` seconds containing ``value``."""
+    epoch = int(epoch_seconds(value))
+    return _EPOCH + timedelta(seconds=epoch - epoch % resolution)
+
+
+def _upsert(db: Session, model):
+    """INSERT supporting ON CONFLICT for the session's dialect (PostgreSQL or SQLite)."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model.__table__)
+    return postgresql.insert(model.__table__)
+
+
+def least_greatest(db: Session):
+    """Two-argument min/max SQL functions for the session's dialect."""
+    if db.get_bind().dialect.name == "sqlite":
+        return func.min, func.max
+    return func.least, func.greatest
+
+
+# ==================== Columnar Chunk ====================
+
+class SeriesChunk:
+    """
+    Columnar block of aggregated samples.
+
+    Each row is (start, count, sum, min, max) where ``start`` is epoch seconds.
+    Raw datapoints are rows with a count of 1, so raw and rolled-up data bin
+    through the same code path. ``origin`` is the (possibly aligned) query
+    start that result periods are anchored at.
+    """
+
+    __slots__ = ("starts", "counts", "sums", "minimums", "maximums", "unit", "origin")
+
+    def __init__(self, origin: Optional[datetime] = None):
+        self.origin = origin
+        self.starts = array("d")
+        self.counts = array("q")
+        self.sums = array("d")
+        self.minimums = array("d")
+        self.maximums = array("d")
+        self.unit: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def append(
+        self,
+        start: datetime,
+        count: int,
+        total: float,
+        minimum: float,
+        maximum: float,
+        unit: str
+    ):
+        """Append one aggregated row."""
+        self.starts.append(epoch_seconds(start))
+        self.counts.append(count)
+        self.sums.append(total)
+        self.minimums.append(minimum)
+        self.maximums.append(maximum)
+        if self.unit is None:
+            self.unit = unit
+
+    def bin(self, origin: float, period: int) -> List[Tuple[int, int, float, float, float]]:
+        """
+        Aggregate rows into fixed periods anchored at ``origin``.
+
+        Single pass over the columns; returns (period index, count, sum, min, max)
+        sorted by period index.
+        """
+        indexes = [int((start - origin) // period) for start in self.starts]
+        bins: Dict[int, List[Any]] = {}
+
+        for row, index in enumerate(indexes):
+            agg = bins.get(index)
+            if agg is None:
+                bins[index] = [
+                    self.counts[row], self.sums[row],
+                    self.minimums[row], self.maximums[row]
+                ]
+            else:
+                agg[0] += self.counts[row]
+                agg[1] += self.sums[row]
+                if self.minimums[row] < agg[2]:
+                    agg[2] = self.minimums[row]
+                if self.maximums[row] > agg[3]:
+                    agg[3] = self.maximums[row]
+
+        return [(index, *bins[index]) for index in sorted(bins)]
+
+
+# ==================== Metric Store ====================
+
+class MetricStore:
+    """Write-time rollup and series index maintenance, rollup-aware reads."""
+
+    def __init__(self):
+        # Series ids confirmed to exist in metric_series
+        self._known_series: set = set()
+
+    def record(
+        self,
+        db: Session,
+        account_id: str,
+        datapoints: Iterable[Dict[str, Any]]
+    ):
+        """
+        Fold datapoints into rollup buckets.
+
+        Each datapoint is a dict with namespace, metric_name, dimensions, unit,
+        value and timestamp. Buckets are written with one INSERT ... ON
+        CONFLICT DO UPDATE that adds to existing aggregates in the database;
+        new series are registered in the series index. The caller owns the
+        commit.
+        """
+        pending: Dict[Tuple[str, int, datetime], Dict[str, Any]] = {}
+        series: Dict[str, Dict[str, Any]] = {}
+
+        for point in datapoints:
+            key = series_key(
+                account_id, point["namespace"], point["metric_name"], point.get("dimensions")
+            )
+            series.setdefault(key, point)
+            value = point["value"]
+            timestamp = to_utc_naive(point["timestamp"])
+
+            for resolution in ROLLUP_RESOLUTIONS:
+                bucket_id = (key, resolution, bucket_start(timestamp, resolution))
+                agg = pending.get(bucket_id)
+                if agg is None:
+                    pending[bucket_id] = {
+                        "namespace": point["namespace"],
+                        "metric_name": point["metric_name"],
+                        "dimensions": canonical_dimensions(point.get("dimensions")),
+                        "unit": point["unit"],
+                        "sample_count": 1,
+                        "sum": value,
+                        "minimum": value,
+                        "maximum": value
+                    }
+                else:
+                    agg["sample_count"] += 1
+                    agg["sum"] += value
+                    agg["minimum"] = min(agg["minimum"], value)
+                    agg["maximum"] = max(agg["maximum"], value)
+
+        if not pending:
+            return
+
+        self._register_series(db, account_id, series)
+
+        # Merge into existing buckets in the database, so concurrent writers
+        # add to each other's totals instead of overwriting them. Rows are
+        # sorted by key so concurrent batches lock buckets in the same order.
+        rows = [
+            dict(
+                account_id=account_id,
+                series_key=key,
+                resolution=resolution,
+                period_start=period_start,
+                **agg
+            )
+            for (key, resolution, period_start), agg in sorted(pending.items())
+        ]
+
+        rollups = CloudWatchMetricRollup.__table__
+        least, greatest = least_greatest(db)
+        statement = _upsert(db, CloudWatchMetricRollup)
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                rollups.c.account_id,
+                rollups.c.series_key,
+                rollups.c.resolution,
+                rollups.c.period_start
+            ],
+            set_={
+                "sample_count": rollups.c.sample_count + statement.excluded.sample_count,
+                "sum": rollups.c.sum + statement.excluded.sum,
+                "minimum": least(rollups.c.minimum, statement.excluded.minimum),
+                "maximum": greatest(rollups.c.maximum, statement.excluded.maximum)
+            }
+        )
+        db.execute(statement, rows)
+
+    def _register_series(
+        self,
+        db: Session,
+        account_id: str,
+        series: Dict[str, Dict[str, Any]]
+    ):
+        """Insert index rows for series not yet present in metric_series."""
+        unknown = [key for key in series if key not in self._known_series]
+        if not unknown:
+            return
+
+        existing = {
+            row[0] for row in db.execute(
+                select(MetricSeries.series_id).where(MetricSeries.series_id.in_(unknown))
+            )
+        }
+
+        # Only ids confirmed by the database are cached; ids added here are
+        # confirmed on a later write, after this transaction has committed
+        if len(self._known_series) + len(existing) > MAX_KNOWN_SERIES:
+            self._known_series.clear()
+        self._known_series.update(existing)
+
+        series_rows = []
+        dimension_rows = []
+        now = datetime.utcnow()
+
+        for key in sorted(unknown):
+            if key in existing:
+                continue
+
+            point = series[key]
+            dimensions = point.get("dimensions") or {}
+
+            series_rows.append(dict(
+                series_id=key,
+                account_id=account_id,
+                namespace=point["namespace"],
+                metric_name=point["metric_name"],
+                dimensions=canonical_dimensions(dimensions),
+                created_at=now
+            ))
+            for name, value in dimensions.items():
+                dimension_rows.append(dict(
+                    series_id=key,
+                    name=name,
+                    value=value,
+                    account_id=account_id
+                ))
+
+        # A concurrent writer may register the same series first
+        if series_rows:
+            db.execute(_upsert(db, MetricSeries).on_conflict_do_nothing(), series_rows)
+        if dimension_rows:
+            db.execute(_upsert(db, MetricSeriesDimension).on_conflict_do_nothing(), dimension_rows)
+
+    def list_series(
+        self,
+        db: Session,
+        account_id: str,
+        namespace: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        dimensions: Optional[Dict[str, str]] = None
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Scan the series index.
+
+        ``dimensions`` is a partial filter: a series matches when it carries
+        every given (name, value) pair, whatever other dimensions it has.
+
+        Returns:
+            (namespace, metric_name, dimensions JSON) tuples
+        """
+        statement = select(
+            MetricSeries.namespace,
+            MetricSeries.metric_name,
+            MetricSeries.dimensions
+        ).where(MetricSeries.account_id == account_id)
+
+        if namespace:
+            statement = statement.where(MetricSeries.namespace == namespace)
+
+        if metric_name:
+            statement = statement.where(MetricSeries.metric_name == metric_name)
+
+        for name, value in (dimensions or {}).items():
+            statement = statement.where(
+                MetricSeries.series_id.in_(
+                    select(MetricSeriesDimension.series_id).where(
+                        MetricSeriesDimension.account_id == account_id,
+                        MetricSeriesDimension.name == name,
+                        MetricSeriesDimension.value == value
+                    )
+                )
+            )
+
+        statement = statement.order_by(MetricSeries.namespace, MetricSeries.metric_name)
+
+        return [tuple(row) for row in db.execute(statement)]
+
+    def select_resolution(self, start_time: datetime, period: int) -> Optional[int]:
+        """
+        Pick the coarsest rollup resolution usable for a query.
+
+        A resolution is usable when it divides the period; ``read`` aligns the
+        query start down to it, so no rollup bucket straddles two result periods.
+        """
+        for resolution in reversed(ROLLUP_RESOLUTIONS):
+            if period % resolution == 0:
+                return resolution
+        return None
+
+    def read(
+        self,
+        db: Session,
+        account_id: str,
+        namespace: str,
+        metric_name: str,
+        start_time: datetime,
+        end_time: datetime,
+        period: int,
+        dimensions: Optional[Dict[str, str]] = None
+    ) -> SeriesChunk:
+        """
+        Load the samples needed to answer a statistics query as one columnar chunk.
+
+        When a rollup resolution fits the period, the start is aligned down to
+        it (as CloudWatch rounds start times) and rollups are used for the
+        range up to the last whole bucket, so the result does not depend on
+        raw datapoints that retention may already have deleted. Raw datapoints
+        cover the unaligned tail, or the whole range if no resolution fits.
+        The chunk's ``origin`` is the effective start.
+        """
+        start = to_utc_naive(start_time)
+        end = to_utc_naive(end_time)
+
+        resolution = self.select_resolution(start, period)
+        if resolution is not None:
+            start = bucket_start(start, resolution)
+
+        chunk = SeriesChunk(origin=start)
+        raw_start = start
+
+        if resolution is not None:
+            rollup_end = bucket_start(end, resolution)
+            if rollup_end > start:
+                self._read_rollups(
+                    db, chunk, account_id, namespace, metric_name,
+                    resolution, start, rollup_end, dimensions
+                )
+                raw_start = rollup_end
+
+        if raw_start < end:
+            self._read_raw(
+                db, chunk, account_id, namespace, metric_name,
+                raw_start, end, dimensions
+            )
+
+        return chunk
+
+    def _read_rollups(
+        self,
+        db: Session,
+        chunk: SeriesChunk,
+        account_id: str,
+        namespace: str,
+        metric_name: str,
+        resolution: int,
+        start: datetime,
+        end: datetime,
+        dimensions: Optional[Dict[str, str]]
+    ):
+        """Append rollup buckets in [start, end) to ``chunk``."""
+        query = db.query(
+            CloudWatchMetricRollup.period_start,
+            CloudWatchMetricRollup.sample_count,
+            CloudWatchMetricRollup.sum,
+            CloudWatchMetricRollup.minimum,
+            CloudWatchMetricRollup.maximum,
+            CloudWatchMetricRollup.unit
+        ).filter(
+            CloudWatchMetricRollup.account_id == account_id,
+            CloudWatchMetricRollup.namespace == namespace,
+            CloudWatchMetricRollup.metric_name == metric_name,
+            CloudWatchMetricRollup.resolution == resolution,
+            CloudWatchMetricRollup.period_start >= start,
+            CloudWatchMetricRollup.period_start < end
+        )
+
+        if dimensions:
+            query = query.filter(
+                CloudWatchMetricRollup.series_key == series_key(
+                    account_id, namespace, metric_name, dimensions
+                )
+            )
+
+        for period_start, count, total, minimum, maximum, unit in query:
+            chunk.append(period_start, count, total, minimum, maximum, unit)
+
+    def _read_raw(
+        self,
+        db: Session,
+        chunk: SeriesChunk,
+        account_id: str,
+        namespace: str,
+        metric_name: str,
+        start: datetime,
+        end: datetime,
+        dimensions: Optional[Dict[str, str]]
+    ):
+        """Append raw datapoints in [start, end) to ``chunk``."""
+        query = db.query(
+            CloudWatchMetric.timestamp,
+            CloudWatchMetric.value,
+            CloudWatchMetric.unit
+        ).filter(
+            CloudWatchMetric.account_id == account_id,
+            CloudWatchMetric.namespace == namespace,
+            CloudWatchMetric.metric_name == metric_name,
+            CloudWatchMetric.timestamp >= start,
+            CloudWatchMetric.timestamp < end
+        )
+
+        if dimensions:
+            query = query.filter(
+                CloudWatchMetric.series_id == series_key(account_id, namespace, metric_name, dimensions)
+            )
+
+        for timestamp, value, unit in query:
+            chunk.append(timestamp, 1, value, value, value, unit)
+
+    def read_buckets(
+        self,
+        db: Session,
+        resolution: int,
+        since: datetime,
+        series: Iterable[Tuple[str, str]] = (),
+        metrics: Iterable[Tuple[str, str, str]] = ()
+    ) -> Dict[Tuple[str, ...], Dict[int, List[Any]]]:
+        """
+        Batch-read rollup buckets for many series at once.
+
+        ``series`` holds (account_id, series_key) pairs for exact-dimension
+        lookups; ``metrics`` holds (account_id, namespace, metric_name) triples
+        whose buckets are merged across every dimension set. Lookups are
+        issued in chunks of ``BATCH_LOOKUP_SIZE`` keys.
+
+        Returns:
+            Mapping of each requested key to {bucket start epoch: [count, sum, min, max]}
+        """
+        since = to_utc_naive(since)
+        result: Dict[Tuple[str, ...], Dict[int, List[Any]]] = {}
+
+        lookups = [
+            (
+                list(series),
+                (CloudWatchMetricRollup.account_id, CloudWatchMetricRollup.series_key)
+            ),
+            (
+                list(metrics),
+                (
+                    CloudWatchMetricRollup.account_id,
+                    CloudWatchMetricRollup.namespace,
+                    CloudWatchMetricRollup.metric_name
+                )
+            )
+        ]
+
+        for keys, key_columns in lookups:
+            for offset in range(0, len(keys), BATCH_LOOKUP_SIZE):
+                batch = keys[offset:offset + BATCH_LOOKUP_SIZE]
+                # Core select: plain rows, no ORM entity loading
+                statement = select(
+                    *key_columns,
+                    CloudWatchMetricRollup.period_start,
+                    CloudWatchMetricRollup.sample_count,
+                    CloudWatchMetricRollup.sum,
+                    CloudWatchMetricRollup.minimum,
+                    CloudWatchMetricRollup.maximum
+                ).where(
+                    tuple_(*key_columns).in_(batch),
+                    CloudWatchMetricRollup.resolution == resolution,
+                    CloudWatchMetricRollup.period_start >= since
+                )
+
+                width = len(key_columns)
+                for row in db.execute(statement):
+                    buckets = result.setdefault(tuple(row[:width]), {})
+                    period_start, count, total, minimum, maximum = row[width:]
+                    start = int(epoch_seconds(period_start))
+                    agg = buckets.get(start)
+                    if agg is None:
+                        buckets[start] = [count, total, minimum, maximum]
+                    else:
+                        agg[0] += count
+                        agg[1] += total
+                        agg[2] = min(agg[2], minimum)
+                        agg[3] = max(agg[3], maximum)
+
+        return result
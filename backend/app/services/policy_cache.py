@@ -0,0 +1,261 @@
+"""
+IAM Policy Compilation and Decision Cache
+Precompiled effective policies per principal and memoized authorization decisions
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.schemas.iam_policy import PolicyDocument, PolicyStatement
+from app.utils.wildcard import WildcardSet
+
+
+# Seconds a compiled policy set or decision is trusted. IAM changes made
+# through this process bump the policy version and take effect immediately;
+# this bounds staleness for changes made by other processes.
+IAM_POLICY_CACHE_TTL = 60.0
+
+# Most recent (principal, action, resource) decisions kept
+IAM_DECISION_CACHE_SIZE = 10000
+
+
+def parse_policy_documents(documents: Iterable[str]) -> List[PolicyDocument]:
+    """Parse policy JSON documents, skipping any that are not valid policies"""
+    policies = []
+    for document in documents:
+        try:
+            policies.append(PolicyDocument(**json.loads(document)))
+        except (json.JSONDecodeError, ValueError, TypeError):
+            pass  # Invalid policy, skip
+    return policies
+
+
+def action_services(patterns: Iterable[str]) -> Optional[frozenset]:
+    """
+    Service prefixes (lowercase) that action patterns can match
+
+    Returns:
+        Set of prefixes, or None when a pattern has a wildcard in its
+        service part (e.g. "*" or "ec*:Describe*") and may match any service
+    """
+    services = set()
+    for pattern in patterns:
+        service, separator, _ = pattern.partition(":")
+        if not separator or "*" in service or "?" in service:
+            return None
+        services.add(service.lower())
+    return frozenset(services)
+
+
+class CompiledStatement:
+    """Policy statement with its action and resource patterns precompiled"""
+
+    __slots__ = ("effect", "summary", "services", "actions", "resources")
+
+    def __init__(self, statement: PolicyStatement):
+        self.effect = statement.effect
+        # Service prefixes the actions can match (None: any service)
+        self.services = action_services(statement.action)
+        # Reported in PolicyEvaluationDecision.matching_statements
+        self.summary = {
+            "effect": statement.effect,
+            "sid": statement.sid,
+            "action": statement.action,
+            "resource": statement.resource
+        }
+        self.actions = WildcardSet(statement.action)
+        self.resources = WildcardSet(statement.resource)
+
+    def matches(self, action: str, resource: str) -> bool:
+        """Check if the statement applies to the requested action/resource"""
+        return self.actions.matches(action) and self.resources.matches(resource)
+
+
+class CompiledPolicySet:
+    """
+    A principal's effective policies compiled for evaluation
+
+    Statements of all documents are pooled by effect: any matching Deny
+    decides the result, otherwise every matching Allow is reported.
+    """
+
+    def __init__(self, documents: Iterable[PolicyDocument]):
+        statements = [
+            CompiledStatement(statement)
+            for document in documents
+            for statement in document.statement
+        ]
+        self.has_policies = bool(statements)
+        self.deny_statements = [s for s in statements if s.effect == "Deny"]
+        self.allow_statements = [s for s in statements if s.effect == "Allow"]
+
+    @classmethod
+    def from_json(cls, documents: Iterable[str]) -> "CompiledPolicySet":
+        """Compile raw policy JSON documents (invalid ones are skipped)"""
+        return cls(parse_policy_documents(documents))
+
+    def evaluate(self, action: str, resource: str) -> Tuple[Optional[str], List[CompiledStatement]]:
+        """
+        Evaluate the request against every statement
+
+        Returns:
+            Tuple of ("Deny", "Allow" or None, deciding statements)
+        """
+        denies = [s for s in self.deny_statements if s.matches(action, resource)]
+        if denies:
+            return ("Deny", denies)
+
+        allows = [s for s in self.allow_statements if s.matches(action, resource)]
+        if allows:
+            return ("Allow", allows)
+
+        return (None, [])
+
+    def simulate(
+        self,
+        actions: List[str],
+        resources: List[str]
+    ) -> Tuple[List[CompiledStatement], List[List[int]]]:
+        """
+        Evaluate every (action, resource) pair in one pass
+
+        Statements are indexed by service prefix, so each action is only
+        tested against statements that can apply to its service. Each
+        statement's resources are tested once per resource, and each cell
+        then only looks at the statements that matched its action.
+
+        Returns:
+            Tuple of (statements, matrix): matrix[i][j] is the index in
+            statements of the statement deciding actions[i] on
+            resources[j], or -1 for an implicit deny. A Deny statement is
+            reported when one matches, otherwise the first matching Allow.
+        """
+        statements = self.deny_statements + self.allow_statements
+
+        by_service: Dict[str, List[int]] = {}
+        any_service: List[int] = []
+        for index, statement in enumerate(statements):
+            if statement.services is None:
+                any_service.append(index)
+            else:
+                for service in statement.services:
+                    by_service.setdefault(service, []).append(index)
+
+        # Statements matching each action, in deny-first order
+        candidates: Dict[str, List[int]] = {}
+        action_matches = []
+        for action in actions:
+            service = action.partition(":")[0].lower()
+            if service not in candidates:
+                candidates[service] = sorted(by_service.get(service, []) + any_service)
+            action_matches.append([
+                index for index in candidates[service]
+                if statements[index].actions.matches(action)
+            ])
+
+        resource_matches: Dict[Tuple[int, int], bool] = {}
+        matrix = []
+        for matches in action_matches:
+            row = []
+            for column, resource in enumerate(resources):
+                decided = -1
+                for index in matches:
+                    key = (index, column)
+                    matched = resource_matches.get(key)
+                    if matched is None:
+                        matched = resource_matches[key] = statements[index].resources.matches(resource)
+                    if matched:
+                        decided = index
+                        break
+                row.append(decided)
+            matrix.append(row)
+
+        return statements, matrix
+
+
+class PolicyCache:
+    """
+    Compiled policy sets by principal and a bounded LRU of decisions
+
+    Every IAM change that can alter a principal's effective policies
+    (attach, detach, group membership, deletes) calls bump(), which
+    advances the policy version and drops both caches. Loads record the
+    version they started at, so a result computed from policies that
+    changed mid-load is never stored.
+    """
+
+    def __init__(
+        self,
+        ttl: float = IAM_POLICY_CACHE_TTL,
+        max_decisions: int = IAM_DECISION_CACHE_SIZE
+    ):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds an entry is used before it is recomputed
+            max_decisions: Decisions kept before the least recently used are evicted
+        """
+        self.ttl = ttl
+        self.max_decisions = max_decisions
+        self.version = 0
+        self._policies: Dict[str, Tuple[float, CompiledPolicySet]] = {}
+        self._decisions: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """Invalidate everything after a policy, attachment or membership change"""
+        with self._lock:
+            self.version += 1
+            self._policies.clear()
+            self._decisions.clear()
+
+    def get_policies(self, principal_id: str) -> Optional[CompiledPolicySet]:
+        """Compiled policy set of a principal, or None on a miss"""
+        entry = self._policies.get(principal_id)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def put_policies(self, principal_id: str, version: int, compiled: CompiledPolicySet):
+        """Store a policy set compiled from policies read at ``version``"""
+        with self._lock:
+            if version == self.version:
+                self._policies[principal_id] = (time.monotonic(), compiled)
+
+    def get_decision(self, principal_id: str, action: str, resource: str) -> Optional[Any]:
+        """Memoized decision for a request, or None on a miss"""
+        key = (principal_id, action, resource)
+        with self._lock:
+            entry = self._decisions.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._decisions[key]
+                return None
+            self._decisions.move_to_end(key)
+            return entry[1]
+
+    def put_decision(
+        self,
+        principal_id: str,
+        action: str,
+        resource: str,
+        version: int,
+        decision: Any
+    ):
+        """Memoize a decision made with policies read at ``version``"""
+        with self._lock:
+            if version != self.version:
+                return
+            self._decisions[(principal_id, action, resource)] = (time.monotonic(), decision)
+            self._decisions.move_to_end((principal_id, action, resource))
+            while len(self._decisions) > self.max_decisions:
+                self._decisions.popitem(last=False)
+
+
+# Shared by every request in the process
+policy_cache = PolicyCache()
@@ -3,19 +3,19 @@ IAM Policy Evaluation Engine
 AWS-like policy evaluation with proper precedence and wildcard matching
 """
 
-import json
-from typing import List, Optional, Literal
+from typing import Dict, Iterable, List, Optional, Literal
 from enum import Enum
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import select, literal, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.iam_user import User
-from app.models.iam_group import Group
+from app.models.iam_user import User, user_groups, user_policies
+from app.models.iam_group import Group, group_policies
 from app.models.iam_role import Role
 from app.models.iam_policy import Policy
 from app.schemas.iam_policy import PolicyDocument, PolicyStatement
+from app.services.policy_cache import CompiledPolicySet, parse_policy_documents, policy_cache
 from app.utils.wildcard import matches_action, matches_resource
 
 
@@ -125,68 +125,78 @@ class PolicyEvaluator:
         return (None, [])
     
     @staticmethod
-    async def get_user_policies(db: AsyncSession, user_id: str) -> List[PolicyDocument]:
+    async def get_policy_documents(
+        db: AsyncSession,
+        user_ids: Iterable[str]
+    ) -> Dict[str, List[str]]:
         """
-        Get all policies applicable to a user
+        Resolve the raw policy documents applicable to many users at once
         
-        Collects policies from:
+        One UNION ALL query collects, per user and in this order:
         - User inline policy
         - User attached policies
-        - Group attached policies (for all groups user belongs to)
+        - Group inline policies (for all groups the user belongs to)
+        - Group attached policies
+        
+        Relationships are never lazy-loaded, so the cost is a single
+        round-trip however many users, groups and policies are involved.
         
         Args:
             db: Database session
-            user_id: User ID
+            user_ids: User IDs
             
         Returns:
-            List of PolicyDocument objects
+            Dictionary mapping each user ID to its policy JSON documents
+            (users that do not exist map to an empty list)
         """
-        policies = []
+        user_ids = list(dict.fromkeys(user_ids))
+        documents = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return documents
+        
+        sources = union_all(
+            select(User.user_id, literal(0).label("source"), User.inline_policy.label("document"))
+            .where(User.user_id.in_(user_ids), User.inline_policy.is_not(None)),
+            
+            select(user_policies.c.user_id, literal(1), Policy.policy_document)
+            .join(Policy, Policy.policy_id == user_policies.c.policy_id)
+            .where(user_policies.c.user_id.in_(user_ids)),
+            
+            select(user_groups.c.user_id, literal(2), Group.inline_policy)
+            .join(Group, Group.group_id == user_groups.c.group_id)
+            .where(user_groups.c.user_id.in_(user_ids), Group.inline_policy.is_not(None)),
+            
+            select(user_groups.c.user_id, literal(3), Policy.policy_document)
+            .join(group_policies, group_policies.c.group_id == user_groups.c.group_id)
+            .join(Policy, Policy.policy_id == group_policies.c.policy_id)
+            .where(user_groups.c.user_id.in_(user_ids))
+        ).subquery()
         
-        # Get user with relationships
         result = await db.execute(
-            select(User).where(User.user_id == user_id)
+            select(sources.c.user_id, sources.c.document).order_by(sources.c.source)
         )
-        user = result.scalar_one_or_none()
+        for user_id, document in result:
+            documents[user_id].append(document)
         
-        if not user:
-            return policies
-        
-        # 1. User inline policy
-        if user.inline_policy:
-            try:
-                policy_dict = json.loads(user.inline_policy)
-                policies.append(PolicyDocument(**policy_dict))
-            except (json.JSONDecodeError, ValueError):
-                pass  # Invalid policy, skip
+        return documents
+    
+    @staticmethod
+    async def get_user_policies(db: AsyncSession, user_id: str) -> List[PolicyDocument]:
+        """
+        Get all policies applicable to a user
         
-        # 2. User attached policies
-        for policy in user.attached_policies:
-            try:
-                policy_dict = json.loads(policy.policy_document)
-                policies.append(PolicyDocument(**policy_dict))
-            except (json.JSONDecodeError, ValueError):
-                pass
+        See get_policy_documents for the sources. Documents that are not
+        valid policies are skipped.
         
-        # 3. Group policies
-        for group in user.groups:
-            # Group inline policy
-            if group.inline_policy:
-                try:
-                    policy_dict = json.loads(group.inline_policy)
-                    policies.append(PolicyDocument(**policy_dict))
-                except (json.JSONDecodeError, ValueError):
-                    pass
+        Args:
+            db: Database session
+            user_id: User ID
             
-            # Group attached policies
-            for policy in group.attached_policies:
-                try:
-                    policy_dict = json.loads(policy.policy_document)
-                    policies.append(PolicyDocument(**policy_dict))
-                except (json.JSONDecodeError, ValueError):
-                    pass
-        
-        return policies
+        Returns:
+            List of PolicyDocument objects
+        """
+        documents = await PolicyEvaluator.get_policy_documents(db, [user_id])
+        return parse_policy_documents(documents[user_id])
     
     @staticmethod
     async def evaluate(
@@ -203,6 +213,10 @@ class PolicyEvaluator:
         2. An explicit allow in any policy overrides the default deny
         3. An explicit deny in any policy overrides any allows
         
+        Decisions are memoized per (user, action, resource) and policies
+        are compiled once per user, both until the next IAM change (see
+        PolicyCache).
+        
         Args:
             db: Database session
             user_id: User making the request
@@ -227,55 +241,88 @@ class PolicyEvaluator:
                 # Deny action
                 raise PermissionError(decision.reason)
         """
-        # Get all applicable policies
-        policies = await PolicyEvaluator.get_user_policies(db, user_id)
+        # Warm path: a memoized decision
+        decision = policy_cache.get_decision(user_id, action, resource)
+        if decision is not None:
+            return decision
+        
+        # Read the version first, so results built from policies that
+        # change during the load are not cached
+        version = policy_cache.version
+        compiled = await PolicyEvaluator.get_compiled_policies(db, user_id, version)
+        decision = PolicyEvaluator.decide(compiled, action, resource)
+        
+        policy_cache.put_decision(user_id, action, resource, version, decision)
+        return decision
+    
+    @staticmethod
+    async def get_compiled_policies(
+        db: AsyncSession,
+        user_id: str,
+        version: Optional[int] = None
+    ) -> CompiledPolicySet:
+        """
+        Get a user's effective policies compiled for evaluation
+        
+        Served from the policy cache; on a miss the policies are loaded,
+        compiled once and cached until the next IAM change.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            version: Policy version read before the call (defaults to current)
+            
+        Returns:
+            CompiledPolicySet for the user
+        """
+        if version is None:
+            version = policy_cache.version
+        
+        compiled = policy_cache.get_policies(user_id)
+        if compiled is None:
+            documents = await PolicyEvaluator.get_policy_documents(db, [user_id])
+            compiled = CompiledPolicySet.from_json(documents[user_id])
+            policy_cache.put_policies(user_id, version, compiled)
         
-        if not policies:
+        return compiled
+    
+    @staticmethod
+    def decide(
+        compiled: CompiledPolicySet,
+        action: str,
+        resource: str
+    ) -> PolicyEvaluationDecision:
+        """
+        Evaluate a request against a compiled policy set
+        
+        AWS Evaluation Order:
+        1. Explicit Deny wins
+        2. Explicit Allow required
+        3. Default Deny (no matching Allow)
+        """
+        if not compiled.has_policies:
             return PolicyEvaluationDecision(
                 result=EvaluationResult.IMPLICIT_DENY,
                 reason="No policies attached to user",
                 matching_statements=[]
             )
         
-        # Track all matching statements
-        all_deny_statements = []
-        all_allow_statements = []
-        
-        # Evaluate each policy
-        for policy_doc in policies:
-            effect, statements = PolicyEvaluator.evaluate_policy_document(
-                policy_doc, action, resource
-            )
-            
-            if effect == "Deny":
-                all_deny_statements.extend(statements)
-            elif effect == "Allow":
-                all_allow_statements.extend(statements)
+        effect, statements = compiled.evaluate(action, resource)
         
-        # AWS Evaluation Order:
-        # 1. Explicit Deny wins
-        if all_deny_statements:
+        if effect == "Deny":
             return PolicyEvaluationDecision(
                 result=EvaluationResult.DENY,
                 reason=f"Explicit Deny found for action '{action}' on resource '{resource}'",
-                matching_statements=[
-                    {"effect": "Deny", "sid": stmt.sid, "action": stmt.action, "resource": stmt.resource}
-                    for stmt in all_deny_statements
-                ]
+                matching_statements=[stmt.summary for stmt in statements]
             )
         
-        # 2. Explicit Allow required
-        if all_allow_statements:
+        if effect == "Allow":
             return PolicyEvaluationDecision(
                 result=EvaluationResult.ALLOW,
                 reason=f"Explicit Allow found for action '{action}' on resource '{resource}'",
-                matching_statements=[
-                    {"effect": "Allow", "sid": stmt.sid, "action": stmt.action, "resource": stmt.resource}
-                    for stmt in all_allow_statements
-                ]
+                matching_statements=[stmt.summary for stmt in statements]
             )
         
-        # 3. Default Deny (no matching Allow)
         return PolicyEvaluationDecision(
             result=EvaluationResult.IMPLICIT_DENY,
             reason=f"No Allow statement found for action '{action}' on resource '{resource}'",
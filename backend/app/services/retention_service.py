@@ -0,0 +1,384 @@
+"""
+Retention Service
+Expires log events and metric datapoints past their retention period
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, func, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.cloudwatch_metric import CloudWatchMetric, CloudWatchMetricRollup
+from app.models.log_group import LogGroup
+from app.models.log_stream import LogStream, LogEvent, LogEventTerm
+from app.services.cloudwatch_logs_service import EVENT_OVERHEAD_BYTES
+from app.services.metric_store import BATCH_LOOKUP_SIZE, bucket_start, least_greatest
+
+
+# Days each rollup resolution is kept (CloudWatch's 1m/5m/1h schedule)
+ROLLUP_RETENTION_DAYS = {
+    60: 15,
+    300: 63,
+    3600: 455
+}
+
+# Resolution raw datapoints are downsampled into before they are dropped
+DOWNSAMPLE_RESOLUTION = 3600
+
+
+class RetentionService:
+    """
+    Service for retention enforcement.
+
+    Deletes in bounded batches ordered by the time index, committing after
+    each batch so no single transaction holds locks on a large range. Each
+    run stops after ``max_batches`` batches; whatever is left is picked up
+    by the next run.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 5000,
+        max_batches: int = 200,
+        raw_metric_retention_days: int = 15
+    ):
+        """
+        Initialize retention service.
+
+        Args:
+            batch_size: Rows deleted per batch
+            max_batches: Upper bound on batches per run
+            raw_metric_retention_days: Days raw datapoints are kept
+        """
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.raw_metric_retention_days = raw_metric_retention_days
+
+    def enforce_all(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Run one retention pass over logs and metrics.
+
+        Returns:
+            Counts of rows deleted (and hourly rollups rebuilt) in this pass
+        """
+        now = now or datetime.utcnow()
+        budget = [self.max_batches]
+
+        stats = {
+            "log_events_deleted": 0,
+            "metric_points_deleted": 0,
+            "rollups_deleted": 0,
+            "rollups_backfilled": 0
+        }
+
+        stats["log_events_deleted"] = self.enforce_log_retention(db, now, budget)
+
+        deleted, backfilled = self.enforce_metric_retention(db, now, budget)
+        stats["metric_points_deleted"] = deleted
+        stats["rollups_backfilled"] = backfilled
+
+        stats["rollups_deleted"] = self.enforce_rollup_retention(db, now, budget)
+
+        return stats
+
+    # ==================== Logs ====================
+
+    def enforce_log_retention(
+        self,
+        db: Session,
+        now: datetime,
+        budget: List[int]
+    ) -> int:
+        """
+        Delete log events older than their group's retention_in_days.
+
+        Keeps stored_bytes on streams and groups in step with the deleted
+        events, and moves each stream's first_event_timestamp forward.
+        """
+        groups = db.execute(
+            select(LogGroup.log_group_name, LogGroup.retention_in_days).where(
+                LogGroup.retention_in_days.is_not(None)
+            )
+        ).all()
+
+        total_deleted = 0
+
+        for log_group_name, retention_in_days in groups:
+            cutoff = now - timedelta(days=retention_in_days)
+            stream_ids = db.execute(
+                select(LogStream.stream_id).where(LogStream.log_group_name == log_group_name)
+            ).scalars().all()
+
+            if not stream_ids:
+                continue
+
+            touched: Set[str] = set()
+
+            while budget[0] > 0:
+                rows = db.execute(
+                    select(LogEvent.event_id, LogEvent.stream_id, LogEvent.message)
+                    .where(
+                        LogEvent.stream_id.in_(stream_ids),
+                        LogEvent.timestamp < cutoff
+                    )
+                    .order_by(LogEvent.timestamp)
+                    .limit(self.batch_size)
+                ).all()
+
+                if not rows:
+                    break
+
+                freed: Dict[str, int] = defaultdict(int)
+                for _, stream_id, message in rows:
+                    freed[stream_id] += len(message.encode('utf-8')) + EVENT_OVERHEAD_BYTES
+
+                event_ids = [row[0] for row in rows]
+                db.execute(delete(LogEventTerm).where(LogEventTerm.event_id.in_(event_ids)))
+                db.execute(delete(LogEvent).where(LogEvent.event_id.in_(event_ids)))
+
+                # Decrement in SQL so concurrent put_log_events increments are kept
+                streams = LogStream.__table__
+                log_groups = LogGroup.__table__
+                _, greatest = least_greatest(db)
+                db.execute(
+                    update(streams)
+                    .where(streams.c.stream_id == bindparam("freed_stream_id"))
+                    .values(stored_bytes=greatest(streams.c.stored_bytes - bindparam("freed_bytes"), 0)),
+                    [
+                        {"freed_stream_id": stream_id, "freed_bytes": freed_bytes}
+                        for stream_id, freed_bytes in sorted(freed.items())
+                    ]
+                )
+                db.execute(
+                    update(log_groups)
+                    .where(log_groups.c.log_group_name == log_group_name)
+                    .values(stored_bytes=greatest(log_groups.c.stored_bytes - sum(freed.values()), 0))
+                )
+
+                db.commit()
+
+                touched.update(freed.keys())
+                total_deleted += len(rows)
+                budget[0] -= 1
+
+                if len(rows) < self.batch_size:
+                    break
+
+            if touched:
+                self._refresh_first_event_timestamps(db, touched)
+
+            if budget[0] <= 0:
+                break
+
+        return total_deleted
+
+    def _refresh_first_event_timestamps(self, db: Session, stream_ids: Set[str]):
+        """Reset first_event_timestamp to the oldest remaining event of each stream."""
+        oldest = dict(db.execute(
+            select(LogEvent.stream_id, func.min(LogEvent.timestamp))
+            .where(LogEvent.stream_id.in_(stream_ids))
+            .group_by(LogEvent.stream_id)
+        ).all())
+
+        for stream in db.query(LogStream).filter(LogStream.stream_id.in_(stream_ids)):
+            stream.first_event_timestamp = oldest.get(stream.stream_id)
+
+        db.commit()
+
+    # ==================== Metrics ====================
+
+    def enforce_metric_retention(
+        self,
+        db: Session,
+        now: datetime,
+        budget: List[int]
+    ) -> Tuple[int, int]:
+        """
+        Delete raw datapoints older than the raw retention period.
+
+        The cutoff is aligned to the hour so whole hourly buckets expire
+        together. Every hour a batch touches must already have its hourly
+        rollup (written at ingest time); any that are missing are rebuilt
+        from the raw rows before those rows are deleted.
+
+        Returns:
+            (datapoints deleted, hourly rollups rebuilt)
+        """
+        cutoff = bucket_start(
+            now - timedelta(days=self.raw_metric_retention_days),
+            DOWNSAMPLE_RESOLUTION
+        )
+
+        total_deleted = 0
+        total_backfilled = 0
+
+        while budget[0] > 0:
+            rows = db.execute(
+                select(
+                    CloudWatchMetric.metric_id,
+                    CloudWatchMetric.account_id,
+                    CloudWatchMetric.series_id,
+                    CloudWatchMetric.timestamp
+                )
+                .where(CloudWatchMetric.timestamp < cutoff)
+                .order_by(CloudWatchMetric.timestamp)
+                .limit(self.batch_size)
+            ).all()
+
+            if not rows:
+                break
+
+            hours = {
+                (account_id, series_id, bucket_start(timestamp, DOWNSAMPLE_RESOLUTION))
+                for _, account_id, series_id, timestamp in rows
+                if series_id is not None
+            }
+            total_backfilled += self._ensure_hourly_rollups(db, hours)
+
+            db.execute(
+                delete(CloudWatchMetric).where(
+                    CloudWatchMetric.metric_id.in_([row[0] for row in rows])
+                )
+            )
+            db.commit()
+
+            total_deleted += len(rows)
+            budget[0] -= 1
+
+            if len(rows) < self.batch_size:
+                break
+
+        return total_deleted, total_backfilled
+
+    def _ensure_hourly_rollups(
+        self,
+        db: Session,
+        hours: Set[Tuple[str, str, datetime]]
+    ) -> int:
+        """
+        Rebuild missing hourly rollups from raw datapoints.
+
+        Args:
+            hours: (account_id, series_id, hour start) keys about to be deleted
+
+        Returns:
+            Number of rollups rebuilt
+        """
+        keys = list(hours)
+        missing = set(hours)
+
+        for offset in range(0, len(keys), BATCH_LOOKUP_SIZE):
+            batch = keys[offset:offset + BATCH_LOOKUP_SIZE]
+            existing = db.execute(
+                select(
+                    CloudWatchMetricRollup.account_id,
+                    CloudWatchMetricRollup.series_key,
+                    CloudWatchMetricRollup.period_start
+                ).where(
+                    CloudWatchMetricRollup.resolution == DOWNSAMPLE_RESOLUTION,
+                    tuple_(
+                        CloudWatchMetricRollup.account_id,
+                        CloudWatchMetricRollup.series_key,
+                        CloudWatchMetricRollup.period_start
+                    ).in_(batch)
+                )
+            )
+            missing.difference_update(tuple(row) for row in existing)
+
+        for account_id, series_id, hour in missing:
+            # Aggregate the whole hour, not just this batch's rows
+            row = db.execute(
+                select(
+                    CloudWatchMetric.namespace,
+                    CloudWatchMetric.metric_name,
+                    CloudWatchMetric.dimensions,
+                    func.min(CloudWatchMetric.unit),
+                    func.count(),
+                    func.sum(CloudWatchMetric.value),
+                    func.min(CloudWatchMetric.value),
+                    func.max(CloudWatchMetric.value)
+                )
+                .where(
+                    CloudWatchMetric.account_id == account_id,
+                    CloudWatchMetric.series_id == series_id,
+                    CloudWatchMetric.timestamp >= hour,
+                    CloudWatchMetric.timestamp < hour + timedelta(seconds=DOWNSAMPLE_RESOLUTION)
+                )
+                .group_by(
+                    CloudWatchMetric.namespace,
+                    CloudWatchMetric.metric_name,
+                    CloudWatchMetric.dimensions
+                )
+            ).first()
+
+            if row is None:
+                continue
+
+            namespace, metric_name, dimensions, unit, count, total, minimum, maximum = row
+            db.add(CloudWatchMetricRollup(
+                account_id=account_id,
+                series_key=series_id,
+                resolution=DOWNSAMPLE_RESOLUTION,
+                period_start=hour,
+                namespace=namespace,
+                metric_name=metric_name,
+                dimensions=dimensions,
+                unit=unit,
+                sample_count=count,
+                sum=total,
+                minimum=minimum,
+                maximum=maximum
+            ))
+
+        return len(missing)
+
+    def enforce_rollup_retention(
+        self,
+        db: Session,
+        now: datetime,
+        budget: List[int]
+    ) -> int:
+        """Delete rollup buckets older than their resolution's retention."""
+        total_deleted = 0
+
+        for resolution, days in ROLLUP_RETENTION_DAYS.items():
+            cutoff = now - timedelta(days=days)
+
+            while budget[0] > 0:
+                keys = db.execute(
+                    select(
+                        CloudWatchMetricRollup.account_id,
+                        CloudWatchMetricRollup.series_key,
+                        CloudWatchMetricRollup.period_start
+                    )
+                    .where(
+                        CloudWatchMetricRollup.resolution == resolution,
+                        CloudWatchMetricRollup.period_start < cutoff
+                    )
+                    .order_by(CloudWatchMetricRollup.period_start)
+                    .limit(min(self.batch_size, BATCH_LOOKUP_SIZE))
+                ).all()
+
+                if not keys:
+                    break
+
+                db.execute(
+                    delete(CloudWatchMetricRollup).where(
+                        CloudWatchMetricRollup.resolution == resolution,
+                        tuple_(
+                            CloudWatchMetricRollup.account_id,
+                            CloudWatchMetricRollup.series_key,
+                            CloudWatchMetricRollup.period_start
+                        ).in_([tuple(key) for key in keys])
+                    )
+                )
+                db.commit()
+
+                total_deleted += len(keys)
+                budget[0] -= 1
+
+                if len(keys) < min(self.batch_size, BATCH_LOOKUP_SIZE):
+                    break
+
+        return total_deleted
@@ -14,6 +14,8 @@ from app.models.bucket import Bucket
 from app.models.s3_object import S3Object
 from app.models.bucket_policy import BucketPolicy
 from app.core.resource_ids import generate_id, ResourceType
+from app.services.s3_bucket_policy import bucket_policy_cache
+from app.services.s3_bucket_stats import BucketStatsDelta
 from app.core.exceptions import ValidationError, ResourceNotFoundError, ConflictError
 
 
@@ -156,8 +158,16 @@ class S3AdvancedService:
                 f"Version '{version_id}' not found for object '{object_key}'"
             )
         
-        # Delete file if not a delete marker
-        if not s3_object.is_delete_marker:
+        stats = BucketStatsDelta(account_id, bucket_name)
+        stats.remove_rows([s3_object])
+        stats.apply(db)
+        
+        # Delete file if not a delete marker (shared blobs lose a reference)
+        released = []
+        if s3_object.blob_sha256:
+            from app.services.s3_blob_store import release_blobs
+            released = release_blobs(db, [s3_object.blob_sha256])
+        elif not s3_object.is_delete_marker:
             from pathlib import Path
             object_path = Path(s3_object.filesystem_path)
             if object_path.exists():
@@ -176,9 +186,20 @@ class S3AdvancedService:
             
             if next_version:
                 next_version.is_latest = True
+                next_version.noncurrent_since = None
+                
+                # The promoted version may sit behind the lifecycle cursors
+                db.query(Bucket).filter(
+                    Bucket.bucket_name == bucket_name,
+                    Bucket.account_id == account_id
+                ).update({"lifecycle_checkpoint": None})
         
         db.delete(s3_object)
         db.commit()
+        
+        if released:
+            from app.services.s3_blob_store import purge_blobs
+            purge_blobs(db, released)
     
     # Lifecycle Operations
     
@@ -232,8 +253,9 @@ class S3AdvancedService:
         # Validate rules
         self._validate_lifecycle_rules(rules)
         
-        # Store as JSON
+        # Store as JSON (progress of the previous rules no longer applies)
         bucket.lifecycle_rules = json.dumps(rules)
+        bucket.lifecycle_checkpoint = None
         db.commit()
         db.refresh(bucket)
         
@@ -255,6 +277,7 @@ class S3AdvancedService:
             raise ResourceNotFoundError(f"Bucket '{bucket_name}' not found")
         
         bucket.lifecycle_rules = None
+        bucket.lifecycle_checkpoint = None
         db.commit()
         db.refresh(bucket)
         
@@ -294,9 +317,14 @@ class S3AdvancedService:
         """
         Evaluate lifecycle rules and return actions to take.
         
+        Uses the same SQL predicates as the lifecycle executor
+        (S3LifecycleService), without changing anything.
+        
         Returns:
             Dict with 'expired' (objects to delete) and 'transitioned' (objects to move)
         """
+        from app.services.s3_lifecycle_service import expiration_conditions, transition_conditions
+        
         bucket = db.query(Bucket).filter(
             Bucket.bucket_name == bucket_name,
             Bucket.account_id == account_id
@@ -306,6 +334,7 @@ class S3AdvancedService:
             return {"expired": [], "transitioned": []}
         
         rules = json.loads(bucket.lifecycle_rules)
+        now = datetime.utcnow()
         expired = []
         transitioned = []
         
@@ -313,44 +342,40 @@ class S3AdvancedService:
             if rule["status"] != "Enabled":
                 continue
             
-            prefix = rule.get("prefix", "")
-            
-            # Get matching objects
-            query = db.query(S3Object).filter(
+            in_bucket = (
                 S3Object.bucket_name == bucket_name,
-                S3Object.account_id == account_id,
-                S3Object.is_latest == True
+                S3Object.account_id == account_id
             )
             
-            if prefix:
-                query = query.filter(S3Object.object_key.like(f"{prefix}%"))
-            
-            objects = query.all()
+            # Check expiration
+            if "expiration" in rule:
+                rows = db.query(S3Object.object_key, S3Object.version_id).filter(
+                    *in_bucket, *expiration_conditions(rule, now)
+                )
+                expired.extend(
+                    {
+                        "object_key": object_key,
+                        "version_id": version_id,
+                        "rule_id": rule["id"]
+                    }
+                    for object_key, version_id in rows
+                )
             
-            for obj in objects:
-                age_days = (datetime.utcnow() - obj.created_at).days
-                
-                # Check expiration
-                if "expiration" in rule:
-                    if age_days >= rule["expiration"].get("days", float('inf')):
-                        expired.append({
-                            "object_key": obj.object_key,
-                            "version_id": obj.version_id,
-                            "rule_id": rule["id"]
-                        })
-                
-                # Check transitions
-                if "transitions" in rule:
-                    for transition in rule["transitions"]:
-                        if age_days >= transition.get("days", float('inf')):
-                            if obj.storage_class != transition["storage_class"]:
-                                transitioned.append({
-                                    "object_key": obj.object_key,
-                                    "version_id": obj.version_id,
-                                    "from_class": obj.storage_class,
-                                    "to_class": transition["storage_class"],
-                                    "rule_id": rule["id"]
-                                })
+            # Check transitions
+            for storage_class, conditions in transition_conditions(rule, now):
+                rows = db.query(
+                    S3Object.object_key, S3Object.version_id, S3Object.storage_class
+                ).filter(*in_bucket, *conditions)
+                transitioned.extend(
+                    {
+                        "object_key": object_key,
+                        "version_id": version_id,
+                        "from_class": from_class,
+                        "to_class": storage_class,
+                        "rule_id": rule["id"]
+                    }
+                    for object_key, version_id, from_class in rows
+                )
         
         return {"expired": expired, "transitioned": transitioned}
     
@@ -402,6 +427,7 @@ class S3AdvancedService:
             existing_policy.updated_at = datetime.utcnow()
             db.commit()
             db.refresh(existing_policy)
+            bucket_policy_cache.put(bucket_name, policy_document)
             return existing_policy
         else:
             # Create new
@@ -419,6 +445,7 @@ class S3AdvancedService:
             db.add(policy)
             db.commit()
             db.refresh(policy)
+            bucket_policy_cache.put(bucket_name, policy_document)
             
             return policy
     
@@ -456,6 +483,7 @@ class S3AdvancedService:
         
         db.delete(policy)
         db.commit()
+        bucket_policy_cache.put(bucket_name, None)
     
     def _validate_policy_document(self, policy_doc: dict):
         """Validate bucket policy document."""
@@ -492,6 +520,10 @@ class S3AdvancedService:
         """
         Evaluate bucket policy to determine if action is allowed.
         
+        The policy is compiled once per version and cached in memory (see
+        s3_bucket_policy), so this is normally a dictionary lookup plus a
+        few set and regex matches.
+        
         Args:
             db: Database session
             bucket_name: Target bucket
@@ -502,84 +534,10 @@ class S3AdvancedService:
         Returns:
             True if allowed, False if denied
         """
-        policy = db.query(BucketPolicy).filter(
-            BucketPolicy.bucket_name == bucket_name
-        ).first()
+        policy = bucket_policy_cache.get(db, bucket_name)
         
-        if not policy:
+        if policy is None:
             # No policy = deny by default
             return False
         
-        policy_doc = json.loads(policy.policy_document)
-        
-        # Evaluate statements
-        explicit_deny = False
-        explicit_allow = False
-        
-        for statement in policy_doc["Statement"]:
-            # Check if principal matches
-            if not self._match_principal(statement["Principal"], principal_arn):
-                continue
-            
-            # Check if action matches
-            actions = statement["Action"] if isinstance(statement["Action"], list) else [statement["Action"]]
-            action_matches = any(self._match_action(a, action) for a in actions)
-            
-            if not action_matches:
-                continue
-            
-            # Check if resource matches
-            resources = statement["Resource"] if isinstance(statement["Resource"], list) else [statement["Resource"]]
-            resource_matches = any(self._match_resource(r, resource) for r in resources)
-            
-            if not resource_matches:
-                continue
-            
-            # Statement matches
-            if statement["Effect"] == "Deny":
-                explicit_deny = True
-            elif statement["Effect"] == "Allow":
-                explicit_allow = True
-        
-        # Explicit deny always wins
-        if explicit_deny:
-            return False
-        
-        # Otherwise allow if explicitly allowed
-        return explicit_allow
-    
-    def _match_principal(self, principal: dict, arn: str) -> bool:
-        """Check if principal matches ARN."""
-        if principal == "*":
-            return True
-        
-        if "AWS" in principal:
-            aws_principals = principal["AWS"] if isinstance(principal["AWS"], list) else [principal["AWS"]]
-            return arn in aws_principals or "*" in aws_principals
-        
-        return False
-    
-    def _match_action(self, pattern: str, action: str) -> bool:
-        """Check if action matches pattern (supports wildcards)."""
-        if pattern == "*" or pattern == "s3:*":
-            return True
-        
-        if "*" in pattern:
-            # Simple wildcard matching
-            prefix = pattern.split("*")[0]
-            return action.startswith(prefix)
-        
-        return pattern == action
-    
-    def _match_resource(self, pattern: str, resource: str) -> bool:
-        """Check if resource matches pattern (supports wildcards)."""
-        if pattern == "*":
-            return True
-        
-        if "*" in pattern:
-            # Simple wildcard matching
-            prefix = pattern.rstrip("*")
-            return resource.startswith(prefix)
-        
-        return pattern == resource
-
+        return policy.is_allowed(principal_arn, action, resource)
@@ -0,0 +1,159 @@
+"""
+S3 Blob Store
+
+Reference counting for content-addressed S3 object content. Blob files are
+written by S3Service; this module keeps the s3_blobs rows in step with the
+object rows that point at them.
+
+All functions except purge_blobs run inside the caller's transaction and
+never commit. On PostgreSQL, acquire_blob and purge_blobs serialize on a
+transaction-level advisory lock per digest, so a blob file is never
+unlinked while an upload that re-created its row is still uncommitted.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import select, update, delete, insert, bindparam, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.s3_blob import S3Blob
+
+
+def _lock_blob(db: Session, sha256: str):
+    """
+    Take the digest's advisory lock until the current transaction ends.
+
+    SQLite runs one writer at a time and has no advisory locks.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return
+    # The first 60 bits of the digest fit the signed 64-bit lock key
+    db.execute(select(func.pg_advisory_xact_lock(int(sha256[:15], 16))))
+
+
+def acquire_blob(
+    db: Session,
+    sha256: str,
+    md5: str,
+    size_bytes: int,
+    filesystem_path: Path
+) -> bool:
+    """
+    Add a reference to a blob, creating its row on first use.
+
+    Holds the digest's lock until the caller commits, so the caller can put
+    the file in place before a concurrent purge_blobs looks at it.
+
+    Returns:
+        True if the row was created (the caller must put the file in place),
+        False if the content was already stored
+    """
+    _lock_blob(db, sha256)
+
+    if reference_blob(db, sha256):
+        return False
+
+    try:
+        with db.begin_nested():
+            db.execute(insert(S3Blob).values(
+                sha256=sha256,
+                size_bytes=size_bytes,
+                md5=md5,
+                ref_count=1,
+                filesystem_path=str(filesystem_path)
+            ))
+    except IntegrityError:
+        # A concurrent upload of the same content created the row first
+        reference_blob(db, sha256)
+        return False
+
+    return True
+
+
+def reference_blob(db: Session, sha256: str) -> bool:
+    """
+    Add a reference to a blob that is already stored (e.g. for a copy).
+
+    Returns:
+        False if there is no such blob
+    """
+    return db.execute(
+        update(S3Blob).where(S3Blob.sha256 == sha256).values(ref_count=S3Blob.ref_count + 1)
+    ).rowcount > 0
+
+
+def release_blobs(db: Session, sha256s: Iterable[str]) -> list[tuple[str, str]]:
+    """
+    Drop one reference per entry (repeat a digest to drop several).
+
+    Rows whose count reaches zero are deleted; pass the result to
+    purge_blobs once the transaction has committed.
+
+    Returns:
+        (sha256, filesystem_path) of the blobs that are no longer referenced
+    """
+    counts = Counter(sha256s)
+    if not counts:
+        return []
+
+    blobs = S3Blob.__table__
+    db.execute(
+        update(blobs).where(blobs.c.sha256 == bindparam("blob_sha256")).values(
+            ref_count=blobs.c.ref_count - bindparam("released")
+        ),
+        [{"blob_sha256": sha256, "released": count} for sha256, count in counts.items()]
+    )
+
+    released = db.execute(
+        select(S3Blob.sha256, S3Blob.filesystem_path).where(
+            S3Blob.sha256.in_(counts.keys()),
+            S3Blob.ref_count <= 0
+        )
+    ).all()
+    if released:
+        db.execute(
+            delete(S3Blob).where(
+                S3Blob.sha256.in_([sha256 for sha256, _ in released]),
+                S3Blob.ref_count <= 0
+            )
+        )
+
+    return [tuple(row) for row in released]
+
+
+def purge_blobs(db: Session, released: list[tuple[str, str]]):
+    """
+    Unlink the files of released blobs after the release has committed.
+
+    Runs in its own transaction and commits it: each digest's lock is held
+    while its row is re-checked and its file unlinked, so an upload of the
+    same content either committed first (and its row is seen, leaving the
+    file alone) or re-creates the row and file after the unlink.
+    """
+    if not released:
+        return
+
+    sha256s = sorted({sha256 for sha256, _ in released})
+    try:
+        for sha256 in sha256s:
+            _lock_blob(db, sha256)
+
+        recreated = set(db.execute(
+            select(S3Blob.sha256).where(S3Blob.sha256.in_(sha256s))
+        ).scalars())
+
+        for sha256, filesystem_path in released:
+            if sha256 in recreated:
+                continue
+            try:
+                Path(filesystem_path).unlink(missing_ok=True)
+            except OSError:
+                # An orphaned blob file is harmless: storing the same content
+                # again replaces it
+                pass
+    finally:
+        # Release the locks
+        db.commit()
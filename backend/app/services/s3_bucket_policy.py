@@ -0,0 +1,132 @@
+"""
+S3 Bucket Policy Evaluation
+
+Bucket policies compiled into in-memory matchers, and a per-bucket cache of
+the compiled form so authorization does not read and parse the policy
+document on every request.
+"""
+import json
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.bucket_policy import BucketPolicy
+from app.utils.wildcard import WildcardSet
+
+
+# Seconds a cached policy is trusted. Policy changes made through this
+# process invalidate immediately; this bounds staleness for changes made by
+# other processes.
+BUCKET_POLICY_CACHE_TTL = 60.0
+
+
+def _as_list(value) -> list:
+    """Policy fields may be a single value or a list."""
+    return value if isinstance(value, list) else [value]
+
+
+class CompiledStatement:
+    """One policy statement with principals, actions and resources precompiled."""
+
+    __slots__ = ("effect", "any_principal", "principals", "actions", "resources")
+
+    def __init__(self, statement: dict):
+        self.effect = statement["Effect"]
+
+        principal = statement["Principal"]
+        aws_principals = []
+        if isinstance(principal, dict) and "AWS" in principal:
+            aws_principals = _as_list(principal["AWS"])
+        self.any_principal = principal == "*" or "*" in aws_principals
+        self.principals = frozenset(aws_principals)
+
+        # Actions are case-insensitive, resource ARNs (object keys) are not
+        self.actions = WildcardSet(_as_list(statement["Action"]), ignore_case=True)
+        self.resources = WildcardSet(_as_list(statement["Resource"]), ignore_case=False)
+
+    def matches(self, principal_arn: str, action: str, resource: str) -> bool:
+        return (
+            (self.any_principal or principal_arn in self.principals)
+            and self.actions.matches(action)
+            and self.resources.matches(resource)
+        )
+
+
+class CompiledBucketPolicy:
+    """
+    Bucket policy compiled for evaluation.
+
+    Deny statements are checked first, since any matching Deny decides the
+    result; otherwise the request is allowed if an Allow statement matches.
+    """
+
+    def __init__(self, policy_document: dict):
+        statements = [CompiledStatement(statement) for statement in policy_document["Statement"]]
+        self.deny_statements = [s for s in statements if s.effect == "Deny"]
+        self.allow_statements = [s for s in statements if s.effect == "Allow"]
+
+    def is_allowed(self, principal_arn: str, action: str, resource: str) -> bool:
+        """Evaluate the policy; anything not explicitly allowed is denied."""
+        for statement in self.deny_statements:
+            if statement.matches(principal_arn, action, resource):
+                return False
+
+        return any(
+            statement.matches(principal_arn, action, resource)
+            for statement in self.allow_statements
+        )
+
+
+class BucketPolicyCache:
+    """
+    Compiled bucket policies by bucket name.
+
+    Buckets without a policy are cached too (as None), so the common
+    no-policy case is also served from memory.
+    """
+
+    def __init__(self, ttl: float = BUCKET_POLICY_CACHE_TTL):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Seconds an entry is used before it is reloaded
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Optional[CompiledBucketPolicy]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, bucket_name: str) -> Optional[CompiledBucketPolicy]:
+        """Get the compiled policy of a bucket, loading it on a miss."""
+        entry = self._entries.get(bucket_name)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        policy_document = db.execute(
+            select(BucketPolicy.policy_document).where(BucketPolicy.bucket_name == bucket_name)
+        ).scalar()
+
+        compiled = CompiledBucketPolicy(json.loads(policy_document)) if policy_document else None
+        self._store(bucket_name, compiled)
+        return compiled
+
+    def put(self, bucket_name: str, policy_document: Optional[dict]):
+        """Cache a bucket's new policy (None once it is deleted)."""
+        compiled = CompiledBucketPolicy(policy_document) if policy_document else None
+        self._store(bucket_name, compiled)
+
+    def invalidate(self, bucket_name: str):
+        """Drop a bucket's entry so the next lookup reloads it."""
+        with self._lock:
+            self._entries.pop(bucket_name, None)
+
+    def _store(self, bucket_name: str, compiled: Optional[CompiledBucketPolicy]):
+        with self._lock:
+            self._entries[bucket_name] = (time.monotonic(), compiled)
+
+
+# Shared by every S3AdvancedService instance in the process
+bucket_policy_cache = BucketPolicyCache()
@@ -0,0 +1,195 @@
+"""
+S3 Bucket Stats
+
+Incrementally maintained object counts and byte totals per bucket, top-level
+prefix and storage class. Every operation that adds, removes or moves
+stored objects collects its changes in a BucketStatsDelta and applies it
+before committing, so the counters change in the same transaction as the
+object rows.
+
+All functions run inside the caller's transaction and never commit.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import select, update, delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.s3_bucket_stats import S3BucketStats
+
+
+# CloudWatch StorageType dimension per storage class
+STORAGE_TYPES = {
+    "STANDARD": "StandardStorage",
+    "STANDARD_IA": "StandardIAStorage",
+    "ONEZONE_IA": "OneZoneIAStorage",
+    "REDUCED_REDUNDANCY": "ReducedRedundancyStorage",
+    "INTELLIGENT_TIERING": "IntelligentTieringFAStorage",
+    "GLACIER_IR": "GlacierInstantRetrievalStorage",
+    "GLACIER": "GlacierStorage",
+    "DEEP_ARCHIVE": "DeepArchiveStorage",
+}
+
+
+def key_prefix(object_key: str) -> str:
+    """Top-level prefix of a key: up to and including the first "/", or ""."""
+    index = object_key.find("/")
+    return object_key[:index + 1] if index >= 0 else ""
+
+
+def storage_type(storage_class: str) -> str:
+    """CloudWatch StorageType dimension value of a storage class."""
+    return STORAGE_TYPES.get(
+        storage_class,
+        storage_class.title().replace("_", "") + "Storage"
+    )
+
+
+class BucketStatsDelta:
+    """
+    Pending counter changes for one bucket.
+
+    Rows passed to add_rows/remove_rows need object_key, storage_class,
+    size_bytes and is_delete_marker; delete markers are not counted.
+    """
+
+    def __init__(self, account_id: str, bucket_name: str):
+        self.account_id = account_id
+        self.bucket_name = bucket_name
+        self._changes: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, object_key: str, storage_class: str, size_bytes: int, count: int = 1):
+        """Count ``count`` objects of ``size_bytes`` in total."""
+        change = self._changes[(key_prefix(object_key), storage_class)]
+        change[0] += count
+        change[1] += size_bytes
+
+    def remove(self, object_key: str, storage_class: str, size_bytes: int):
+        """Uncount one object."""
+        self.add(object_key, storage_class, -size_bytes, count=-1)
+
+    def add_rows(self, rows: Iterable[Any]):
+        for row in rows:
+            if not row.is_delete_marker:
+                self.add(row.object_key, row.storage_class, row.size_bytes)
+
+    def remove_rows(self, rows: Iterable[Any]):
+        for row in rows:
+            if not row.is_delete_marker:
+                self.remove(row.object_key, row.storage_class, row.size_bytes)
+
+    def apply(self, db: Session):
+        """Write the changes (one UPDATE per touched prefix and storage class)."""
+        now = datetime.utcnow()
+
+        for (prefix, storage_class), (count, size_bytes) in self._changes.items():
+            if count == 0 and size_bytes == 0:
+                continue
+
+            key = dict(
+                account_id=self.account_id,
+                bucket_name=self.bucket_name,
+                prefix=prefix,
+                storage_class=storage_class
+            )
+            if _increment(db, key, count, size_bytes, now):
+                continue
+
+            try:
+                with db.begin_nested():
+                    db.execute(insert(S3BucketStats).values(
+                        **key,
+                        object_count=count,
+                        size_bytes=size_bytes,
+                        updated_at=now
+                    ))
+            except IntegrityError:
+                # A concurrent writer created the row first
+                _increment(db, key, count, size_bytes, now)
+
+        self._changes.clear()
+
+
+def _increment(db: Session, key: dict, count: int, size_bytes: int, now: datetime) -> bool:
+    """Add to an existing counter row; False if there is none yet."""
+    return db.execute(
+        update(S3BucketStats)
+        .where(*(getattr(S3BucketStats, column) == value for column, value in key.items()))
+        .values(
+            object_count=S3BucketStats.object_count + count,
+            size_bytes=S3BucketStats.size_bytes + size_bytes,
+            updated_at=now
+        )
+    ).rowcount > 0
+
+
+def delete_bucket_stats(db: Session, account_id: str, bucket_name: str):
+    """Drop every counter of a bucket (the bucket is being deleted)."""
+    db.execute(
+        delete(S3BucketStats).where(
+            S3BucketStats.account_id == account_id,
+            S3BucketStats.bucket_name == bucket_name
+        )
+    )
+
+
+def get_bucket_stats(db: Session, account_id: str, bucket_name: str) -> List[S3BucketStats]:
+    """Non-empty counter rows of a bucket, by prefix and storage class."""
+    return list(db.execute(
+        select(S3BucketStats).where(
+            S3BucketStats.account_id == account_id,
+            S3BucketStats.bucket_name == bucket_name,
+            S3BucketStats.object_count != 0
+        ).order_by(S3BucketStats.prefix, S3BucketStats.storage_class)
+    ).scalars())
+
+
+def storage_metric_points(db: Session, timestamp: datetime) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    AWS/S3 storage metrics of every bucket, grouped by account.
+
+    BucketSizeBytes is reported per StorageType and NumberOfObjects for
+    AllStorageTypes, as S3 does.
+    """
+    rows = db.execute(
+        select(
+            S3BucketStats.account_id,
+            S3BucketStats.bucket_name,
+            S3BucketStats.storage_class,
+            S3BucketStats.object_count,
+            S3BucketStats.size_bytes
+        )
+    ).all()
+
+    sizes = defaultdict(int)
+    counts = defaultdict(int)
+    for account_id, bucket_name, storage_class, object_count, size_bytes in rows:
+        sizes[(account_id, bucket_name, storage_class)] += size_bytes
+        counts[(account_id, bucket_name)] += object_count
+
+    points_by_account = defaultdict(list)
+
+    for (account_id, bucket_name, storage_class), size_bytes in sizes.items():
+        points_by_account[account_id].append({
+            "namespace": "AWS/S3",
+            "metric_name": "BucketSizeBytes",
+            "dimensions": {"BucketName": bucket_name, "StorageType": storage_type(storage_class)},
+            "unit": "Bytes",
+            "value": float(size_bytes),
+            "timestamp": timestamp
+        })
+
+    for (account_id, bucket_name), object_count in counts.items():
+        points_by_account[account_id].append({
+            "namespace": "AWS/S3",
+            "metric_name": "NumberOfObjects",
+            "dimensions": {"BucketName": bucket_name, "StorageType": "AllStorageTypes"},
+            "unit": "Count",
+            "value": float(object_count),
+            "timestamp": timestamp
+        })
+
+    return dict(points_by_account)
@@ -0,0 +1,291 @@
+"""
+S3 Lifecycle Service
+Executes bucket lifecycle rules: expiration, storage class transitions and
+noncurrent version expiration
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.bucket import Bucket
+from app.models.s3_object import S3Object
+from app.services.s3_bucket_stats import BucketStatsDelta
+from app.services.s3_service import S3Service
+
+
+class S3LifecycleService:
+    """
+    Service for lifecycle rule execution.
+
+    Every action is a query over the (account_id, bucket_name, is_latest,
+    created_at) or (account_id, bucket_name, noncurrent_since) index with
+    the age cutoff in the WHERE clause. Matching rows are processed in
+    batches ordered by that timestamp, and each bucket stores a cursor per
+    rule action in ``Bucket.lifecycle_checkpoint``, committed with the
+    batch. Rows only ever cross an age cutoff in timestamp order, so a
+    scan resumes from its cursor instead of rescanning rows it has already
+    handled. Each run stops after ``max_batches`` batches and the next run
+    continues with the bucket it stopped in.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        max_batches: int = 100,
+        s3_service: Optional[S3Service] = None
+    ):
+        """
+        Initialize lifecycle service.
+
+        Args:
+            batch_size: Objects processed per batch
+            max_batches: Upper bound on batches per run
+            s3_service: Service used to delete objects and their content
+        """
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.s3_service = s3_service or S3Service()
+        self._resume_from: Optional[Tuple[str, str]] = None
+
+    def apply_all(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Run one lifecycle pass over every bucket with lifecycle rules.
+
+        Returns:
+            Counts of objects expired, transitioned and noncurrent versions
+            expired in this pass
+        """
+        now = now or datetime.utcnow()
+        budget = [self.max_batches]
+
+        stats = {
+            "expired": 0,
+            "transitioned": 0,
+            "noncurrent_expired": 0
+        }
+
+        buckets = [
+            tuple(row) for row in db.execute(
+                select(Bucket.account_id, Bucket.bucket_name)
+                .where(Bucket.lifecycle_rules.is_not(None))
+                .order_by(Bucket.account_id, Bucket.bucket_name)
+            )
+        ]
+
+        # Start with the bucket the previous pass ran out of budget in
+        if self._resume_from is not None:
+            start = next(
+                (index for index, key in enumerate(buckets) if key >= self._resume_from),
+                0
+            )
+            buckets = buckets[start:] + buckets[:start]
+        self._resume_from = None
+
+        for account_id, bucket_name in buckets:
+            if budget[0] <= 0:
+                self._resume_from = (account_id, bucket_name)
+                break
+            self.apply_bucket(db, account_id, bucket_name, now, budget, stats)
+
+        return stats
+
+    def apply_bucket(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        now: datetime,
+        budget: List[int],
+        stats: Dict[str, int]
+    ):
+        """Apply every enabled rule of one bucket until the budget runs out."""
+        bucket = db.query(Bucket).filter(
+            Bucket.bucket_name == bucket_name,
+            Bucket.account_id == account_id
+        ).first()
+
+        if not bucket or not bucket.lifecycle_rules:
+            return
+
+        checkpoint = json.loads(bucket.lifecycle_checkpoint or "{}")
+
+        for rule in json.loads(bucket.lifecycle_rules):
+            if rule["status"] != "Enabled":
+                continue
+
+            if "expiration" in rule:
+                stats["expired"] += self._process(
+                    db, bucket, checkpoint, f"{rule['id']}/expiration",
+                    S3Object.created_at, expiration_conditions(rule, now),
+                    lambda rows: self.s3_service.delete_objects(
+                        db, account_id, bucket_name, [row.object_key for row in rows]
+                    ),
+                    budget
+                )
+
+            for index, (storage_class, conditions) in enumerate(transition_conditions(rule, now)):
+                stats["transitioned"] += self._process(
+                    db, bucket, checkpoint, f"{rule['id']}/transition/{index}",
+                    S3Object.created_at, conditions,
+                    lambda rows, storage_class=storage_class: self._transition(
+                        db, bucket, rows, storage_class
+                    ),
+                    budget
+                )
+
+            if "noncurrent_version_expiration" in rule:
+                stats["noncurrent_expired"] += self._process(
+                    db, bucket, checkpoint, f"{rule['id']}/noncurrent_expiration",
+                    S3Object.noncurrent_since, noncurrent_expiration_conditions(rule, now),
+                    lambda rows: self.s3_service.purge_object_rows(
+                        db, account_id, bucket_name, rows
+                    ),
+                    budget
+                )
+
+            if budget[0] <= 0:
+                return
+
+    def _process(
+        self,
+        db: Session,
+        bucket: Bucket,
+        checkpoint: dict,
+        checkpoint_key: str,
+        order_column,
+        conditions: list,
+        apply: Callable[[list], object],
+        budget: List[int]
+    ) -> int:
+        """
+        Run one rule action over its matching objects in bounded batches.
+
+        Batches are read in (order_column, object_id) order starting after
+        the action's cursor. The advanced cursor is staged on the bucket
+        before ``apply`` runs, so it is committed together with the batch.
+
+        Returns:
+            Number of objects processed
+        """
+        total = 0
+
+        while budget[0] > 0:
+            query = select(
+                S3Object.object_id,
+                order_column.label("position"),
+                S3Object.object_key,
+                S3Object.filesystem_path,
+                S3Object.blob_sha256,
+                S3Object.storage_class,
+                S3Object.size_bytes,
+                S3Object.is_delete_marker
+            ).where(
+                S3Object.account_id == bucket.account_id,
+                S3Object.bucket_name == bucket.bucket_name,
+                *conditions
+            )
+
+            cursor = checkpoint.get(checkpoint_key)
+            if cursor:
+                query = query.where(
+                    tuple_(order_column, S3Object.object_id)
+                    > tuple_(datetime.fromisoformat(cursor[0]), cursor[1])
+                )
+
+            rows = db.execute(
+                query.order_by(order_column, S3Object.object_id).limit(self.batch_size)
+            ).all()
+
+            if not rows:
+                break
+
+            checkpoint[checkpoint_key] = [rows[-1].position.isoformat(), rows[-1].object_id]
+            bucket.lifecycle_checkpoint = json.dumps(checkpoint)
+
+            apply(rows)
+
+            total += len(rows)
+            budget[0] -= 1
+
+            if len(rows) < self.batch_size:
+                break
+
+        return total
+
+    def _transition(self, db: Session, bucket: Bucket, rows: list, storage_class: str):
+        """Move a batch of objects (and their bucket stats) to a storage class."""
+        db.execute(
+            update(S3Object)
+            .where(S3Object.object_id.in_([row.object_id for row in rows]))
+            # A transition is not a modification
+            .values(storage_class=storage_class, last_modified=S3Object.last_modified)
+        )
+
+        stats = BucketStatsDelta(bucket.account_id, bucket.bucket_name)
+        stats.remove_rows(rows)
+        for row in rows:
+            if not row.is_delete_marker:
+                stats.add(row.object_key, storage_class, row.size_bytes)
+        stats.apply(db)
+        db.commit()
+
+
+# ==================== Rule predicates ====================
+
+def _prefix_conditions(rule: dict) -> list:
+    """Key prefix filter of a rule."""
+    prefix = rule.get("prefix") or ""
+    return [S3Object.object_key.startswith(prefix, autoescape=True)] if prefix else []
+
+
+def expiration_conditions(rule: dict, now: datetime) -> list:
+    """Current versions old enough to expire under ``rule``."""
+    return [
+        S3Object.is_latest == True,
+        S3Object.is_delete_marker == False,
+        S3Object.created_at < now - timedelta(days=rule["expiration"]["days"]),
+        *_prefix_conditions(rule)
+    ]
+
+
+def transition_conditions(rule: dict, now: datetime) -> List[Tuple[str, list]]:
+    """
+    Current versions due for each of ``rule``'s transitions.
+
+    Transitions are bracketed by age, so an object is only moved by the
+    latest transition it is old enough for.
+
+    Returns:
+        (storage class, conditions) per transition, youngest first
+    """
+    transitions = sorted(rule.get("transitions") or [], key=lambda transition: transition["days"])
+    result = []
+
+    for index, transition in enumerate(transitions):
+        conditions = [
+            S3Object.is_latest == True,
+            S3Object.is_delete_marker == False,
+            S3Object.storage_class != transition["storage_class"],
+            S3Object.created_at < now - timedelta(days=transition["days"]),
+            *_prefix_conditions(rule)
+        ]
+        if index + 1 < len(transitions):
+            conditions.append(
+                S3Object.created_at >= now - timedelta(days=transitions[index + 1]["days"])
+            )
+        result.append((transition["storage_class"], conditions))
+
+    return result
+
+
+def noncurrent_expiration_conditions(rule: dict, now: datetime) -> list:
+    """Noncurrent versions (and delete markers) old enough to expire under ``rule``."""
+    days = rule["noncurrent_version_expiration"]["noncurrent_days"]
+    return [
+        S3Object.is_latest == False,
+        S3Object.noncurrent_since < now - timedelta(days=days),
+        *_prefix_conditions(rule)
+    ]
@@ -7,25 +7,68 @@ Handles bucket and object CRUD operations, file uploads/downloads, and IAM integ
 
 import os
 import shutil
+import base64
 import hashlib
 import mimetypes
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, BinaryIO
 from datetime import datetime
-from sqlalchemy import select, func
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from sqlalchemy import select, func, case, literal, insert, update, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.bucket import Bucket
 from app.models.s3_object import S3Object
+from app.models.s3_multipart_upload import MultipartUpload, MultipartUploadPart
+from app.services.s3_blob_store import acquire_blob, reference_blob, release_blobs, purge_blobs
+from app.services.s3_bucket_policy import bucket_policy_cache
+from app.services.s3_bucket_stats import BucketStatsDelta, delete_bucket_stats, get_bucket_stats
+from app.models.s3_blob import S3Blob
+from app.config import settings
 from app.core.resource_ids import generate_id, ResourceType
 from app.core.exceptions import (
     ValidationError,
     ResourceNotFoundError,
     ConflictError,
-    StorageError
+    StorageError,
+    PreconditionFailedError
 )
 
 
+# Bytes read from an upload per write
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Per-bucket staging directory for in-progress writes (same filesystem as
+# the objects, so the final rename is atomic)
+STAGING_DIRECTORY = ".cloudsim-staging"
+
+# Root of the content-addressed blob tree (under base_path, alongside the
+# account directories)
+BLOB_DIRECTORY = ".blobs"
+
+# ioctl that reflinks a whole file (Linux; Btrfs, XFS and other CoW filesystems)
+FICLONE = 0x40049409
+
+# Concurrent file unlinks per DeleteObjects call
+UNLINK_MAX_WORKERS = 8
+
+# Appended to a common prefix to seek past every key under it (keys are
+# compared in code point order, see ``_listing_key``)
+PREFIX_SKIP_SUFFIX = "\U0010ffff"
+
+# Multipart upload limits (same as S3)
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_NUMBER = 10000
+
+
 class S3Service:
     """
     S3 Storage Service
@@ -35,6 +78,11 @@ class S3Service:
     Storage structure:
         /var/cloudsim/s3/{account_id}/{bucket_name}/{object_key}
     
+    With content-addressed storage enabled, object content is instead
+    stored once per distinct SHA-256 and shared by every key and version
+    with that content:
+        /var/cloudsim/s3/.blobs/{sha[0:2]}/{sha[2:4]}/{sha}
+    
     Features:
         - Bucket CRUD operations
         - Object upload/download/delete
@@ -71,14 +119,19 @@ class S3Service:
         )
     """
     
-    def __init__(self, base_path: str = "/var/cloudsim/s3"):
+    def __init__(self, base_path: str = "/var/cloudsim/s3", content_addressed: Optional[bool] = None):
         """
         Initialize S3 service.
         
         Args:
             base_path: Root directory for S3 storage
+            content_addressed: Store new object content in the deduplicated
+                blob store (defaults to S3_CONTENT_ADDRESSED_STORAGE)
         """
         self.base_path = Path(base_path)
+        if content_addressed is None:
+            content_addressed = settings.S3_CONTENT_ADDRESSED_STORAGE
+        self.content_addressed = content_addressed
         self._ensure_base_directory()
     
     def _ensure_base_directory(self):
@@ -130,6 +183,273 @@ class S3Service:
         """Get filesystem path for object."""
         return self._get_bucket_path(account_id, bucket_name) / object_key
     
+    def _get_staging_path(self, account_id: str, bucket_name: str) -> Path:
+        """Get the staging directory for in-progress writes to a bucket."""
+        return self._get_bucket_path(account_id, bucket_name) / STAGING_DIRECTORY
+    
+    def _get_blob_path(self, sha256: str) -> Path:
+        """Get filesystem path for a content-addressed blob."""
+        return self.base_path / BLOB_DIRECTORY / sha256[:2] / sha256[2:4] / sha256
+    
+    def _write_object_file(
+        self,
+        account_id: str,
+        bucket_name: str,
+        content: BinaryIO,
+        object_path: Path
+    ) -> tuple[int, str]:
+        """
+        Stream content into place in a single pass.
+        
+        Reads ``content`` in UPLOAD_CHUNK_SIZE chunks, hashing MD5 while
+        writing to a staging file in the bucket, fsyncs it and atomically
+        renames it to ``object_path``. Readers see either the previous file
+        or the complete new one, never a partial write.
+        
+        Returns:
+            Tuple of (size in bytes, ETag)
+        
+        Raises:
+            StorageError: If filesystem operation fails
+        """
+        temp_path, size_bytes, md5, _ = self._stage_content(account_id, bucket_name, content)
+        
+        try:
+            self._publish_staged_file(temp_path, object_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed to write object: {str(e)}")
+        
+        return size_bytes, md5
+    
+    def _write_blob(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        content: BinaryIO
+    ) -> tuple[Path, int, str, str]:
+        """
+        Stream content into the blob store in a single pass.
+        
+        Hashes MD5 and SHA-256 while staging the upload, then takes a
+        reference on the blob in the current transaction. Content that is
+        already stored is not written again.
+        
+        Returns:
+            Tuple of (blob path, size in bytes, ETag, SHA-256)
+        
+        Raises:
+            StorageError: If filesystem operation fails
+        """
+        temp_path, size_bytes, md5, sha256 = self._stage_content(
+            account_id, bucket_name, content, with_sha256=True
+        )
+        blob_path = self._store_blob(db, temp_path, sha256, md5, size_bytes)
+        return blob_path, size_bytes, md5, sha256
+    
+    def _stage_content(
+        self,
+        account_id: str,
+        bucket_name: str,
+        content: BinaryIO,
+        with_sha256: bool = False
+    ) -> tuple[Path, int, str, Optional[str]]:
+        """
+        Copy content to a fsynced staging file, hashing it on the way.
+        
+        Returns:
+            Tuple of (staging path, size in bytes, MD5, SHA-256 or None)
+        
+        Raises:
+            StorageError: If filesystem operation fails
+        """
+        temp_path = self._new_staging_file(account_id, bucket_name)
+        md5_hash = hashlib.md5()
+        sha256_hash = hashlib.sha256() if with_sha256 else None
+        size_bytes = 0
+        
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in iter(lambda: content.read(UPLOAD_CHUNK_SIZE), b""):
+                    md5_hash.update(chunk)
+                    if sha256_hash:
+                        sha256_hash.update(chunk)
+                    f.write(chunk)
+                    size_bytes += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed to write object: {str(e)}")
+        
+        return (
+            temp_path,
+            size_bytes,
+            md5_hash.hexdigest(),
+            sha256_hash.hexdigest() if sha256_hash else None
+        )
+    
+    def _store_blob(
+        self,
+        db: Session,
+        temp_path: Path,
+        sha256: str,
+        md5: str,
+        size_bytes: int
+    ) -> Path:
+        """
+        Take a reference on a blob, moving the staged file into the store.
+        
+        The staged file is published when the blob is new (or its file is
+        missing) and discarded otherwise.
+        
+        Returns:
+            Blob path
+        
+        Raises:
+            StorageError: If filesystem operation fails
+        """
+        blob_path = self._get_blob_path(sha256)
+        
+        try:
+            created = acquire_blob(db, sha256, md5, size_bytes, blob_path)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+        
+        try:
+            if created or not blob_path.exists():
+                self._publish_staged_file(temp_path, blob_path)
+            else:
+                temp_path.unlink()
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed to store object content: {str(e)}")
+        
+        return blob_path
+    
+    def _new_staging_file(self, account_id: str, bucket_name: str) -> Path:
+        """Reserve a unique path in the bucket's staging directory."""
+        staging_path = self._get_staging_path(account_id, bucket_name)
+        try:
+            staging_path.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            raise StorageError(f"Failed to create staging directory: {str(e)}")
+        return staging_path / uuid.uuid4().hex
+    
+    def _publish_staged_file(self, temp_path: Path, object_path: Path):
+        """Atomically move a fully written, fsynced staging file into place."""
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, object_path)
+        
+        # Persist the rename itself (not supported on Windows)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(object_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    
+    def _append_file(
+        self,
+        source_path: Path,
+        destination,
+        offset: int = 0,
+        length: Optional[int] = None
+    ):
+        """
+        Append a file's content to an open, unbuffered destination file.
+        
+        Uses os.copy_file_range so the kernel copies the data (or shares
+        extents on filesystems that support it) without passing it through
+        Python; falls back to a buffered copy where it is unavailable.
+        
+        Args:
+            source_path: File to copy from
+            destination: Open, unbuffered file to append to
+            offset: First source byte to copy
+            length: Bytes to copy (None = to the end of the file)
+        """
+        with open(source_path, "rb") as source:
+            if length is None:
+                length = os.fstat(source.fileno()).st_size - offset
+            source.seek(offset)
+            
+            if hasattr(os, "copy_file_range"):
+                try:
+                    while length > 0:
+                        copied = os.copy_file_range(
+                            source.fileno(), destination.fileno(), min(length, 1 << 30)
+                        )
+                        if not copied:
+                            break
+                        length -= copied
+                    return
+                except OSError:
+                    # Unsupported here (e.g. cross-device on older kernels);
+                    # the offsets already advanced, so finish with a plain copy
+                    pass
+            
+            while length > 0:
+                chunk = source.read(min(length, UPLOAD_CHUNK_SIZE))
+                if not chunk:
+                    break
+                destination.write(chunk)
+                length -= len(chunk)
+    
+    def _clone_file(self, source_path: Path, destination) -> bool:
+        """
+        Reflink a whole file into an empty destination file.
+        
+        The copy shares the source's extents copy-on-write, so no data is
+        read or written.
+        
+        Returns:
+            False if the platform or filesystem does not support reflinks
+        """
+        if fcntl is None:
+            return False
+        
+        with open(source_path, "rb") as source:
+            try:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+                return True
+            except OSError:
+                return False
+    
+    def _copy_object_file(
+        self,
+        account_id: str,
+        bucket_name: str,
+        source_path: Path,
+        object_path: Path,
+        offset: int = 0,
+        length: Optional[int] = None
+    ):
+        """
+        Copy a stored file, or a byte range of it, to ``object_path``.
+        
+        Whole files are reflinked where the filesystem supports it; other
+        copies go through _append_file. The copy is staged and renamed
+        into place like any other write.
+        
+        Raises:
+            StorageError: If filesystem operation fails
+        """
+        temp_path = self._new_staging_file(account_id, bucket_name)
+        try:
+            with open(temp_path, "wb", buffering=0) as f:
+                whole_file = offset == 0 and length is None
+                if not (whole_file and self._clone_file(source_path, f)):
+                    self._append_file(source_path, f, offset, length)
+                os.fsync(f.fileno())
+            
+            self._publish_staged_file(temp_path, object_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed to copy object: {str(e)}")
+    
     def _calculate_etag(self, file_path: Path) -> str:
         """Calculate MD5 hash (ETag) for file."""
         md5_hash = hashlib.md5()
@@ -138,6 +458,19 @@ class S3Service:
                 md5_hash.update(chunk)
         return md5_hash.hexdigest()
     
+    def _validate_object_key(self, object_key: str):
+        """
+        Validate object key.
+        
+        Raises:
+            ValidationError: If object key is invalid
+        """
+        if not object_key or len(object_key) > 1024:
+            raise ValidationError("Object key must be 1-1024 characters")
+        
+        if object_key.split("/", 1)[0] == STAGING_DIRECTORY:
+            raise ValidationError(f"Object keys under '{STAGING_DIRECTORY}/' are reserved")
+    
     def _detect_content_type(self, object_key: str, content_type: Optional[str] = None) -> str:
         """Detect or validate content type."""
         if content_type:
@@ -231,7 +564,10 @@ class S3Service:
         ).first()
         
         if not bucket:
-            raise ResourceNotFoundError(f"Bucket '{bucket_name}' not found")
+            raise ResourceNotFoundError(
+                resource_type="Bucket",
+                resource_id=bucket_name
+            )
         
         return bucket
     
@@ -260,6 +596,40 @@ class S3Service:
             Bucket.created_at.desc()
         ).limit(limit).offset(offset).all()
     
+    def get_bucket_metrics(self, db: Session, account_id: str, bucket_name: str) -> dict:
+        """
+        Get bucket object count and size from its stats counters.
+        
+        Counts every stored version except delete markers, totalled and
+        broken down by storage class and by top-level key prefix.
+        
+        Raises:
+            ResourceNotFoundError: If bucket not found
+        """
+        self.get_bucket(db, account_id, bucket_name)
+        
+        storage_classes = {}
+        prefixes = {}
+        for row in get_bucket_stats(db, account_id, bucket_name):
+            for totals, name in ((storage_classes, row.storage_class), (prefixes, row.prefix)):
+                entry = totals.setdefault(name, [0, 0])
+                entry[0] += row.object_count
+                entry[1] += row.size_bytes
+        
+        return {
+            "bucket_name": bucket_name,
+            "object_count": sum(count for count, _ in storage_classes.values()),
+            "size_bytes": sum(size for _, size in storage_classes.values()),
+            "storage_classes": [
+                {"storage_class": name, "object_count": count, "size_bytes": size}
+                for name, (count, size) in sorted(storage_classes.items())
+            ],
+            "prefixes": [
+                {"prefix": name, "object_count": count, "size_bytes": size}
+                for name, (count, size) in sorted(prefixes.items())
+            ]
+        }
+    
     def delete_bucket(self, db: Session, account_id: str, bucket_name: str, force: bool = False):
         """
         Delete bucket.
@@ -298,16 +668,41 @@ class S3Service:
         except Exception as e:
             raise StorageError(f"Failed to delete bucket directory: {str(e)}")
         
-        # Delete all objects (if force)
+        # Delete all objects (if force), releasing their blobs
+        released = []
         if force:
+            released = release_blobs(db, db.execute(
+                select(S3Object.blob_sha256).where(
+                    S3Object.bucket_name == bucket_name,
+                    S3Object.account_id == account_id,
+                    S3Object.blob_sha256.is_not(None)
+                )
+            ).scalars())
             db.query(S3Object).filter(
                 S3Object.bucket_name == bucket_name,
                 S3Object.account_id == account_id
             ).delete()
+        delete_bucket_stats(db, account_id, bucket_name)
+        
+        # Drop in-progress multipart uploads (their parts went with the directory)
+        upload_ids = select(MultipartUpload.upload_id).where(
+            MultipartUpload.bucket_name == bucket_name,
+            MultipartUpload.account_id == account_id
+        )
+        db.query(MultipartUploadPart).filter(
+            MultipartUploadPart.upload_id.in_(upload_ids)
+        ).delete(synchronize_session=False)
+        db.query(MultipartUpload).filter(
+            MultipartUpload.bucket_name == bucket_name,
+            MultipartUpload.account_id == account_id
+        ).delete(synchronize_session=False)
         
         # Delete bucket record
         db.delete(bucket)
         db.commit()
+        bucket_policy_cache.invalidate(bucket_name)
+        
+        purge_blobs(db, released)
     
     # Object Operations
     
@@ -347,35 +742,75 @@ class S3Service:
         bucket = self.get_bucket(db, account_id, bucket_name)
         
         # Validate object key
-        if not object_key or len(object_key) > 1024:
-            raise ValidationError("Object key must be 1-1024 characters")
+        self._validate_object_key(object_key)
         
-        # Get object path
-        object_path = self._get_object_path(account_id, bucket_name, object_key)
+        # Resolve destination (versioned buckets get a new version path)
+        object_path, version_id = self._resolve_object_target(
+            bucket, account_id, bucket_name, object_key
+        )
         
-        # Create parent directories
-        try:
-            object_path.parent.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            raise StorageError(f"Failed to create object directory: {str(e)}")
+        # Stream content into place
+        blob_sha256 = None
+        if self.content_addressed:
+            object_path, size_bytes, etag, blob_sha256 = self._write_blob(
+                db, account_id, bucket_name, content
+            )
+        else:
+            size_bytes, etag = self._write_object_file(account_id, bucket_name, content, object_path)
         
-        # Write content to file
-        try:
-            with open(object_path, "wb") as f:
-                shutil.copyfileobj(content, f)
-        except Exception as e:
-            raise StorageError(f"Failed to write object: {str(e)}")
+        return self._save_object_record(
+            db, bucket, account_id, bucket_name, object_key, object_path, version_id,
+            size_bytes, etag, content_type, metadata, tags, blob_sha256
+        )
+    
+    def _resolve_object_target(
+        self,
+        bucket: Bucket,
+        account_id: str,
+        bucket_name: str,
+        object_key: str
+    ) -> tuple[Path, Optional[str]]:
+        """
+        Get the file path and version ID a new write of ``object_key`` goes to.
         
-        # Calculate size and ETag
-        size_bytes = object_path.stat().st_size
-        etag = self._calculate_etag(object_path)
+        Returns:
+            Tuple of (object path, version ID or None if versioning is disabled)
+        """
+        object_path = self._get_object_path(account_id, bucket_name, object_key)
         
-        # Detect content type
-        detected_content_type = self._detect_content_type(object_key, content_type)
+        if not bucket.versioning_enabled:
+            return object_path, None
         
-        # Check if versioning is enabled
         from app.services.s3_advanced_service import S3AdvancedService
-        advanced_service = S3AdvancedService()
+        version_id = S3AdvancedService().generate_version_id()
+        return object_path.parent / f"{object_path.name}.{version_id}", version_id
+    
+    def _save_object_record(
+        self,
+        db: Session,
+        bucket: Bucket,
+        account_id: str,
+        bucket_name: str,
+        object_key: str,
+        object_path: Path,
+        version_id: Optional[str],
+        size_bytes: int,
+        etag: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        tags: Optional[dict] = None,
+        blob_sha256: Optional[str] = None
+    ) -> S3Object:
+        """
+        Record an object whose content has been written to ``object_path``.
+        
+        Creates a new latest version in versioned buckets; otherwise
+        overwrites the existing record or creates a new one, releasing the
+        content it replaces.
+        """
+        # Detect content type
+        detected_content_type = self._detect_content_type(object_key, content_type)
+        stats = BucketStatsDelta(account_id, bucket_name)
         
         if bucket.versioning_enabled:
             # Versioning enabled - create new version
@@ -386,15 +821,7 @@ class S3Service:
                 S3Object.account_id == account_id,
                 S3Object.object_key == object_key,
                 S3Object.is_latest == True
-            ).update({"is_latest": False})
-            
-            # Generate version ID
-            version_id = advanced_service.generate_version_id()
-            
-            # Create versioned object path
-            versioned_path = object_path.parent / f"{object_path.name}.{version_id}"
-            object_path.rename(versioned_path)
-            object_path = versioned_path
+            ).update({"is_latest": False, "noncurrent_since": datetime.utcnow()})
             
             # Create new version
             object_id = generate_id(ResourceType.S3_OBJECT)
@@ -408,6 +835,7 @@ class S3Service:
                 content_type=detected_content_type,
                 etag=etag,
                 filesystem_path=str(object_path),
+                blob_sha256=blob_sha256,
                 storage_class="STANDARD",
                 version_id=version_id,
                 is_latest=True,
@@ -419,6 +847,8 @@ class S3Service:
             )
             
             db.add(s3_object)
+            stats.add_rows([s3_object])
+            stats.apply(db)
             db.commit()
             db.refresh(s3_object)
             
@@ -432,17 +862,34 @@ class S3Service:
             ).first()
             
             if existing:
+                replaced_path = existing.filesystem_path
+                replaced_blob = existing.blob_sha256
+                stats.remove_rows([existing])
+                
                 # Update existing object
                 existing.size_bytes = size_bytes
                 existing.content_type = detected_content_type
                 existing.etag = etag
                 existing.filesystem_path = str(object_path)
+                existing.blob_sha256 = blob_sha256
                 existing.object_metadata = str(metadata) if metadata else None
                 existing.tags = str(tags) if tags else None
+                existing.created_at = datetime.utcnow()
                 existing.last_modified = datetime.utcnow()
                 
+                stats.add_rows([existing])
+                stats.apply(db)
+                released = release_blobs(db, [replaced_blob]) if replaced_blob else []
                 db.commit()
                 db.refresh(existing)
+                
+                # Drop the replaced content (a file written in place was
+                # already overwritten by the rename)
+                if released:
+                    purge_blobs(db, released)
+                elif not replaced_blob and replaced_path != str(object_path):
+                    Path(replaced_path).unlink(missing_ok=True)
+                
                 return existing
             else:
                 # Create new object
@@ -457,6 +904,7 @@ class S3Service:
                     content_type=detected_content_type,
                     etag=etag,
                     filesystem_path=str(object_path),
+                    blob_sha256=blob_sha256,
                     storage_class="STANDARD",
                     version_id=None,
                     is_latest=True,
@@ -468,6 +916,8 @@ class S3Service:
                 )
                 
                 db.add(s3_object)
+                stats.add_rows([s3_object])
+                stats.apply(db)
                 db.commit()
                 db.refresh(s3_object)
                 
@@ -496,22 +946,7 @@ class S3Service:
             ResourceNotFoundError: If object not found
             StorageError: If filesystem operation fails
         """
-        # Get object metadata
-        s3_object = db.query(S3Object).filter(
-            S3Object.bucket_name == bucket_name,
-            S3Object.account_id == account_id,
-            S3Object.object_key == object_key
-        ).first()
-        
-        if not s3_object:
-            raise ResourceNotFoundError(
-                f"Object '{object_key}' not found in bucket '{bucket_name}'"
-            )
-        
-        # Open file
-        object_path = Path(s3_object.filesystem_path)
-        if not object_path.exists():
-            raise StorageError(f"Object file not found: {object_path}")
+        s3_object, object_path = self.get_object_file(db, account_id, bucket_name, object_key)
         
         try:
             file_handle = open(object_path, "rb")
@@ -519,6 +954,33 @@ class S3Service:
         except Exception as e:
             raise StorageError(f"Failed to read object: {str(e)}")
     
+    def get_object_file(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        object_key: str
+    ) -> tuple[S3Object, Path]:
+        """
+        Locate an object's backing file without opening it.
+        
+        Lets callers hand the path to a sendfile-capable response.
+        
+        Returns:
+            Tuple of (object metadata, file path)
+        
+        Raises:
+            ResourceNotFoundError: If object not found
+            StorageError: If the object file is missing
+        """
+        s3_object = self.get_object_metadata(db, account_id, bucket_name, object_key)
+        
+        object_path = Path(s3_object.filesystem_path)
+        if not object_path.exists():
+            raise StorageError(f"Object file not found: {object_path}")
+        
+        return s3_object, object_path
+    
     def get_object_metadata(
         self,
         db: Session,
@@ -549,63 +1011,260 @@ class S3Service:
         
         if not s3_object:
             raise ResourceNotFoundError(
-                f"Object '{object_key}' not found in bucket '{bucket_name}'"
+                resource_type="Object",
+                resource_id=object_key
             )
         
         return s3_object
     
+    def check_preconditions(
+        self,
+        s3_object: S3Object,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[datetime] = None,
+        if_unmodified_since: Optional[datetime] = None
+    ) -> bool:
+        """
+        Evaluate conditional request headers against an object.
+        
+        Follows RFC 7232 precedence: If-Match, then If-Unmodified-Since
+        (only without If-Match), then If-None-Match, then If-Modified-Since
+        (only without If-None-Match). Timestamps compare at one-second
+        resolution, like the HTTP dates they come from.
+        
+        Args:
+            s3_object: Object being read
+            if_match: If-Match header value (ETag list or "*")
+            if_none_match: If-None-Match header value (ETag list or "*")
+            if_modified_since: Parsed If-Modified-Since (naive UTC)
+            if_unmodified_since: Parsed If-Unmodified-Since (naive UTC)
+        
+        Returns:
+            True if the object is not modified (respond 304), False to
+            serve it
+        
+        Raises:
+            PreconditionFailedError: If If-Match or If-Unmodified-Since fails
+        """
+        last_modified = s3_object.last_modified.replace(microsecond=0)
+        
+        if if_match is not None:
+            if not self._etag_matches(s3_object.etag, if_match):
+                raise PreconditionFailedError()
+        elif if_unmodified_since is not None and last_modified > if_unmodified_since:
+            raise PreconditionFailedError()
+        
+        if if_none_match is not None:
+            return self._etag_matches(s3_object.etag, if_none_match)
+        if if_modified_since is not None:
+            return last_modified <= if_modified_since
+        
+        return False
+    
+    def _etag_matches(self, etag: str, header_value: str) -> bool:
+        """Check an ETag against an If-Match/If-None-Match list (weak comparison)."""
+        if header_value.strip() == "*":
+            return True
+        
+        candidates = (value.strip() for value in header_value.split(","))
+        return any(
+            candidate.removeprefix("W/").strip('"') == etag
+            for candidate in candidates
+        )
+    
     def list_objects(
         self,
         db: Session,
         account_id: str,
         bucket_name: str,
         prefix: Optional[str] = None,
-        limit: int = 1000,
-        offset: int = 0
-    ) -> list[S3Object]:
+        delimiter: Optional[str] = None,
+        max_keys: int = 1000,
+        continuation_token: Optional[str] = None,
+        start_after: Optional[str] = None
+    ) -> tuple[list[S3Object], list[str], Optional[str]]:
         """
-        List objects in bucket.
+        List objects in bucket (ListObjectsV2 semantics).
+        
+        Pages by key (``WHERE object_key > :last``) on the
+        (account_id, bucket_name, is_latest, object_key) index, so every
+        page costs the same regardless of depth. Keys compare in code point
+        (binary UTF-8) order like S3, whatever the database's collation. With a delimiter, keys
+        sharing the part up to the next delimiter after the prefix are
+        rolled up into a common prefix in SQL; each common prefix counts
+        once toward ``max_keys``.
         
         Args:
             db: Database session
             account_id: Owner account ID
             bucket_name: Source bucket
             prefix: Filter by key prefix (e.g., "folder/")
-            limit: Maximum results
-            offset: Pagination offset
+            delimiter: Roll up keys containing this after the prefix (e.g., "/")
+            max_keys: Maximum objects plus common prefixes returned
+            continuation_token: Token from the previous page
+            start_after: Start listing after this key (ignored with a token)
         
         Returns:
-            List of objects
+            Tuple of (objects, common prefixes, next continuation token or None)
         
         Raises:
             ResourceNotFoundError: If bucket not found
+            ValidationError: If the continuation token is invalid
         """
         # Verify bucket exists
         self.get_bucket(db, account_id, bucket_name)
         
-        # Build query
-        query = db.query(S3Object).filter(
+        prefix = prefix or ""
+        marker = self._decode_continuation_token(continuation_token) if continuation_token else start_after
+        key = self._listing_key(db)
+        
+        current = [
+            S3Object.account_id == account_id,
             S3Object.bucket_name == bucket_name,
-            S3Object.account_id == account_id
+            S3Object.is_latest == True,
+            S3Object.is_delete_marker == False
+        ]
+        conditions = list(current)
+        if prefix:
+            conditions.append(S3Object.object_key.startswith(prefix, autoescape=True))
+        
+        # A single lower bound, so the index range starts at the resume point
+        if marker and marker >= prefix:
+            conditions.append(key > marker)
+        elif prefix:
+            conditions.append(key >= prefix)
+        
+        if not delimiter:
+            objects = db.query(S3Object).filter(*conditions).order_by(
+                key
+            ).limit(max_keys + 1).all()
+            
+            next_token = None
+            if len(objects) > max_keys:
+                objects = objects[:max_keys]
+                next_token = self._encode_continuation_token(objects[-1].object_key)
+            
+            return objects, [], next_token
+        
+        # Roll each key up to prefix + everything through the next delimiter
+        rest = func.substr(S3Object.object_key, len(prefix) + 1)
+        position = self._position(db, rest, delimiter)
+        entry = case(
+            (position > 0, func.substr(S3Object.object_key, 1, len(prefix) + position + len(delimiter) - 1)),
+            else_=S3Object.object_key
         )
         
-        # Apply prefix filter
-        if prefix:
-            query = query.filter(S3Object.object_key.like(f"{prefix}%"))
+        # Walk the index in key order; after a common prefix, seek past
+        # every key under it instead of reading them
+        objects = []
+        common_prefixes = []
+        entries = []
+        bound = marker
+        if continuation_token and delimiter in marker[len(prefix):]:
+            bound = marker + PREFIX_SKIP_SUFFIX
+        
+        while len(entries) <= max_keys:
+            query = db.query(S3Object, entry, position > 0).filter(*current)
+            if prefix:
+                query = query.filter(S3Object.object_key.startswith(prefix, autoescape=True))
+            if bound and bound >= prefix:
+                query = query.filter(key > bound)
+            elif prefix:
+                query = query.filter(key >= prefix)
+            
+            rows = query.order_by(key).limit(max_keys + 1).all()
+            if not rows:
+                break
+            
+            skip_prefix = None
+            for s3_object, name, is_prefix in rows:
+                bound = s3_object.object_key
+                if is_prefix:
+                    if common_prefixes and common_prefixes[-1] == name:
+                        # Seek landed inside the previous prefix; keep scanning
+                        continue
+                    common_prefixes.append(name)
+                    skip_prefix = name
+                else:
+                    objects.append(s3_object)
+                entries.append(name)
+                if skip_prefix or len(entries) > max_keys:
+                    break
+            
+            if skip_prefix:
+                bound = skip_prefix + PREFIX_SKIP_SUFFIX
+            elif len(rows) <= max_keys:
+                break
+        
+        next_token = None
+        if len(entries) > max_keys:
+            overflow = entries.pop()
+            if common_prefixes and common_prefixes[-1] == overflow:
+                common_prefixes.pop()
+            else:
+                objects.pop()
+            next_token = self._encode_continuation_token(entries[-1])
         
-        # Execute with pagination
-        return query.order_by(
-            S3Object.object_key
-        ).limit(limit).offset(offset).all()
+        return objects, common_prefixes, next_token
     
-    def delete_object(
+    def count_objects(
         self,
         db: Session,
         account_id: str,
         bucket_name: str,
-        object_key: str,
-        version_id: str = None
-    ):
+        prefix: Optional[str] = None
+    ) -> int:
+        """Count current (non-deleted) objects in a bucket, optionally under a prefix."""
+        query = db.query(func.count(S3Object.object_id)).filter(
+            S3Object.account_id == account_id,
+            S3Object.bucket_name == bucket_name,
+            S3Object.is_latest == True,
+            S3Object.is_delete_marker == False
+        )
+        
+        if prefix:
+            query = query.filter(S3Object.object_key.startswith(prefix, autoescape=True))
+        
+        return query.scalar()
+    
+    def _listing_key(self, db: Session):
+        """
+        object_key for comparisons and ordering in code point order.
+        
+        PostgreSQL compares with the "C" collation (the column's own, which
+        keeps the listing index usable); SQLite's default BINARY collation
+        already orders UTF-8 by code point.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            return S3Object.object_key
+        return S3Object.object_key.collate("C")
+    
+    def _position(self, db: Session, haystack, needle: str):
+        """1-based position of ``needle`` in ``haystack`` (0 if absent) as SQL."""
+        if db.get_bind().dialect.name == "sqlite":
+            return func.instr(haystack, literal(needle))
+        return func.strpos(haystack, literal(needle))
+    
+    def _encode_continuation_token(self, key: str) -> str:
+        """Encode the last listed key as an opaque continuation token."""
+        return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+    
+    def _decode_continuation_token(self, token: str) -> str:
+        """Decode a token produced by ``_encode_continuation_token``."""
+        try:
+            return base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+        except (ValueError, UnicodeError):
+            raise ValidationError("Invalid continuation token")
+    
+    def delete_object(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        object_key: str,
+        version_id: str = None
+    ):
         """
         Delete object from bucket or create delete marker if versioning enabled.
         
@@ -640,7 +1299,7 @@ class S3Service:
                 S3Object.account_id == account_id,
                 S3Object.object_key == object_key,
                 S3Object.is_latest == True
-            ).update({"is_latest": False})
+            ).update({"is_latest": False, "noncurrent_since": datetime.utcnow()})
             
             # Generate version ID
             version_id = advanced_service.generate_version_id()
@@ -671,6 +1330,18 @@ class S3Service:
             # Versioning disabled - permanent delete
             s3_object = self.get_object_metadata(db, account_id, bucket_name, object_key)
             
+            stats = BucketStatsDelta(account_id, bucket_name)
+            stats.remove_rows([s3_object])
+            stats.apply(db)
+            
+            if s3_object.blob_sha256:
+                # Shared content - drop this object's reference
+                released = release_blobs(db, [s3_object.blob_sha256])
+                db.delete(s3_object)
+                db.commit()
+                purge_blobs(db, released)
+                return
+            
             # Delete file
             object_path = Path(s3_object.filesystem_path)
             try:
@@ -683,3 +1354,743 @@ class S3Service:
             db.delete(s3_object)
             db.commit()
 
+    
+    def delete_objects(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        object_keys: list[str]
+    ) -> tuple[list[str], list[dict]]:
+        """
+        Delete many objects in one transaction.
+        
+        Versioned buckets get one delete marker per key, written with a
+        single UPDATE and a single INSERT. Otherwise the current object
+        rows are resolved with one IN query and removed with one DELETE;
+        their files are unlinked after the commit on a thread pool, and
+        blob-backed rows release their blob references in the same commit.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Source bucket
+            object_keys: Keys to delete (duplicates are ignored)
+        
+        Returns:
+            Tuple of (deleted keys, per-key errors as {"object_key", "error"})
+        
+        Raises:
+            ResourceNotFoundError: If bucket not found
+        """
+        bucket = self.get_bucket(db, account_id, bucket_name)
+        object_keys = list(dict.fromkeys(object_keys))
+        
+        if bucket.versioning_enabled:
+            from app.services.s3_advanced_service import S3AdvancedService
+            advanced_service = S3AdvancedService()
+            now = datetime.utcnow()
+            
+            db.execute(
+                update(S3Object).where(
+                    S3Object.bucket_name == bucket_name,
+                    S3Object.account_id == account_id,
+                    S3Object.object_key.in_(object_keys),
+                    S3Object.is_latest == True
+                ).values(is_latest=False, noncurrent_since=now)
+            )
+            db.execute(insert(S3Object.__table__), [
+                {
+                    "object_id": generate_id(ResourceType.S3_OBJECT),
+                    "bucket_name": bucket_name,
+                    "account_id": account_id,
+                    "object_key": object_key,
+                    "size_bytes": 0,
+                    "content_type": "application/x-delete-marker",
+                    "etag": "",
+                    "filesystem_path": "",
+                    "storage_class": "STANDARD",
+                    "version_id": advanced_service.generate_version_id(),
+                    "is_latest": True,
+                    "is_delete_marker": True,
+                    "created_at": now,
+                    "last_modified": now
+                }
+                for object_key in object_keys
+            ])
+            db.commit()
+            
+            return object_keys, []
+        
+        # Versioning disabled - permanent delete
+        rows = db.execute(
+            select(
+                S3Object.object_id,
+                S3Object.object_key,
+                S3Object.filesystem_path,
+                S3Object.blob_sha256,
+                S3Object.storage_class,
+                S3Object.size_bytes,
+                S3Object.is_delete_marker
+            ).where(
+                S3Object.bucket_name == bucket_name,
+                S3Object.account_id == account_id,
+                S3Object.object_key.in_(object_keys),
+                S3Object.is_latest == True
+            )
+        ).all()
+        
+        existing = {row.object_key for row in rows}
+        errors = [
+            {
+                "object_key": object_key,
+                "error": f"Object '{object_key}' not found in bucket '{bucket_name}'"
+            }
+            for object_key in object_keys if object_key not in existing
+        ]
+        
+        # Files owned by the rows; blob-backed rows release a reference instead
+        found = {
+            row.object_key: row.filesystem_path
+            for row in rows if not row.blob_sha256
+        }
+        released = []
+        
+        if rows:
+            stats = BucketStatsDelta(account_id, bucket_name)
+            stats.remove_rows(rows)
+            stats.apply(db)
+            released = release_blobs(db, [row.blob_sha256 for row in rows if row.blob_sha256])
+            db.execute(delete(S3Object).where(S3Object.object_id.in_([row.object_id for row in rows])))
+            db.commit()
+        
+        purge_blobs(db, released)
+        
+        # Unlink files once the rows are gone
+        failed = set()
+        if found:
+            def unlink(item):
+                object_key, filesystem_path = item
+                try:
+                    Path(filesystem_path).unlink(missing_ok=True)
+                    return None
+                except Exception as e:
+                    return {"object_key": object_key, "error": f"Failed to delete object file: {str(e)}"}
+            
+            with ThreadPoolExecutor(max_workers=min(UNLINK_MAX_WORKERS, len(found))) as pool:
+                for error in pool.map(unlink, found.items()):
+                    if error:
+                        errors.append(error)
+                        failed.add(error["object_key"])
+        
+        deleted = [object_key for object_key in object_keys if object_key in existing and object_key not in failed]
+        return deleted, errors
+    
+    def purge_object_rows(self, db: Session, account_id: str, bucket_name: str, rows: list) -> None:
+        """
+        Permanently delete object rows of any version, and their content.
+        
+        Rows are removed with one DELETE; blob references and bucket stats
+        are released in the same commit and owned files are unlinked after it.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Bucket the rows belong to
+            rows: Rows with object_id, object_key, filesystem_path,
+                blob_sha256, storage_class, size_bytes and is_delete_marker
+        """
+        if not rows:
+            return
+        
+        stats = BucketStatsDelta(account_id, bucket_name)
+        stats.remove_rows(rows)
+        stats.apply(db)
+        released = release_blobs(db, [row.blob_sha256 for row in rows if row.blob_sha256])
+        db.execute(delete(S3Object).where(S3Object.object_id.in_([row.object_id for row in rows])))
+        db.commit()
+        
+        purge_blobs(db, released)
+        
+        # Delete markers own no file
+        paths = [
+            Path(row.filesystem_path)
+            for row in rows if row.filesystem_path and not row.blob_sha256
+        ]
+        if paths:
+            def unlink(path):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+            
+            with ThreadPoolExecutor(max_workers=min(UNLINK_MAX_WORKERS, len(paths))) as pool:
+                list(pool.map(unlink, paths))
+    
+    def _get_copy_source(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        object_key: str,
+        version_id: Optional[str] = None
+    ) -> S3Object:
+        """
+        Get the object (latest or a specific version) a copy reads from.
+        
+        Raises:
+            ResourceNotFoundError: If the object or version does not exist,
+                or is a delete marker
+        """
+        query = db.query(S3Object).filter(
+            S3Object.bucket_name == bucket_name,
+            S3Object.account_id == account_id,
+            S3Object.object_key == object_key
+        )
+        if version_id:
+            query = query.filter(S3Object.version_id == version_id)
+        else:
+            query = query.filter(S3Object.is_latest == True)
+        
+        s3_object = query.first()
+        if not s3_object or s3_object.is_delete_marker:
+            raise ResourceNotFoundError(
+                resource_type="Object",
+                resource_id=object_key
+            )
+        
+        return s3_object
+    
+    def copy_object(
+        self,
+        db: Session,
+        account_id: str,
+        source_bucket: str,
+        source_key: str,
+        bucket_name: str,
+        object_key: str,
+        source_version_id: Optional[str] = None,
+        metadata_directive: str = "COPY",
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        tags: Optional[dict] = None
+    ) -> S3Object:
+        """
+        Copy an object server-side, within or across buckets.
+        
+        Blob-backed sources are copied by adding a blob reference, without
+        touching the content. Other sources are copied in the kernel (see
+        _copy_object_file). The source's ETag is reused either way, since
+        the content is identical.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            source_bucket: Bucket to copy from
+            source_key: Key to copy from
+            bucket_name: Target bucket
+            object_key: Target key
+            source_version_id: Source version (latest if None)
+            metadata_directive: COPY keeps the source's content type,
+                metadata and tags; REPLACE uses the given ones
+            content_type: MIME type for REPLACE (auto-detected if None)
+            metadata: Custom metadata for REPLACE
+            tags: Object tags for REPLACE
+        
+        Returns:
+            Created object
+        
+        Raises:
+            ResourceNotFoundError: If a bucket or the source object is not found
+            ValidationError: If the directive or target key is invalid, or an
+                object is copied onto itself without changing its metadata
+            StorageError: If filesystem operation fails
+        """
+        if metadata_directive not in ("COPY", "REPLACE"):
+            raise ValidationError("Metadata directive must be COPY or REPLACE")
+        
+        source = self._get_copy_source(db, account_id, source_bucket, source_key, source_version_id)
+        bucket = self.get_bucket(db, account_id, bucket_name)
+        self._validate_object_key(object_key)
+        
+        if (
+            metadata_directive == "COPY"
+            and (source_bucket, source_key) == (bucket_name, object_key)
+            and source.is_latest
+        ):
+            raise ValidationError(
+                "An object cannot be copied to itself without changing its metadata"
+            )
+        
+        if metadata_directive == "COPY":
+            content_type = source.content_type
+            metadata = source.object_metadata
+            tags = source.tags
+        
+        # Capture the source before the target's record is written (a copy
+        # onto the same key updates that row)
+        source_path = Path(source.filesystem_path)
+        blob_sha256 = source.blob_sha256
+        size_bytes = source.size_bytes
+        etag = source.etag
+        
+        object_path, version_id = self._resolve_object_target(
+            bucket, account_id, bucket_name, object_key
+        )
+        
+        if blob_sha256:
+            # Metadata-only copy: the target shares the source's blob
+            if not reference_blob(db, blob_sha256):
+                raise StorageError(f"Content of object '{source_key}' is missing")
+            object_path = source_path
+        else:
+            self._copy_object_file(account_id, bucket_name, source_path, object_path)
+        
+        return self._save_object_record(
+            db, bucket, account_id, bucket_name, object_key, object_path, version_id,
+            size_bytes, etag, content_type, metadata, tags, blob_sha256
+        )
+    
+    # Multipart Upload Operations
+    
+    def _get_upload_path(self, account_id: str, bucket_name: str, upload_id: str) -> Path:
+        """Get the directory holding a multipart upload's parts."""
+        return self._get_staging_path(account_id, bucket_name) / "uploads" / upload_id
+    
+    def _get_multipart_upload(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        upload_id: str
+    ) -> MultipartUpload:
+        """
+        Get in-progress multipart upload.
+        
+        Raises:
+            ResourceNotFoundError: If upload not found
+        """
+        upload = db.query(MultipartUpload).filter(
+            MultipartUpload.upload_id == upload_id,
+            MultipartUpload.bucket_name == bucket_name,
+            MultipartUpload.account_id == account_id
+        ).first()
+        
+        if not upload:
+            raise ResourceNotFoundError(
+                resource_type="MultipartUpload",
+                resource_id=upload_id
+            )
+        
+        return upload
+    
+    def create_multipart_upload(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        object_key: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        tags: Optional[dict] = None
+    ) -> MultipartUpload:
+        """
+        Start a multipart upload.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Target bucket
+            object_key: Key of the object to create on completion
+            content_type: MIME type (auto-detected if None)
+            metadata: Custom metadata
+            tags: Object tags
+        
+        Returns:
+            Created upload
+        
+        Raises:
+            ResourceNotFoundError: If bucket not found
+            ValidationError: If object key is invalid
+        """
+        self.get_bucket(db, account_id, bucket_name)
+        self._validate_object_key(object_key)
+        
+        upload = MultipartUpload(
+            upload_id=uuid.uuid4().hex,
+            bucket_name=bucket_name,
+            account_id=account_id,
+            object_key=object_key,
+            content_type=content_type,
+            object_metadata=str(metadata) if metadata else None,
+            tags=str(tags) if tags else None,
+            initiated_at=datetime.utcnow()
+        )
+        
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+        
+        return upload
+    
+    def upload_part(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        upload_id: str,
+        part_number: int,
+        content: BinaryIO
+    ) -> MultipartUploadPart:
+        """
+        Upload one part of a multipart upload.
+        
+        Each part is written to its own file, so parts can be uploaded
+        concurrently and in any order. Uploading a part number again
+        replaces the earlier part.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Target bucket
+            upload_id: Upload identifier
+            part_number: Part number (1-10000)
+            content: File-like object with binary content
+        
+        Returns:
+            Stored part
+        
+        Raises:
+            ResourceNotFoundError: If upload not found
+            ValidationError: If part number is out of range
+            StorageError: If filesystem operation fails
+        """
+        if not 1 <= part_number <= MAX_PART_NUMBER:
+            raise ValidationError(f"Part number must be between 1 and {MAX_PART_NUMBER}")
+        
+        self._get_multipart_upload(db, account_id, bucket_name, upload_id)
+        
+        part_path = self._get_upload_path(account_id, bucket_name, upload_id) / f"{part_number:05d}"
+        size_bytes, etag = self._write_object_file(account_id, bucket_name, content, part_path)
+        
+        return self._save_part(db, upload_id, part_number, part_path, size_bytes, etag)
+    
+    def upload_part_copy(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        upload_id: str,
+        part_number: int,
+        source_bucket: str,
+        source_key: str,
+        source_version_id: Optional[str] = None,
+        byte_range: Optional[tuple[int, int]] = None
+    ) -> MultipartUploadPart:
+        """
+        Upload a part by copying an existing object, or a byte range of it.
+        
+        The data is copied in the kernel (see _copy_object_file). Whole
+        objects reuse the source's MD5 as the part ETag; ranges are hashed.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Target bucket
+            upload_id: Upload identifier
+            part_number: Part number (1-10000)
+            source_bucket: Bucket to copy from
+            source_key: Key to copy from
+            source_version_id: Source version (latest if None)
+            byte_range: (first, last) zero-based inclusive byte offsets
+                (whole object if None)
+        
+        Returns:
+            Stored part
+        
+        Raises:
+            ResourceNotFoundError: If the upload or source object is not found
+            ValidationError: If part number or byte range is out of range
+            StorageError: If filesystem operation fails
+        """
+        if not 1 <= part_number <= MAX_PART_NUMBER:
+            raise ValidationError(f"Part number must be between 1 and {MAX_PART_NUMBER}")
+        
+        self._get_multipart_upload(db, account_id, bucket_name, upload_id)
+        source = self._get_copy_source(db, account_id, source_bucket, source_key, source_version_id)
+        
+        offset, length = 0, None
+        if byte_range is not None:
+            first, last = byte_range
+            if first < 0 or last < first or last >= source.size_bytes:
+                raise ValidationError(
+                    f"Byte range {first}-{last} is outside object '{source_key}' "
+                    f"of {source.size_bytes} bytes"
+                )
+            if (first, last) != (0, source.size_bytes - 1):
+                offset, length = first, last - first + 1
+        
+        part_path = self._get_upload_path(account_id, bucket_name, upload_id) / f"{part_number:05d}"
+        self._copy_object_file(
+            account_id, bucket_name, Path(source.filesystem_path), part_path, offset, length
+        )
+        
+        if length is not None:
+            size_bytes, etag = length, self._calculate_etag(part_path)
+        elif source.blob_sha256:
+            # The blob records the content MD5 even when the ETag is composite
+            size_bytes, etag = source.size_bytes, db.get(S3Blob, source.blob_sha256).md5
+        elif "-" not in source.etag:
+            size_bytes, etag = source.size_bytes, source.etag
+        else:
+            size_bytes, etag = source.size_bytes, self._calculate_etag(part_path)
+        
+        return self._save_part(db, upload_id, part_number, part_path, size_bytes, etag)
+    
+    def _save_part(
+        self,
+        db: Session,
+        upload_id: str,
+        part_number: int,
+        part_path: Path,
+        size_bytes: int,
+        etag: str
+    ) -> MultipartUploadPart:
+        """Record a part written to ``part_path``, replacing any earlier upload of it."""
+        values = {
+            "size_bytes": size_bytes,
+            "etag": etag,
+            "filesystem_path": str(part_path),
+            "last_modified": datetime.utcnow()
+        }
+        
+        part = db.get(MultipartUploadPart, (upload_id, part_number))
+        if part is None:
+            part = MultipartUploadPart(upload_id=upload_id, part_number=part_number, **values)
+            db.add(part)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Same part number uploaded concurrently; the last write wins
+                db.rollback()
+                part = db.get(MultipartUploadPart, (upload_id, part_number))
+                if part is None:
+                    # The upload was aborted concurrently
+                    raise ResourceNotFoundError(
+                        resource_type="MultipartUpload",
+                        resource_id=upload_id
+                    )
+                for name, value in values.items():
+                    setattr(part, name, value)
+                db.commit()
+        else:
+            for name, value in values.items():
+                setattr(part, name, value)
+            db.commit()
+        
+        db.refresh(part)
+        return part
+    
+    def list_parts(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        upload_id: str,
+        part_number_marker: int = 0,
+        max_parts: int = 1000
+    ) -> tuple[list[MultipartUploadPart], bool]:
+        """
+        List uploaded parts of a multipart upload.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Target bucket
+            upload_id: Upload identifier
+            part_number_marker: Return parts after this part number
+            max_parts: Maximum results
+        
+        Returns:
+            Tuple of (parts ordered by part number, whether more parts follow)
+        
+        Raises:
+            ResourceNotFoundError: If upload not found
+        """
+        self._get_multipart_upload(db, account_id, bucket_name, upload_id)
+        
+        parts = db.query(MultipartUploadPart).filter(
+            MultipartUploadPart.upload_id == upload_id,
+            MultipartUploadPart.part_number > part_number_marker
+        ).order_by(
+            MultipartUploadPart.part_number
+        ).limit(max_parts + 1).all()
+        
+        return parts[:max_parts], len(parts) > max_parts
+    
+    def complete_multipart_upload(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        upload_id: str,
+        parts: list[tuple[int, str]]
+    ) -> S3Object:
+        """
+        Assemble uploaded parts into the final object.
+        
+        Parts are concatenated in the kernel (see _append_file) into a
+        staging file that is then renamed into place (or, with
+        content-addressed storage, hashed and moved into the blob store;
+        SHA-256 does not compose across parts). The ETag is
+        S3's composite form, MD5(concatenated part MD5 digests)-<part count>,
+        computed from the per-part MD5s stored at upload time.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Target bucket
+            upload_id: Upload identifier
+            parts: (part number, ETag) pairs in ascending part number order
+        
+        Returns:
+            Created object
+        
+        Raises:
+            ResourceNotFoundError: If upload not found
+            ValidationError: If the part list is invalid or a part is too small
+            StorageError: If filesystem operation fails
+        """
+        upload = self._get_multipart_upload(db, account_id, bucket_name, upload_id)
+        bucket = self.get_bucket(db, account_id, bucket_name)
+        
+        if not parts:
+            raise ValidationError("At least one part must be specified")
+        
+        part_numbers = [part_number for part_number, _ in parts]
+        if any(b <= a for a, b in zip(part_numbers, part_numbers[1:])):
+            raise ValidationError("Parts must be listed in ascending part number order")
+        
+        stored = {part.part_number: part for part in upload.parts}
+        selected = []
+        for index, (part_number, etag) in enumerate(parts):
+            part = stored.get(part_number)
+            if part is None or part.etag != etag.strip('"'):
+                raise ValidationError(f"Part {part_number} was not uploaded or its ETag does not match")
+            if index < len(parts) - 1 and part.size_bytes < MIN_PART_SIZE:
+                raise ValidationError(
+                    f"Part {part_number} is smaller than the minimum part size of {MIN_PART_SIZE} bytes"
+                )
+            selected.append(part)
+        
+        # Composite ETag from the stored part digests
+        digests = b"".join(bytes.fromhex(part.etag) for part in selected)
+        etag = f"{hashlib.md5(digests).hexdigest()}-{len(selected)}"
+        size_bytes = sum(part.size_bytes for part in selected)
+        
+        object_path, version_id = self._resolve_object_target(
+            bucket, account_id, bucket_name, upload.object_key
+        )
+        
+        temp_path = self._new_staging_file(account_id, bucket_name)
+        try:
+            with open(temp_path, "wb", buffering=0) as f:
+                for part in selected:
+                    self._append_file(Path(part.filesystem_path), f)
+                os.fsync(f.fileno())
+            
+            if not self.content_addressed:
+                self._publish_staged_file(temp_path, object_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed to assemble multipart upload: {str(e)}")
+        
+        blob_sha256 = None
+        if self.content_addressed:
+            md5_hash = hashlib.md5()
+            sha256_hash = hashlib.sha256()
+            try:
+                with open(temp_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+                        md5_hash.update(chunk)
+                        sha256_hash.update(chunk)
+            except Exception as e:
+                temp_path.unlink(missing_ok=True)
+                raise StorageError(f"Failed to assemble multipart upload: {str(e)}")
+            blob_sha256 = sha256_hash.hexdigest()
+            object_path = self._store_blob(
+                db, temp_path, blob_sha256, md5_hash.hexdigest(), size_bytes
+            )
+        
+        # The upload row is removed in the same commit that records the object
+        db.delete(upload)
+        s3_object = self._save_object_record(
+            db, bucket, account_id, bucket_name, upload.object_key, object_path, version_id,
+            size_bytes, etag, upload.content_type, upload.object_metadata, upload.tags,
+            blob_sha256
+        )
+        
+        shutil.rmtree(self._get_upload_path(account_id, bucket_name, upload_id), ignore_errors=True)
+        
+        return s3_object
+    
+    def abort_multipart_upload(
+        self,
+        db: Session,
+        account_id: str,
+        bucket_name: str,
+        upload_id: str
+    ):
+        """
+        Abort a multipart upload and delete its parts.
+        
+        Args:
+            db: Database session
+            account_id: Owner account ID
+            bucket_name: Target bucket
+            upload_id: Upload identifier
+        
+        Raises:
+            ResourceNotFoundError: If upload not found
+        """
+        upload = self._get_multipart_upload(db, account_id, bucket_name, upload_id)
+        
+        db.delete(upload)
+        db.commit()
+        
+        shutil.rmtree(self._get_upload_path(account_id, bucket_name, upload_id), ignore_errors=True)
+    
+    def abort_stale_multipart_uploads(
+        self,
+        db: Session,
+        initiated_before: datetime,
+        limit: int = 1000
+    ) -> int:
+        """
+        Abort multipart uploads started before ``initiated_before``.
+        
+        Args:
+            db: Database session
+            initiated_before: Uploads initiated earlier than this are aborted
+            limit: Maximum uploads aborted per call
+        
+        Returns:
+            Number of uploads aborted
+        """
+        uploads = db.query(MultipartUpload).filter(
+            MultipartUpload.initiated_at < initiated_before
+        ).order_by(
+            MultipartUpload.initiated_at
+        ).limit(limit).all()
+        
+        for upload in uploads:
+            db.delete(upload)
+        db.commit()
+        
+        for upload in uploads:
+            shutil.rmtree(
+                self._get_upload_path(upload.account_id, upload.bucket_name, upload.upload_id),
+                ignore_errors=True
+            )
+        
+        return len(uploads)
@@ -4,10 +4,10 @@ Pattern matching for IAM actions and resource ARNs with wildcard support
 """
 
 import re
-from typing import List
+from typing import Iterable, List, Optional
 
 
-def wildcard_to_regex(pattern: str) -> re.Pattern:
+def wildcard_to_regex(pattern: str, ignore_case: bool = True) -> re.Pattern:
     """
     Convert wildcard pattern to regex pattern
     
@@ -22,20 +22,81 @@ def wildcard_to_regex(pattern: str) -> re.Pattern:
     
     Args:
         pattern: Wildcard pattern string
+        ignore_case: Match case-insensitively (IAM actions are)
         
     Returns:
         Compiled regex pattern
     """
+    # Anchor to match entire string
+    regex_pattern = f'^{_wildcard_body(pattern)}$'
+    
+    return re.compile(regex_pattern, re.IGNORECASE if ignore_case else 0)
+
+
+def compile_wildcards(patterns: Iterable[str], ignore_case: bool = True) -> Optional[re.Pattern]:
+    """
+    Compile several wildcard patterns into one anchored alternation
+    
+    A value matches the result if it matches any of the patterns, with a
+    single regex call however many patterns there are.
+    
+    Args:
+        patterns: Wildcard patterns
+        ignore_case: Match case-insensitively (IAM actions are)
+        
+    Returns:
+        Compiled regex, or None if there are no patterns
+    """
+    bodies = [_wildcard_body(pattern) for pattern in dict.fromkeys(patterns)]
+    if not bodies:
+        return None
+    
+    return re.compile(f'^(?:{"|".join(bodies)})$', re.IGNORECASE if ignore_case else 0)
+
+
+class WildcardSet:
+    """
+    Precompiled matcher for a set of wildcard patterns
+    
+    Literal patterns go into a hash set; wildcard patterns are compiled
+    into a single regex with compile_wildcards.
+    
+    Example:
+        actions = WildcardSet(["s3:GetObject", "ec2:Describe*"])
+        actions.matches("ec2:DescribeInstances") → True
+    """
+    
+    __slots__ = ("ignore_case", "match_all", "exact", "wildcards")
+    
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = True):
+        patterns = list(patterns)
+        self.ignore_case = ignore_case
+        self.match_all = "*" in patterns
+        self.exact = frozenset(
+            pattern.lower() if ignore_case else pattern
+            for pattern in patterns if "*" not in pattern and "?" not in pattern
+        )
+        self.wildcards = compile_wildcards(
+            (pattern for pattern in patterns if "*" in pattern or "?" in pattern),
+            ignore_case=ignore_case
+        )
+    
+    def matches(self, value: str) -> bool:
+        """Check if value matches any of the patterns"""
+        if self.match_all:
+            return True
+        if (value.lower() if self.ignore_case else value) in self.exact:
+            return True
+        return self.wildcards is not None and self.wildcards.match(value) is not None
+
+
+def _wildcard_body(pattern: str) -> str:
+    """Unanchored regex source for a wildcard pattern."""
     # Escape special regex characters except * and ?
     escaped = re.escape(pattern)
     
     # Replace escaped wildcards with regex equivalents
-    regex_pattern = escaped.replace(r'\*', '.*').replace(r'\?', '.')
-    
-    # Anchor to match entire string
-    regex_pattern = f'^{regex_pattern}$'
-    
-    return re.compile(regex_pattern, re.IGNORECASE)
+    return escaped.replace(r'\*', '.*').replace(r'\?', '.')
 
 
 def matches_wildcard(pattern: str, value: str) -> bool:
@@ -162,4 +223,13 @@ if __name__ == "__main__":
     assert matches_wildcard("*:*", "ec2:StartInstances") is True
     assert matches_wildcard("ec2:?tart*", "ec2:StartInstances") is True
     
+    # Test compiled pattern sets
+    compiled = compile_wildcards(["s3:Get*", "s3:PutObject"])
+    assert compiled.match("s3:getobject") is not None
+    assert compiled.match("s3:DeleteObject") is None
+    assert compile_wildcards(["arn:aws:s3:::b/A*"], ignore_case=False).match("arn:aws:s3:::b/a") is None
+    assert compile_wildcards([]) is None
+    assert WildcardSet(["s3:GetObject", "ec2:Describe*"]).matches("EC2:DescribeInstances") is True
+    assert WildcardSet(["arn:aws:s3:::b/Key"], ignore_case=False).matches("arn:aws:s3:::b/key") is False
+    
     print("✅ All wildcard matching tests passed")
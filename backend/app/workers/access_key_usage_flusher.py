@@ -0,0 +1,78 @@
+"""
+Access Key Usage Flusher
+Periodically writes coalesced access key last-used updates
+"""
+import logging
+from typing import Optional
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.access_key_usage import access_key_usage
+from app.workers.scheduler import PeriodicWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class AccessKeyUsageFlusher(PeriodicWorker):
+    """
+    Background worker for access key last-used tracking.
+    
+    Authentication only records usage in memory; each tick writes the
+    latest use of every key (and the activity of its user) in one batch.
+    """
+    
+    name = "Access key usage flusher"
+    
+    def __init__(self, interval: int = 60):
+        """
+        Initialize access key usage flusher.
+        
+        Args:
+            interval: Seconds between flushes (default: 60)
+        """
+        super().__init__(interval)
+    
+    async def flush(self):
+        """Write the usage recorded since the last flush."""
+        if not access_key_usage.pending():
+            return
+        
+        async with AsyncSessionLocal() as session:
+            keys = await access_key_usage.flush(session)
+        
+        logger.debug(f"Flushed last-used updates for {keys} access keys")
+    
+    async def _tick(self):
+        await self.flush()
+
+
+# Global worker instance
+_access_key_usage_flusher: Optional[AccessKeyUsageFlusher] = None
+
+
+def get_access_key_usage_flusher() -> AccessKeyUsageFlusher:
+    """Get the global access key usage flusher instance."""
+    global _access_key_usage_flusher
+    if _access_key_usage_flusher is None:
+        _access_key_usage_flusher = AccessKeyUsageFlusher(
+            interval=settings.ACCESS_KEY_USAGE_FLUSH_INTERVAL
+        )
+    return _access_key_usage_flusher
+
+
+def start_access_key_usage_flusher():
+    """Start the global access key usage flusher on the running event loop."""
+    flusher = get_access_key_usage_flusher()
+    flusher.start()
+
+
+async def stop_access_key_usage_flusher():
+    """Stop the global access key usage flusher, writing any pending usage."""
+    flusher = get_access_key_usage_flusher()
+    await flusher.stop()
+    
+    try:
+        await flusher.flush()
+    except Exception as e:
+        logger.error(f"Final access key usage flush failed: {str(e)}")
@@ -0,0 +1,85 @@
+"""
+Lifecycle Worker
+Periodically executes S3 bucket lifecycle rules
+"""
+import logging
+import time
+from typing import Optional
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.s3_lifecycle_service import S3LifecycleService
+from app.workers.scheduler import PeriodicWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class LifecycleWorker(PeriodicWorker):
+    """
+    Background worker for S3 lifecycle rules.
+    
+    Runs as an asyncio task; the synchronous lifecycle service executes via
+    ``AsyncSession.run_sync`` in bounded batches and checkpoints each
+    bucket, so a large bucket is worked through over several runs.
+    """
+    
+    name = "Lifecycle worker"
+    
+    def __init__(self, interval: int = 3600, batch_size: int = 1000, max_batches: int = 100):
+        """
+        Initialize lifecycle worker.
+        
+        Args:
+            interval: Seconds between lifecycle passes (default: 3600)
+            batch_size: Objects processed per transaction (default: 1000)
+            max_batches: Batches per pass (default: 100)
+        """
+        super().__init__(interval)
+        self.lifecycle_service = S3LifecycleService(
+            batch_size=batch_size,
+            max_batches=max_batches
+        )
+    
+    async def _tick(self):
+        """Run one lifecycle pass."""
+        started = time.perf_counter()
+        
+        async with AsyncSessionLocal() as session:
+            stats = await session.run_sync(self.lifecycle_service.apply_all)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Lifecycle pass completed in {elapsed:.2f}s: "
+            f"{stats['expired']} objects expired, "
+            f"{stats['transitioned']} transitioned, "
+            f"{stats['noncurrent_expired']} noncurrent versions expired"
+        )
+
+
+# Global worker instance
+_lifecycle_worker: Optional[LifecycleWorker] = None
+
+
+def get_lifecycle_worker() -> LifecycleWorker:
+    """Get the global lifecycle worker instance."""
+    global _lifecycle_worker
+    if _lifecycle_worker is None:
+        _lifecycle_worker = LifecycleWorker(
+            interval=settings.S3_LIFECYCLE_INTERVAL,
+            batch_size=settings.S3_LIFECYCLE_BATCH_SIZE,
+            max_batches=settings.S3_LIFECYCLE_MAX_BATCHES
+        )
+    return _lifecycle_worker
+
+
+def start_lifecycle_worker():
+    """Start the global lifecycle worker on the running event loop."""
+    worker = get_lifecycle_worker()
+    worker.start()
+
+
+async def stop_lifecycle_worker():
+    """Stop the global lifecycle worker, draining the current pass."""
+    worker = get_lifecycle_worker()
+    await worker.stop()
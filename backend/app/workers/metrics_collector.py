@@ -1,92 +1,122 @@
 """
 Background worker for periodic CloudWatch metrics collection
 """
-import time
+import asyncio
 import logging
-from threading import Thread, Event
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Optional
 
-from app.core.database import SessionLocal
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.instance import Instance
 from app.services.cloudwatch_service import CloudWatchService
+from app.workers.scheduler import PeriodicWorker
 
 
 logger = logging.getLogger(__name__)
 
 
-class MetricsCollector:
+class MetricsCollector(PeriodicWorker):
     """
     Background worker that periodically collects metrics from running instances.
+    
+    Runs as an asyncio task on the app's async engine. Blocking Docker stats
+    calls are offloaded to a bounded thread pool while no database session
+    is open; the sweep is then written through the shared connection pool
+    in a single transaction.
     """
     
-    def __init__(self, interval: int = 60):
+    name = "Metrics collector"
+    
+    def __init__(self, interval: int = 60, max_workers: int = 8):
         """
         Initialize metrics collector.
         
         Args:
             interval: Collection interval in seconds (default: 60)
+            max_workers: Concurrent Docker stats calls per sweep (default: 8)
         """
-        self.interval = interval
+        super().__init__(interval)
+        self.max_workers = max_workers
         self.cloudwatch_service = CloudWatchService()
-        self._stop_event = Event()
-        self._thread: Optional[Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
     
     def start(self):
         """Start the metrics collection worker."""
-        if self._thread and self._thread.is_alive():
-            logger.warning("Metrics collector already running")
-            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="docker-stats"
+            )
+        super().start()
+    
+    async def stop(self, timeout: float = 30.0):
+        """Stop the metrics collection worker and its Docker thread pool."""
+        await super().stop(timeout)
         
-        self._stop_event.clear()
-        self._thread = Thread(target=self._run, daemon=True)
-        self._thread.start()
-        logger.info(f"Metrics collector started (interval: {self.interval}s)")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
     
-    def stop(self):
-        """Stop the metrics collection worker."""
-        if not self._thread or not self._thread.is_alive():
-            logger.warning("Metrics collector not running")
+    async def _tick(self):
+        """Collect metrics from all running instances."""
+        loop = asyncio.get_running_loop()
+        
+        # Load only what the sweep needs; no session is held while sampling
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(
+                    Instance.instance_id,
+                    Instance.account_id,
+                    Instance.instance_type,
+                    Instance.docker_container_id
+                ).where(
+                    Instance.state == "running",
+                    Instance.docker_container_id.isnot(None)
+                )
+            )
+            instances = result.all()
+        
+        if not instances:
             return
         
-        logger.info("Stopping metrics collector...")
-        self._stop_event.set()
-        self._thread.join(timeout=10)
-        logger.info("Metrics collector stopped")
-    
-    def is_running(self) -> bool:
-        """Check if the collector is running."""
-        return self._thread is not None and self._thread.is_alive()
-    
-    def _run(self):
-        """Main worker loop."""
-        logger.info("Metrics collector worker started")
+        # Fan out blocking Docker stats calls across the executor
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor,
+                    self.cloudwatch_service.sample_container,
+                    instance.docker_container_id
+                )
+                for instance in instances
+            ),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
         
-        while not self._stop_event.is_set():
-            try:
-                self._collect_metrics()
-            except Exception as e:
-                logger.error(f"Error collecting metrics: {str(e)}", exc_info=True)
-            
-            # Wait for next interval (with early exit on stop)
-            self._stop_event.wait(timeout=self.interval)
+        samples = {
+            instance.instance_id: outcome
+            for instance, outcome in zip(instances, outcomes)
+        }
         
-        logger.info("Metrics collector worker stopped")
-    
-    def _collect_metrics(self):
-        """Collect metrics from all running instances."""
-        db = SessionLocal()
+        async with AsyncSessionLocal() as session:
+            results = await session.run_sync(
+                self.cloudwatch_service.store_sweep,
+                instances,
+                samples,
+                elapsed,
+                datetime.utcnow()
+            )
         
-        try:
-            logger.debug("Collecting metrics from running instances...")
-            
-            results = self.cloudwatch_service.collect_all_instance_metrics(db)
-            
-            total_metrics = sum(len(metrics) for metrics in results.values())
-            logger.info(f"Collected {total_metrics} metrics from {len(results)} instances")
-            
-        except Exception as e:
-            logger.error(f"Error in metrics collection: {str(e)}", exc_info=True)
-        finally:
-            db.close()
+        total_metrics = sum(len(metrics) for metrics in results.values())
+        logger.info(
+            f"Collected {total_metrics} metrics from {len(results)} instances in {elapsed:.2f}s"
+        )
 
 
 # Global metrics collector instance
@@ -98,18 +128,21 @@ def get_metrics_collector() -> MetricsCollector:
     global _metrics_collector
     
     if _metrics_collector is None:
-        _metrics_collector = MetricsCollector(interval=60)
+        _metrics_collector = MetricsCollector(
+            interval=settings.METRICS_COLLECTION_INTERVAL,
+            max_workers=settings.METRICS_COLLECTOR_MAX_WORKERS
+        )
     
     return _metrics_collector
 
 
 def start_metrics_collector():
-    """Start the global metrics collector."""
+    """Start the global metrics collector on the running event loop."""
     collector = get_metrics_collector()
     collector.start()
 
 
-def stop_metrics_collector():
-    """Stop the global metrics collector."""
+async def stop_metrics_collector():
+    """Stop the global metrics collector, draining the current sweep."""
     collector = get_metrics_collector()
-    collector.stop()
+    await collector.stop()
@@ -0,0 +1,84 @@
+"""
+Multipart Upload Sweeper
+Periodically aborts abandoned S3 multipart uploads
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.s3_service import S3Service
+from app.workers.scheduler import PeriodicWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class MultipartUploadSweeper(PeriodicWorker):
+    """
+    Background worker that aborts multipart uploads which were never
+    completed, deleting their part files.
+    """
+    
+    name = "Multipart upload sweeper"
+    
+    def __init__(self, interval: int = 3600, expiry_days: int = 7, batch_size: int = 1000):
+        """
+        Initialize sweeper.
+        
+        Args:
+            interval: Seconds between sweeps (default: 3600)
+            expiry_days: Uploads initiated this many days ago are aborted (default: 7)
+            batch_size: Uploads aborted per transaction (default: 1000)
+        """
+        super().__init__(interval)
+        self.expiry_days = expiry_days
+        self.batch_size = batch_size
+        self.s3_service = S3Service()
+    
+    async def _tick(self):
+        """Abort every upload older than the expiry."""
+        initiated_before = datetime.utcnow() - timedelta(days=self.expiry_days)
+        total = 0
+        
+        async with AsyncSessionLocal() as session:
+            while True:
+                aborted = await session.run_sync(
+                    self.s3_service.abort_stale_multipart_uploads,
+                    initiated_before,
+                    self.batch_size
+                )
+                total += aborted
+                if aborted < self.batch_size:
+                    break
+        
+        if total:
+            logger.info(f"Aborted {total} abandoned multipart uploads")
+
+
+# Global worker instance
+_multipart_sweeper: Optional[MultipartUploadSweeper] = None
+
+
+def get_multipart_sweeper() -> MultipartUploadSweeper:
+    """Get the global multipart upload sweeper instance."""
+    global _multipart_sweeper
+    if _multipart_sweeper is None:
+        _multipart_sweeper = MultipartUploadSweeper(
+            interval=settings.S3_MULTIPART_SWEEP_INTERVAL,
+            expiry_days=settings.S3_MULTIPART_UPLOAD_EXPIRY_DAYS
+        )
+    return _multipart_sweeper
+
+
+def start_multipart_sweeper():
+    """Start the global multipart upload sweeper on the running event loop."""
+    sweeper = get_multipart_sweeper()
+    sweeper.start()
+
+
+async def stop_multipart_sweeper():
+    """Stop the global multipart upload sweeper, draining the current sweep."""
+    sweeper = get_multipart_sweeper()
+    await sweeper.stop()
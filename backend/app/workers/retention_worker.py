@@ -0,0 +1,95 @@
+"""
+Retention Worker
+Periodically expires log events and metric datapoints
+"""
+import logging
+import time
+from typing import Optional
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.retention_service import RetentionService
+from app.workers.scheduler import PeriodicWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionWorker(PeriodicWorker):
+    """
+    Background worker for retention enforcement.
+    
+    Runs as an asyncio task; the synchronous retention service executes via
+    ``AsyncSession.run_sync`` and deletes in bounded batches, so a large
+    backlog is worked off over several runs.
+    """
+    
+    name = "Retention worker"
+    
+    def __init__(
+        self,
+        interval: int = 3600,
+        batch_size: int = 5000,
+        max_batches: int = 200,
+        raw_metric_retention_days: int = 15
+    ):
+        """
+        Initialize retention worker.
+        
+        Args:
+            interval: Seconds between retention passes (default: 3600)
+            batch_size: Rows deleted per transaction (default: 5000)
+            max_batches: Batches per pass (default: 200)
+            raw_metric_retention_days: Days raw datapoints are kept (default: 15)
+        """
+        super().__init__(interval)
+        self.retention_service = RetentionService(
+            batch_size=batch_size,
+            max_batches=max_batches,
+            raw_metric_retention_days=raw_metric_retention_days
+        )
+    
+    async def _tick(self):
+        """Run one retention pass."""
+        started = time.perf_counter()
+        
+        async with AsyncSessionLocal() as session:
+            stats = await session.run_sync(self.retention_service.enforce_all)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Retention pass completed in {elapsed:.2f}s: "
+            f"{stats['log_events_deleted']} log events, "
+            f"{stats['metric_points_deleted']} datapoints, "
+            f"{stats['rollups_deleted']} rollups deleted "
+            f"({stats['rollups_backfilled']} hourly rollups rebuilt)"
+        )
+
+
+# Global worker instance
+_retention_worker: Optional[RetentionWorker] = None
+
+
+def get_retention_worker() -> RetentionWorker:
+    """Get the global retention worker instance."""
+    global _retention_worker
+    if _retention_worker is None:
+        _retention_worker = RetentionWorker(
+            interval=settings.RETENTION_ENFORCEMENT_INTERVAL,
+            batch_size=settings.RETENTION_BATCH_SIZE,
+            max_batches=settings.RETENTION_MAX_BATCHES,
+            raw_metric_retention_days=settings.METRIC_RAW_RETENTION_DAYS
+        )
+    return _retention_worker
+
+
+def start_retention_worker():
+    """Start the global retention worker on the running event loop."""
+    worker = get_retention_worker()
+    worker.start()
+
+
+async def stop_retention_worker():
+    """Stop the global retention worker, draining the current pass."""
+    worker = get_retention_worker()
+    await worker.stop()
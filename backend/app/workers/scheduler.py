@@ -0,0 +1,101 @@
+"""
+Fixed-rate asyncio scheduling for background workers
+"""
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """
+    Base class for background workers that run a tick at a fixed rate.
+    
+    Runs as an asyncio task on the application's event loop. Ticks are
+    scheduled against a fixed timeline (start + n * interval) rather than
+    "sleep interval after each run", so tick duration does not add drift.
+    Ticks that overrun are skipped instead of queued. Stopping lets the
+    in-flight tick finish (up to a timeout) before the task is cancelled.
+    """
+    
+    name = "worker"
+    
+    def __init__(self, interval: int):
+        """
+        Initialize worker.
+        
+        Args:
+            interval: Seconds between tick starts
+        """
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+    
+    def start(self):
+        """Schedule the worker on the running event loop."""
+        if self.is_running():
+            logger.warning(f"{self.name} already running")
+            return
+        
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"{self.name} started (interval: {self.interval}s)")
+    
+    async def stop(self, timeout: float = 30.0):
+        """
+        Stop the worker, draining the in-flight tick.
+        
+        Args:
+            timeout: Seconds to wait for the current tick before cancelling it
+        """
+        if not self.is_running():
+            return
+        
+        logger.info(f"Stopping {self.name}...")
+        self._stop_event.set()
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name} did not drain within {timeout}s, cancelling")
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        finally:
+            self._task = None
+        
+        logger.info(f"{self.name} stopped")
+    
+    def is_running(self) -> bool:
+        """Check if the worker task is running."""
+        return self._task is not None and not self._task.done()
+    
+    async def _run(self):
+        """Main worker loop."""
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        
+        while not self._stop_event.is_set():
+            try:
+                await self._tick()
+            except Exception as e:
+                logger.error(f"Error in {self.name}: {str(e)}", exc_info=True)
+            
+            next_run += self.interval
+            now = loop.time()
+            
+            if next_run <= now:
+                skipped = int((now - next_run) // self.interval) + 1
+                logger.warning(f"{self.name} overran its interval, skipping {skipped} tick(s)")
+                next_run += skipped * self.interval
+            
+            # Wait for next tick (with early exit on stop)
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop_event.wait(), timeout=next_run - now)
+    
+    async def _tick(self):
+        """Run one unit of work. Implemented by subclasses."""
+        raise NotImplementedError
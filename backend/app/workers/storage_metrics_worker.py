@@ -0,0 +1,72 @@
+"""
+Storage Metrics Worker
+Periodically publishes S3 bucket storage metrics to CloudWatch
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.cloudwatch_service import CloudWatchService
+from app.workers.scheduler import PeriodicWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class StorageMetricsWorker(PeriodicWorker):
+    """
+    Background worker for the AWS/S3 storage metrics.
+    
+    Publishes BucketSizeBytes and NumberOfObjects for every bucket from
+    the bucket stats counters; no objects are scanned.
+    """
+    
+    name = "Storage metrics worker"
+    
+    def __init__(self, interval: int = 3600):
+        """
+        Initialize storage metrics worker.
+        
+        Args:
+            interval: Seconds between publications (default: 3600)
+        """
+        super().__init__(interval)
+        self.cloudwatch_service = CloudWatchService()
+    
+    async def _tick(self):
+        """Publish one set of storage metrics."""
+        async with AsyncSessionLocal() as session:
+            buckets = await session.run_sync(
+                self.cloudwatch_service.store_storage_metrics,
+                datetime.utcnow()
+            )
+        
+        logger.info(f"Published storage metrics for {buckets} buckets")
+
+
+# Global worker instance
+_storage_metrics_worker: Optional[StorageMetricsWorker] = None
+
+
+def get_storage_metrics_worker() -> StorageMetricsWorker:
+    """Get the global storage metrics worker instance."""
+    global _storage_metrics_worker
+    if _storage_metrics_worker is None:
+        _storage_metrics_worker = StorageMetricsWorker(
+            interval=settings.S3_STORAGE_METRICS_INTERVAL
+        )
+    return _storage_metrics_worker
+
+
+def start_storage_metrics_worker():
+    """Start the global storage metrics worker on the running event loop."""
+    worker = get_storage_metrics_worker()
+    worker.start()
+
+
+async def stop_storage_metrics_worker():
+    """Stop the global storage metrics worker."""
+    worker = get_storage_metrics_worker()
+    await worker.stop()
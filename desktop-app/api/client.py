@@ -144,6 +144,19 @@ class APIClient(QObject):
         response = self._request("DELETE", f"/api/v1/iam/users/{username}")
         return response is not None
     
+    def simulate_principal_policy(
+        self,
+        username: str,
+        actions: List[str],
+        resources: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """Simulate IAM user's policies over actions × resources"""
+        return self._request("POST", "/api/v1/iam/policies/simulate", json={
+            "username": username,
+            "actions": actions,
+            "resources": resources or ["*"]
+        })
+    
     # Lambda API methods
     def list_functions(self) -> Optional[List[Dict]]:
         """List Lambda functions"""
@@ -378,10 +378,28 @@ class IAMService:
         policies = self.get_user_policies(user_id)
         return policy_engine.simulate_action(action, resource, policies)
     
-    def get_user_permissions_summary(self, user_id: str) -> dict:
-        """Get summary of user's effective permissions"""
+    def simulate_permissions(
+        self,
+        user_id: str,
+        actions: List[str],
+        resources: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Simulate a user's permissions for every action × resource pair.
+        Returns the matrix from PolicyEngine.simulate_matrix.
+        """
+        policies = self.get_user_policies(user_id)
+        return policy_engine.simulate_matrix(actions, resources or ["*"], policies)
+    
+    def get_user_permissions_summary(
+        self,
+        user_id: str,
+        actions: Optional[List[str]] = None,
+        resource: str = "*"
+    ) -> dict:
+        """Get summary of user's effective permissions (and decisions for actions, if given)"""
         policies = self.get_user_policies(user_id)
-        return policy_engine.get_effective_permissions(policies)
+        return policy_engine.get_effective_permissions(policies, actions, resource)
 
 
 # Global IAM service instance
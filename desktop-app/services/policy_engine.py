@@ -1,8 +1,10 @@
 """
 Policy Engine - Evaluates IAM policies and checks permissions
 """
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import fnmatch
+import os
+import re
 from models.iam_policy import Policy, PolicyStatement
 
 
@@ -159,15 +161,135 @@ class PolicyEngine:
         return result
     
     @staticmethod
-    def get_effective_permissions(policies: List[Policy]) -> dict:
+    def _compile_patterns(patterns: List[str]) -> Callable[[str], bool]:
+        """
+        Compile patterns into one matcher with the same semantics as
+        _matches_action/_matches_resource, so a pattern is translated once
+        instead of on every check.
+        """
+        if "*" in patterns:
+            return lambda value: True
+        if not patterns:
+            return lambda value: False
+        
+        regex = re.compile(
+            "|".join(fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns)
+        )
+        return lambda value: regex.match(os.path.normcase(value)) is not None
+    
+    @staticmethod
+    def _action_services(actions: List[str]) -> Optional[set]:
+        """
+        Service prefixes the action patterns can match (None: any service),
+        case-normalized like the matchers
+        """
+        services = set()
+        for pattern in actions:
+            service, separator, _ = pattern.partition(":")
+            if not separator or any(c in service for c in "*?["):
+                return None
+            services.add(os.path.normcase(service))
+        return services
+    
+    @staticmethod
+    def simulate_matrix(
+        actions: List[str],
+        resources: List[str],
+        policies: List[Policy]
+    ) -> dict:
+        """
+        Evaluate every (action, resource) pair in one pass.
+        
+        Each statement's patterns are compiled once and statements are
+        grouped by service prefix, so an action is only tested against
+        statements that can apply to it.
+        
+        Returns:
+            {
+                "actions": List[str],
+                "resources": List[str],
+                "statements": List[dict],  # policy, effect, actions, resources
+                "matrix": List[List[int]]  # deciding statement index, -1 = implicit deny
+            }
+        """
+        # Deny statements first, so the first match decides each cell
+        statements = [
+            (policy, statement)
+            for effect in ("Deny", "Allow")
+            for policy in policies
+            for statement in policy.statements
+            if statement.effect == effect
+        ]
+        
+        action_matchers = []
+        resource_matchers = []
+        by_service: Dict[str, List[int]] = {}
+        any_service: List[int] = []
+        for index, (_, statement) in enumerate(statements):
+            action_matchers.append(PolicyEngine._compile_patterns(statement.actions))
+            resource_matchers.append(PolicyEngine._compile_patterns(statement.resources))
+            services = PolicyEngine._action_services(statement.actions)
+            if services is None:
+                any_service.append(index)
+            else:
+                for service in services:
+                    by_service.setdefault(service, []).append(index)
+        
+        resource_matches: Dict[Tuple[int, int], bool] = {}
+        matrix = []
+        for action in actions:
+            service = os.path.normcase(action.partition(":")[0])
+            candidates = sorted(by_service.get(service, []) + any_service)
+            matches = [index for index in candidates if action_matchers[index](action)]
+            
+            row = []
+            for column, resource in enumerate(resources):
+                decided = -1
+                for index in matches:
+                    key = (index, column)
+                    if key not in resource_matches:
+                        resource_matches[key] = resource_matchers[index](resource)
+                    if resource_matches[key]:
+                        decided = index
+                        break
+                row.append(decided)
+            matrix.append(row)
+        
+        return {
+            "actions": list(actions),
+            "resources": list(resources),
+            "statements": [
+                {
+                    "policy": policy.name,
+                    "effect": statement.effect,
+                    "actions": statement.actions,
+                    "resources": statement.resources
+                }
+                for policy, statement in statements
+            ],
+            "matrix": matrix
+        }
+    
+    @staticmethod
+    def get_effective_permissions(
+        policies: List[Policy],
+        actions: Optional[List[str]] = None,
+        resource: str = "*"
+    ) -> dict:
         """
         Get summary of effective permissions from policies.
         
+        Args:
+            policies: Policies to summarize
+            actions: Optional concrete actions to decide (via simulate_matrix)
+            resource: Resource the actions are decided for
+        
         Returns:
             {
                 "allowed_actions": List[str],
                 "denied_actions": List[str],
-                "policies_count": int
+                "policies_count": int,
+                "decisions": Dict[str, dict]  # only with actions: decision, policy
             }
         """
         allowed_actions = set()
@@ -180,11 +302,23 @@ class PolicyEngine:
                 elif statement.effect == "Deny":
                     denied_actions.update(statement.actions)
         
-        return {
+        summary = {
             "allowed_actions": sorted(list(allowed_actions)),
             "denied_actions": sorted(list(denied_actions)),
             "policies_count": len(policies)
         }
+        
+        if actions:
+            simulation = PolicyEngine.simulate_matrix(actions, [resource], policies)
+            summary["decisions"] = {}
+            for action, (index,) in zip(actions, simulation["matrix"]):
+                statement = simulation["statements"][index] if index >= 0 else None
+                summary["decisions"][action] = {
+                    "decision": statement["effect"] if statement else "ImplicitDeny",
+                    "policy": statement["policy"] if statement else None
+                }
+        
+        return summary
 
 
 # Global policy engine instance
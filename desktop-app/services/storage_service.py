@@ -76,7 +76,7 @@ class StorageService:
         for item in self.storage_root.iterdir():
             if item.is_dir() and item.name not in self._buckets:
                 bucket = Bucket.create_new(item.name)
-                self._update_bucket_stats(bucket)
+                self._scan_bucket_stats(bucket)
                 self._buckets[bucket.name] = bucket
         
         self._save_buckets()
@@ -90,8 +90,13 @@ class StorageService:
         except IOError as e:
             print(f"Error saving bucket metadata: {e}")
     
-    def _update_bucket_stats(self, bucket: Bucket):
-        """Update bucket object count and size"""
+    def _scan_bucket_stats(self, bucket: Bucket):
+        """
+        Recompute bucket object count and size by walking its folder.
+        
+        Only needed for folders found without metadata; after that the
+        counters are kept up to date by _adjust_bucket_stats.
+        """
         bucket_path = self.storage_root / bucket.name
         if not bucket_path.exists():
             bucket.object_count = 0
@@ -109,6 +114,11 @@ class StorageService:
         bucket.object_count = count
         bucket.total_size = total_size
     
+    def _adjust_bucket_stats(self, bucket: Bucket, count_delta: int, size_delta: int):
+        """Apply an object count and size change to a bucket's counters"""
+        bucket.object_count = max(0, bucket.object_count + count_delta)
+        bucket.total_size = max(0, bucket.total_size + size_delta)
+    
     def create_bucket(self, name: str, region: Optional[str] = None, tags: Optional[dict] = None) -> Bucket:
         """
         Create a new storage bucket with IAM checks
@@ -194,8 +204,6 @@ class StorageService:
         # IAM permission check
         self._check_permission(Action.STORAGE_DELETE_BUCKET.value, resource_arn)
         
-        self._update_bucket_stats(bucket)
-        
         if bucket.object_count > 0 and not force:
             raise ValueError(f"Bucket '{name}' is not empty. Use force=True to delete anyway")
         
@@ -228,7 +236,7 @@ class StorageService:
             region: Optional region filter
         
         Returns:
-            List of buckets with updated stats
+            List of buckets with their stats
             
         Raises:
             PermissionError: If user lacks storage:ListBuckets permission
@@ -236,12 +244,6 @@ class StorageService:
         # IAM permission check
         self._check_permission(Action.STORAGE_LIST_BUCKETS.value, "arn:cloudsim:storage:*:bucket/*")
         
-        # Update stats for all buckets
-        for bucket in self._buckets.values():
-            self._update_bucket_stats(bucket)
-        
-        self._save_buckets()
-        
         # Filter by region if specified
         buckets = list(self._buckets.values())
         if region:
@@ -259,10 +261,7 @@ class StorageService:
         Returns:
             Bucket or None if not found
         """
-        bucket = self._buckets.get(name)
-        if bucket:
-            self._update_bucket_stats(bucket)
-        return bucket
+        return self._buckets.get(name)
     
     def upload_object(self, bucket_name: str, file_path: str, object_key: Optional[str] = None) -> S3Object:
         """
@@ -305,6 +304,9 @@ class StorageService:
         # Create parent directories if needed
         dest_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # An overwrite replaces the existing object's size
+        replaced_size = dest_path.stat().st_size if dest_path.is_file() else None
+        
         shutil.copy2(source_path, dest_path)
         
         # Create object metadata
@@ -325,7 +327,10 @@ class StorageService:
         )
         
         # Update bucket stats
-        self._update_bucket_stats(self._buckets[bucket_name])
+        if replaced_size is None:
+            self._adjust_bucket_stats(bucket, 1, file_size)
+        else:
+            self._adjust_bucket_stats(bucket, 0, file_size - replaced_size)
         self._save_buckets()
         
         return obj
@@ -372,10 +377,11 @@ class StorageService:
         if not object_path.exists():
             raise ValueError(f"Object '{object_key}' does not exist in bucket '{bucket_name}'")
         
+        object_size = object_path.stat().st_size
         object_path.unlink()
         
         # Update bucket stats
-        self._update_bucket_stats(self._buckets[bucket_name])
+        self._adjust_bucket_stats(self._buckets[bucket_name], -1, -object_size)
         self._save_buckets()
         
         return True